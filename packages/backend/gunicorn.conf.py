@@ -2,14 +2,13 @@
 Gunicorn configuration file for the backend.
 """
 
-from multiprocessing import cpu_count
 from src.side_quest_py.api.config import get_settings
 
 # Server socket
 bind = get_settings().GUNICORN_BIND
 
-# Worker processes
-workers = cpu_count()
+# Worker processes (also used to split DB_MAX_CONNECTIONS across workers)
+workers = get_settings().GUNICORN_WORKERS
 worker_class = get_settings().GUNICORN_WORKER_CLASS
 
 # Environment settings
@@ -0,0 +1,43 @@
+"""Add indexes for hot lookup queries
+
+Revision ID: a3c1f0e2b7d4
+Revises: 
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3c1f0e2b7d4"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_adventurers_user_id_id", "adventurers", ["user_id", "id"]),
+    ("ix_quests_adventurer_id_id", "quests", ["adventurer_id", "id"]),
+    ("ix_quests_completed_adventurer_id", "quests", ["completed", "adventurer_id"]),
+    ("ix_quest_completions_quest_id_adventurer_id", "quest_completions", ["quest_id", "adventurer_id"]),
+    ("ix_quest_completions_created_at_adventurer_id", "quest_completions", ["created_at", "adventurer_id"]),
+]
+
+
+def _existing_indexes(table):
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Tables created by init_db (create_all) already have these indexes
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
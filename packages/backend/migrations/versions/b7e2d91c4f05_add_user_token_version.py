@@ -0,0 +1,32 @@
+"""Add users.token_version for token revocation
+
+Revision ID: b7e2d91c4f05
+Revises: a3c1f0e2b7d4
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e2d91c4f05"
+down_revision = "a3c1f0e2b7d4"
+branch_labels = None
+depends_on = None
+
+
+def _existing_columns(table):
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    # Tables created by init_db (create_all) already have the column
+    if "token_version" not in _existing_columns("users"):
+        op.add_column("users", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade():
+    if "token_version" in _existing_columns("users"):
+        op.drop_column("users", "token_version")
@@ -0,0 +1,40 @@
+"""Add indexes for the list ETag aggregates
+
+Revision ID: c5f3a8d2e914
+Revises: b7e2d91c4f05
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c5f3a8d2e914"
+down_revision = "b7e2d91c4f05"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_adventurers_user_id_updated_at", "adventurers", ["user_id", "updated_at"]),
+    ("ix_quests_adventurer_id_updated_at", "quests", ["adventurer_id", "updated_at"]),
+]
+
+
+def _existing_indexes(table):
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Tables created by init_db (create_all) already have these indexes
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,39 @@
+"""Add an index for loading completions by adventurer
+
+Revision ID: d8a4b6e1f372
+Revises: c5f3a8d2e914
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d8a4b6e1f372"
+down_revision = "c5f3a8d2e914"
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_quest_completions_adventurer_id_id", "quest_completions", ["adventurer_id", "id"]),
+]
+
+
+def _existing_indexes(table):
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    # Tables created by init_db (create_all) already have these indexes
+    for name, table, columns in INDEXES:
+        if name not in _existing_indexes(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
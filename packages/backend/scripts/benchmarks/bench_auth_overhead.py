@@ -0,0 +1,102 @@
+"""Per-request authentication overhead microbenchmark.
+
+Sends requests straight to the ASGI app and reports the CPU time per request
+on three paths:
+
+- authenticated: GET /api/v1/auth/me with a valid (cached) token
+- missing token: GET /api/v1/adventurers without an Authorization header
+- invalid token: GET /api/v1/adventurers with a token that fails verification
+
+The app runs against an in-memory SQLite database through the same
+dependency overrides the tests use, and only talks HTTP, so the script can be
+run unchanged against any revision to compare the authentication paths:
+
+    python -m scripts.benchmarks.bench_auth_overhead --requests 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.database import Base, get_db, get_session_factory, make_get_db
+
+
+async def _time_path(client: AsyncClient, path: str, headers: Dict[str, str], requests: int, status: int) -> float:
+    """Return the CPU time per request in microseconds."""
+    started = time.process_time()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == status, response.text
+    return (time.process_time() - started) / requests * 1_000_000
+
+
+async def run_benchmark(requests: int) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        requests: Number of requests per path
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    checkouts = 0
+
+    def on_checkout(*_args: object) -> None:
+        nonlocal checkouts
+        checkouts += 1
+
+    event.listen(engine.sync_engine, "checkout", on_checkout)
+
+    app = create_app()
+    app.dependency_overrides[get_db] = make_get_db(session_factory)
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        credentials = {"username": "bench", "email": "bench@example.com", "password": "benchmark"}
+        (await client.post("/api/v1/auth/register", json=credentials)).raise_for_status()
+        response = await client.post("/api/v1/auth/login", data=credentials)
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        paths = [
+            ("authenticated", "/api/v1/auth/me", {"Authorization": f"Bearer {token}"}, 200),
+            ("missing token", "/api/v1/adventurers", {}, 401),
+            ("invalid token", "/api/v1/adventurers", {"Authorization": "Bearer not-a-token"}, 401),
+        ]
+        logging.info("Requests per path: %d", requests)
+        for name, path, headers, status in paths:
+            await _time_path(client, path, headers, 50, status)
+            checkouts = 0
+            per_request = await _time_path(client, path, headers, requests, status)
+            logging.info("%-14s %7.1f us/request, %.2f pool checkouts/request", name, per_request, checkouts / requests)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5_000, help="Requests per path")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.requests))
@@ -0,0 +1,98 @@
+"""Concurrent request throughput benchmark.
+
+Fires authenticated GET requests at the in-process app with a fixed number of
+requests in flight and reports throughput and latency percentiles. The script
+only talks HTTP, so it can be run unchanged against any revision of the API,
+e.g. before and after moving the services onto the async database layer:
+
+    python -m scripts.benchmarks.bench_concurrent_requests --concurrency 50
+
+The database must be initialized and seeded first (see scripts/db).
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import async_engine
+
+
+async def _login(client: AsyncClient, username: str, password: str) -> str:
+    """Log in as the given user and return the bearer token."""
+    response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return str(response.json()["access_token"])
+
+
+async def run_benchmark(path: str, total_requests: int, concurrency: int, username: str, password: str) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        path: The API path to request
+        total_requests: Total number of requests to send
+        concurrency: Number of requests in flight at once
+        username: User to authenticate as
+        password: Password for the user
+    """
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        token = await _login(client, username, password)
+        headers = {"Authorization": f"Bearer {token}"}
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+
+        async def _request() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_request() for _ in range(total_requests)))
+        elapsed = time.perf_counter() - started
+
+    await async_engine.dispose()
+    latencies.sort()
+    p99_index = max(0, int(len(latencies) * 0.99) - 1)
+    logging.info("Database: %s", settings.DATABASE_URL.split("@")[-1] if settings.DATABASE_URL else "unknown")
+    logging.info("Requests: %d, concurrency: %d, elapsed: %.2fs", total_requests, concurrency, elapsed)
+    logging.info("Throughput: %.1f req/s", total_requests / elapsed)
+    logging.info(
+        "Latency p50: %.2fms, p99: %.2fms",
+        statistics.median(latencies) * 1000,
+        latencies[p99_index] * 1000,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/api/v1/adventurers", help="API path to request")
+    parser.add_argument("--requests", type=int, default=2000, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--username", default="admin", help="User to authenticate as")
+    parser.add_argument("--password", default="side_quest_user", help="Password for the user")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.path, args.requests, args.concurrency, args.username, args.password))
@@ -0,0 +1,145 @@
+"""Login storm latency benchmark.
+
+Measures the latency of a cheap authenticated endpoint on its own and again
+while a storm of concurrent logins runs on the same worker. With bcrypt in
+the password hashing pool the endpoint's p99 should stay flat; pass --inline
+to hash on the event loop instead, as the service used to, for comparison:
+
+    python -m scripts.benchmarks.bench_login_storm --logins 200 --login-concurrency 20
+    python -m scripts.benchmarks.bench_login_storm --logins 200 --login-concurrency 20 --inline
+
+The database must be initialized and seeded first (see scripts/db).
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, TypeVar
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import AsyncClient, ASGITransport
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.database import async_engine
+from src.side_quest_py.password_hasher import password_hasher
+from scripts.benchmarks.bench_concurrent_requests import _login
+
+T = TypeVar("T")
+
+
+def _percentiles(latencies: List[float]) -> str:
+    """Format the p50 and p99 of a list of latencies in milliseconds."""
+    latencies = sorted(latencies)
+    p99_index = max(0, int(len(latencies) * 0.99) - 1)
+    return f"p50 {latencies[len(latencies) // 2] * 1000:.2f}ms, p99 {latencies[p99_index] * 1000:.2f}ms"
+
+
+async def _probe(client: AsyncClient, path: str, headers: Dict[str, str], stop: asyncio.Event) -> List[float]:
+    """Request the probe path back to back until stopped, returning the latencies."""
+    latencies: List[float] = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def run_benchmark(
+    path: str, logins: int, login_concurrency: int, idle_seconds: float, inline: bool, username: str, password: str
+) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        path: The authenticated path to probe
+        logins: Number of logins in the storm
+        login_concurrency: Number of logins in flight at once
+        idle_seconds: How long to probe before the storm
+        inline: Whether hashing was moved back onto the event loop
+        username: User to authenticate as
+        password: Password for the user
+    """
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        token = await _login(client, username, password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        stop = asyncio.Event()
+        probe = asyncio.ensure_future(_probe(client, path, headers, stop))
+        await asyncio.sleep(idle_seconds)
+        stop.set()
+        idle_latencies = await probe
+
+        stop = asyncio.Event()
+        probe = asyncio.ensure_future(_probe(client, path, headers, stop))
+        semaphore = asyncio.Semaphore(login_concurrency)
+        login_latencies: List[float] = []
+        failed_logins = 0
+
+        async def _storm_login() -> None:
+            nonlocal failed_logins
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+                login_latencies.append(time.perf_counter() - start)
+                # With hashing inline, SQLite lock waits can time out while the loop is blocked
+                failed_logins += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_storm_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        storm_latencies = await probe
+
+    await async_engine.dispose()
+    logging.info("Hashing: %s", "inline on the event loop" if inline else "password hashing pool")
+    logging.info("%s while idle:  %s (%d requests)", path, _percentiles(idle_latencies), len(idle_latencies))
+    logging.info("%s during storm: %s (%d requests)", path, _percentiles(storm_latencies), len(storm_latencies))
+    logging.info("Logins: %d in %.2fs (%d failed), %s", logins, elapsed, failed_logins, _percentiles(login_latencies))
+    logging.info("Hasher: %s", password_hasher.to_dict())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/api/v1/auth/me", help="Authenticated path to probe")
+    parser.add_argument("--logins", type=int, default=200, help="Number of logins in the storm")
+    parser.add_argument("--login-concurrency", type=int, default=20, help="Logins in flight at once")
+    parser.add_argument("--idle-seconds", type=float, default=2.0, help="Probe time before the storm")
+    parser.add_argument("--inline", action="store_true", help="Hash on the event loop instead of the pool")
+    parser.add_argument("--username", default="admin", help="User to authenticate as")
+    parser.add_argument("--password", default="side_quest_user", help="Password for the user")
+    args = parser.parse_args()
+
+    if args.inline:
+
+        async def _run_inline(func: Callable[..., T], *func_args: Any) -> T:
+            return func(*func_args)
+
+        password_hasher._run = _run_inline  # type: ignore[method-assign]
+
+    asyncio.run(
+        run_benchmark(
+            args.path,
+            args.logins,
+            args.login_concurrency,
+            args.idle_seconds,
+            args.inline,
+            args.username,
+            args.password,
+        )
+    )
@@ -0,0 +1,125 @@
+"""Login throughput benchmark.
+
+Runs concurrent logins against the ASGI app twice, once writing each issued
+token to the users table (AUTH_PERSIST_TOKENS on, the old behaviour) and once
+without, and reports logins per second and the writes each login sends to the
+database. bcrypt is set to its minimum cost so the database work is not hidden
+behind hashing:
+
+    python -m scripts.benchmarks.bench_login_throughput --users 20 --logins 2000 --concurrency 20
+
+The app runs against a fresh SQLite file in a temporary directory through the
+same dependency overrides the tests use.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Tuple
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Load environment variables from .env file
+load_dotenv()
+# Measure the database work of a login, not bcrypt
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from src.side_quest_py import create_app
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import Base, get_db, get_session_factory, make_get_db
+from src.side_quest_py.login_throttle import login_throttle
+from src.side_quest_py.principal_cache import principal_cache
+
+
+async def _login_round(client: AsyncClient, users: int, logins: int, concurrency: int) -> Tuple[float, int]:
+    """Run the logins spread over the users and return the elapsed seconds and the number that failed."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(index: int) -> bool:
+        async with semaphore:
+            data = {"username": f"bench{index % users}", "password": "benchmark"}
+            response = await client.post("/api/v1/auth/login", data=data)
+            # Writing logins can fail on SQLite lock timeouts; count them rather than stopping
+            return response.status_code == 200
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login(index) for index in range(logins)))
+    return time.perf_counter() - started, results.count(False)
+
+
+async def run_benchmark(users: int, logins: int, concurrency: int) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        users: Number of distinct users logging in
+        logins: Number of logins per mode
+        concurrency: Logins in flight at once
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{directory}/bench.db")
+        session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        writes = 0
+
+        def on_execute(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+            nonlocal writes
+            if not statement.lstrip().upper().startswith("SELECT"):
+                writes += 1
+
+        app = create_app()
+        app.dependency_overrides[get_db] = make_get_db(session_factory)
+        app.dependency_overrides[get_session_factory] = lambda: session_factory
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for index in range(users):
+                credentials = {
+                    "username": f"bench{index}",
+                    "email": f"bench{index}@example.com",
+                    "password": "benchmark",
+                }
+                (await client.post("/api/v1/auth/register", json=credentials)).raise_for_status()
+
+            # Keep the throttle from counting the benchmark's own client
+            login_throttle.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+            logging.info("Logins per mode: %d over %d users, concurrency %d", logins, users, concurrency)
+            for persist in (True, False):
+                settings.AUTH_PERSIST_TOKENS = persist
+                await _login_round(client, users, min(logins, 100), concurrency)
+                principal_cache.clear()
+                writes = 0
+                elapsed, failed = await _login_round(client, users, logins, concurrency)
+                logging.info(
+                    "persist tokens %-5s %7.1f logins/s, %.2f writes/login, %d failed",
+                    persist,
+                    logins / elapsed,
+                    writes / logins,
+                    failed,
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Distinct users logging in")
+    parser.add_argument("--logins", type=int, default=2_000, help="Logins per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Logins in flight at once")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.users, args.logins, args.concurrency))
@@ -0,0 +1,186 @@
+"""NDJSON streaming benchmark.
+
+Seeds one adventurer with a large number of quests, streams them through
+GET /api/v1/quests/{adventurer_id} with Accept: application/x-ndjson and
+reports rows, throughput and the worker's peak RSS. Pass --buffered to load
+the same quests with a single unpaged query instead, for comparison:
+
+    python -m scripts.benchmarks.bench_ndjson_stream --quests 1000000
+    python -m scripts.benchmarks.bench_ndjson_stream --quests 1000000 --buffered
+
+The response is consumed straight from the ASGI app, because httpx's ASGI
+transport would buffer the whole body and hide the server's memory profile.
+The database must be initialized and seeded first (see scripts/db).
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, insert
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import AsyncSessionLocal, SessionLocal, async_engine
+from src.side_quest_py.models.db_models import Quest
+from src.side_quest_py.services.quest_service import QuestService
+from scripts.benchmarks.bench_concurrent_requests import _login
+
+SEED_BATCH_SIZE = 10_000
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+
+
+def _seed_quests(adventurer_id: str, total_quests: int) -> None:
+    """Insert the quests in batches so seeding itself stays small."""
+    now = datetime.now()
+    with SessionLocal() as db:
+        for start in range(0, total_quests, SEED_BATCH_SIZE):
+            batch: List[Dict[str, Any]] = [
+                {
+                    "id": f"{adventurer_id}_{i:08d}",
+                    "adventurer_id": adventurer_id,
+                    "title": f"Benchmark quest {i}",
+                    "experience_reward": 10,
+                    "completed": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + SEED_BATCH_SIZE, total_quests))
+            ]
+            db.execute(insert(Quest), batch)
+            db.commit()
+
+
+async def _stream(app: Any, path: str, token: str) -> Dict[str, int]:
+    """Call the app with an NDJSON request and count what it sends, keeping nothing."""
+    counts = {"rows": 0, "bytes": 0, "status": 0}
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"accept", b"application/x-ndjson"),
+            (b"authorization", f"Bearer {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Starlette listens for a disconnect while streaming, so only send one once the body is done
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            counts["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            counts["bytes"] += len(body)
+            counts["rows"] += body.count(b"\n")
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return counts
+
+
+async def run_benchmark(total_quests: int, buffered: bool, username: str, password: str) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        total_quests: Number of quests to seed and read back
+        buffered: Load the quests with one unpaged query instead of streaming them
+        username: User to authenticate as
+        password: Password for the user
+    """
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        token = await _login(client, username, password)
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.post(
+            "/api/v1/adventurer", json={"name": "Benchmark Hero", "adventurer_type": "Warrior"}, headers=headers
+        )
+        response.raise_for_status()
+        adventurer_id = response.json()["id"]
+
+    try:
+        started = time.perf_counter()
+        _seed_quests(adventurer_id, total_quests)
+        logging.info("Seeded %d quests in %.1fs", total_quests, time.perf_counter() - started)
+        rss_before = _peak_rss_mb()
+
+        started = time.perf_counter()
+        if buffered:
+            async with AsyncSessionLocal() as db:
+                quest_service = QuestService(db=db)
+                rows = [
+                    quest_service.quest_to_dict(quest) for quest in await quest_service.get_all_quests(adventurer_id)
+                ]
+            counts = {"rows": len(rows), "bytes": 0, "status": 200}
+        else:
+            counts = await _stream(app, f"/api/v1/quests/{adventurer_id}", token)
+        elapsed = time.perf_counter() - started
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(Quest).filter_by(adventurer_id=adventurer_id))
+            db.commit()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            await client.delete(f"/api/v1/adventurer/{adventurer_id}", headers=headers)
+        await async_engine.dispose()
+
+    logging.info("Database: %s", settings.DATABASE_URL.split("@")[-1] if settings.DATABASE_URL else "unknown")
+    logging.info("Mode: %s, status: %d", "buffered" if buffered else "ndjson stream", counts["status"])
+    logging.info("Rows: %d, bytes: %d, elapsed: %.2fs", counts["rows"], counts["bytes"], elapsed)
+    logging.info("Throughput: %.0f rows/s", counts["rows"] / elapsed)
+    logging.info("Peak RSS: %.1f MB before reading, %.1f MB after", rss_before, _peak_rss_mb())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quests", type=int, default=1_000_000, help="Number of quests to stream")
+    parser.add_argument("--buffered", action="store_true", help="Load all quests at once instead of streaming")
+    parser.add_argument("--username", default="admin", help="User to authenticate as")
+    parser.add_argument("--password", default="side_quest_user", help="Password for the user")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.quests, args.buffered, args.username, args.password))
@@ -0,0 +1,122 @@
+"""Quest completion benchmark.
+
+Creates quests for one adventurer and completes them through the API with a
+fixed number of requests in flight, then reports throughput, latency
+percentiles and the number of COMMITs the database received. Run it with
+DB_UNIT_OF_WORK=false and DB_UNIT_OF_WORK=true to compare committing once per
+service call against committing once per request:
+
+    DB_UNIT_OF_WORK=false python -m scripts.benchmarks.bench_quest_completion
+    DB_UNIT_OF_WORK=true python -m scripts.benchmarks.bench_quest_completion
+
+The database must be initialized and seeded first (see scripts/db).
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import async_engine
+from scripts.benchmarks.bench_concurrent_requests import _login
+
+
+async def run_benchmark(total_quests: int, concurrency: int, username: str, password: str) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        total_quests: Number of quests to create and complete
+        concurrency: Number of requests in flight at once
+        username: User to authenticate as
+        password: Password for the user
+    """
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        token = await _login(client, username, password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response = await client.post(
+            "/api/v1/adventurer", json={"name": "Benchmark Hero", "adventurer_type": "Warrior"}, headers=headers
+        )
+        response.raise_for_status()
+        adventurer_id = response.json()["id"]
+
+        quest_ids: List[str] = []
+        for i in range(total_quests):
+            response = await client.post(
+                "/api/v1/quest",
+                json={"title": f"Benchmark quest {i}", "adventurer_id": adventurer_id, "experience_reward": 10},
+                headers=headers,
+            )
+            response.raise_for_status()
+            quest_ids.append(response.json()["id"])
+
+        commits = 0
+
+        def _count_commit(_conn: Any) -> None:
+            nonlocal commits
+            commits += 1
+
+        event.listen(async_engine.sync_engine, "commit", _count_commit)
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+
+        async def _complete(quest_id: str) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.put(f"/api/v1/quest/{quest_id}", json={"completed": True}, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_complete(quest_id) for quest_id in quest_ids))
+        elapsed = time.perf_counter() - started
+        event.remove(async_engine.sync_engine, "commit", _count_commit)
+
+        await client.delete(f"/api/v1/adventurer/{adventurer_id}", headers=headers)
+
+    await async_engine.dispose()
+    latencies.sort()
+    p99_index = max(0, int(len(latencies) * 0.99) - 1)
+    logging.info("Database: %s", settings.DATABASE_URL.split("@")[-1] if settings.DATABASE_URL else "unknown")
+    logging.info("Unit of work: %s", settings.DB_UNIT_OF_WORK)
+    logging.info("Completions: %d, concurrency: %d, elapsed: %.2fs", total_quests, concurrency, elapsed)
+    logging.info("Throughput: %.1f req/s", total_quests / elapsed)
+    logging.info(
+        "Latency p50: %.2fms, p99: %.2fms",
+        statistics.median(latencies) * 1000,
+        latencies[p99_index] * 1000,
+    )
+    logging.info("Commits per completion: %.2f", commits / total_quests)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quests", type=int, default=500, help="Number of quests to complete")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    parser.add_argument("--username", default="admin", help="User to authenticate as")
+    parser.add_argument("--password", default="side_quest_user", help="Password for the user")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.quests, args.concurrency, args.username, args.password))
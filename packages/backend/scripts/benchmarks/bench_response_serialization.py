@@ -0,0 +1,122 @@
+"""Response serialization microbenchmark.
+
+Encodes the same page of quest rows the way the list endpoints used to and the
+way they do now, and reports the CPU time per response and per row:
+
+- validated: FastAPI's response_model path, validating the rows against
+  List[QuestResponse], dumping them back to Python and encoding with json
+- fast: FastJSONResponse, encoding the rows once with orjson
+
+The rows are Core mappings read from an in-memory SQLite database, exactly
+what the route hands over, for lists of 10, 1k and 100k quests by default:
+
+    python -m scripts.benchmarks.bench_response_serialization --sizes 10 1000 100000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py.api.responses import FastJSONResponse
+from src.side_quest_py.api.schemas.quest import QuestResponse
+from src.side_quest_py.database import Base
+from src.side_quest_py.models.db_models import Adventurer, Quest
+from src.side_quest_py.services.quest_service import QuestService
+
+ADVENTURER_ID = "bench_adventurer"
+
+
+async def _best_time(encode: Callable[[], Awaitable[bytes]], repeat: int) -> float:
+    """Return the best CPU time of one encoding, in seconds, over several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        await encode()
+        best = min(best, time.process_time() - started)
+    return best
+
+
+async def run_benchmark(sizes: List[int], repeat: int) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        sizes: Numbers of quests per response
+        repeat: Number of runs per size and path; the fastest is reported
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    now = datetime.now()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Adventurer), [{"id": ADVENTURER_ID, "name": "Benchmark Hero"}])
+        await conn.execute(
+            insert(Quest),
+            [
+                {
+                    "id": f"quest_{i:08d}",
+                    "adventurer_id": ADVENTURER_ID,
+                    "title": f"Benchmark quest {i}",
+                    "experience_reward": 10,
+                    "completed": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(max(sizes))
+            ],
+        )
+
+    field = create_response_field(name="response", type_=List[QuestResponse])
+    logging.info("Best of %d runs", repeat)
+    for size in sizes:
+        async with session_factory() as db:
+            rows: List[Any] = await QuestService(db=db).get_all_quest_rows(ADVENTURER_ID, limit=size)
+
+        async def validated() -> bytes:
+            return JSONResponse(await serialize_response(field=field, response_content=rows)).body
+
+        async def fast() -> bytes:
+            return FastJSONResponse(rows).body
+
+        validated_time = await _best_time(validated, repeat)
+        fast_time = await _best_time(fast, repeat)
+        logging.info(
+            "%7d quests: validated %9.3f ms (%.2f us/row), fast %9.3f ms (%.2f us/row), %.1fx",
+            size,
+            validated_time * 1000,
+            validated_time / size * 1_000_000,
+            fast_time * 1000,
+            fast_time / size * 1_000_000,
+            validated_time / fast_time,
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 100_000], help="Quests per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per size and path")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.sizes, args.repeat))
@@ -0,0 +1,116 @@
+"""List read path microbenchmark.
+
+Loads the same quests through the two read paths the list endpoints have used
+and reports the CPU time per row of each:
+
+- orm: select(Quest), ORM objects through the identity map, then quest_to_dict
+- rows: a Core select() of the response columns returned as .mappings()
+
+Both paths finish with the response model validation FastAPI applies, so the
+numbers compare the full cost of producing a response row. An in-memory
+SQLite database keeps the database itself out of the measurement:
+
+    python -m scripts.benchmarks.bench_row_serialization --quests 50000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py.api.schemas.quest import QuestResponse
+from src.side_quest_py.database import Base
+from src.side_quest_py.models.db_models import Adventurer, Quest
+from src.side_quest_py.services.quest_service import QuestService
+
+ADVENTURER_ID = "bench_adventurer"
+
+
+async def _time_per_row(load: Callable[[], Awaitable[List[Any]]], repeat: int) -> float:
+    """Return the best CPU time per row, in microseconds, over several runs."""
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.process_time()
+        rows = len(await load())
+        best = min(best, time.process_time() - started)
+    return best / rows * 1_000_000
+
+
+async def run_benchmark(total_quests: int, repeat: int) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        total_quests: Number of quests to load per run
+        repeat: Number of runs per read path; the fastest is reported
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    now = datetime.now()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Adventurer), [{"id": ADVENTURER_ID, "name": "Benchmark Hero"}])
+        await conn.execute(
+            insert(Quest),
+            [
+                {
+                    "id": f"quest_{i:08d}",
+                    "adventurer_id": ADVENTURER_ID,
+                    "title": f"Benchmark quest {i}",
+                    "experience_reward": 10,
+                    "completed": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(total_quests)
+            ],
+        )
+
+    response_adapter = TypeAdapter(List[QuestResponse])
+
+    async def load_orm() -> List[Any]:
+        async with session_factory() as db:
+            quest_service = QuestService(db=db)
+            quests = await quest_service.get_all_quests(ADVENTURER_ID)
+            return response_adapter.validate_python([quest_service.quest_to_dict(quest) for quest in quests])
+
+    async def load_rows() -> List[Any]:
+        async with session_factory() as db:
+            return response_adapter.validate_python(await QuestService(db=db).get_all_quest_rows(ADVENTURER_ID))
+
+    orm_per_row = await _time_per_row(load_orm, repeat)
+    rows_per_row = await _time_per_row(load_rows, repeat)
+    await engine.dispose()
+
+    logging.info("Quests: %d, best of %d runs", total_quests, repeat)
+    logging.info("ORM objects + quest_to_dict: %.2f us/row", orm_per_row)
+    logging.info("Core column mappings:        %.2f us/row", rows_per_row)
+    logging.info("Saved: %.2f us/row (%.0f%%)", orm_per_row - rows_per_row, (1 - rows_per_row / orm_per_row) * 100)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quests", type=int, default=50_000, help="Number of quests to load per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per read path")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.quests, args.repeat))
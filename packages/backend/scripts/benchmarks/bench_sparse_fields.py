@@ -0,0 +1,122 @@
+"""Sparse fieldset benchmark.
+
+Requests the same page of adventurers through the ASGI app with every field
+and with a roster projection, and reports the payload size and latency:
+
+- full: GET /api/v1/adventurers?limit=N
+- roster: GET /api/v1/adventurers?limit=N&fields=name,level
+
+Sizes are reported uncompressed and gzipped. The app runs against an
+in-memory SQLite database through the same dependency overrides the tests use:
+
+    python -m scripts.benchmarks.bench_sparse_fields --adventurers 1000 --requests 200
+"""
+
+import argparse
+import asyncio
+import gzip
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py import create_app
+from src.side_quest_py.database import Base, get_db, get_session_factory, make_get_db
+from src.side_quest_py.models.db_models import Adventurer
+
+
+async def _time_path(client: AsyncClient, path: str, headers: Dict[str, str], requests: int) -> Tuple[float, bytes]:
+    """Return the wall time per request in milliseconds and the last body."""
+    body = b""
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+        body = response.content
+    return (time.perf_counter() - started) / requests * 1000, body
+
+
+async def run_benchmark(adventurers: int, requests: int) -> None:
+    """Run the benchmark and log the results.
+
+    Args:
+        adventurers: Number of adventurers in the page
+        requests: Number of requests per projection
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=StaticPool)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    app = create_app()
+    app.dependency_overrides[get_db] = make_get_db(session_factory)
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        credentials = {"username": "bench", "email": "bench@example.com", "password": "benchmark"}
+        (await client.post("/api/v1/auth/register", json=credentials)).raise_for_status()
+        response = await client.post("/api/v1/auth/login", data=credentials)
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}", "Accept-Encoding": "identity"}
+        user_id = (await client.get("/api/v1/auth/me", headers=headers)).json()["id"]
+
+        now = datetime.now()
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(Adventurer),
+                [
+                    {
+                        "id": f"adventurer_{i:08d}",
+                        "name": f"Benchmark Hero {i}",
+                        "adventurer_type": "Warrior",
+                        "user_id": user_id,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(adventurers)
+                ],
+            )
+
+        paths = [
+            ("full", f"/api/v1/adventurers?limit={adventurers}"),
+            ("roster", f"/api/v1/adventurers?limit={adventurers}&fields=name,level"),
+        ]
+        logging.info("%d adventurers per page, %d requests per projection", adventurers, requests)
+        for name, path in paths:
+            await _time_path(client, path, headers, 10)
+            per_request, body = await _time_path(client, path, headers, requests)
+            logging.info(
+                "%-7s %8d bytes, %7d gzipped, %7.2f ms/request",
+                name,
+                len(body),
+                len(gzip.compress(body, mtime=0)),
+                per_request,
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--adventurers", type=int, default=1_000, help="Adventurers per page")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per projection")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.adventurers, args.requests))
@@ -0,0 +1,147 @@
+"""Token verification and revocation benchmark.
+
+Reports two numbers:
+
+- auth cost: the CPU time of AuthService.verify_token per request, once for a
+  token already in the principal cache (checked against the shared token
+  version table) and once for a cold token (JWT decode plus the users query)
+- propagation: how long a token version recorded by one process takes to be
+  seen by worker processes polling the shared table, as gunicorn workers do
+
+An in-memory SQLite database and a temporary table file keep the run
+self-contained:
+
+    python -m scripts.benchmarks.bench_token_revocation --requests 20000 --workers 4
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py.database import Base
+from src.side_quest_py.principal_cache import principal_cache
+from src.side_quest_py.services.auth_service import AuthService
+from src.side_quest_py.token_versions import TokenVersionTable, token_versions
+
+USER_ID_PREFIX = "bench_user"
+
+
+async def _time_per_call(call: Callable[[], Awaitable[object]], requests: int) -> float:
+    """Return the CPU time per call in microseconds."""
+    started = time.process_time()
+    for _ in range(requests):
+        await call()
+    return (time.process_time() - started) / requests * 1_000_000
+
+
+async def bench_auth_cost(requests: int) -> None:
+    """Measure verify_token with a warm and a cold principal cache.
+
+    Args:
+        requests: Number of verifications per mode
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as db:
+        auth_service = AuthService(db=db)
+        await auth_service.register_user(username="bench", email="bench@example.com", password="benchmark")
+        token = await auth_service.authenticate_user(username="bench", password="benchmark")
+
+        async def cold() -> object:
+            principal_cache.clear()
+            return await auth_service.verify_token(token)
+
+        cold_per_call = await _time_per_call(cold, requests)
+        await auth_service.verify_token(token)
+        warm_per_call = await _time_per_call(lambda: auth_service.verify_token(token), requests)
+    await engine.dispose()
+
+    logging.info("Auth cost, %d requests per mode", requests)
+    logging.info("Cold (JWT decode + users query): %.1f us/request", cold_per_call)
+    logging.info("Cached principal + version table: %.1f us/request", warm_per_call)
+
+
+def _poll(path: str, slots: int, user_id: str, version: int, ready, results) -> None:
+    """Worker process: spin on the table until the version appears, then report when."""
+    table = TokenVersionTable(path, slots)
+    table.current(user_id)
+    ready.set()
+    while (table.current(user_id) or 0) < version:
+        pass
+    results.put(time.perf_counter())
+    table.close()
+
+
+def bench_propagation(workers: int, rounds: int) -> None:
+    """Measure how long a recorded version takes to reach other processes.
+
+    Args:
+        workers: Number of polling worker processes
+        rounds: Number of revocations to time
+    """
+    context = multiprocessing.get_context("fork")
+    latencies: List[float] = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "token_versions")
+        table = TokenVersionTable(path, token_versions.slots)
+        for round_number in range(rounds):
+            user_id = f"{USER_ID_PREFIX}_{round_number}"
+            results = context.Queue()
+            readies = [context.Event() for _ in range(workers)]
+            processes = [
+                context.Process(target=_poll, args=(path, table.slots, user_id, 1, ready, results)) for ready in readies
+            ]
+            for process in processes:
+                process.start()
+            for ready in readies:
+                ready.wait()
+
+            recorded_at = time.perf_counter()
+            table.record(user_id, 1)
+            latencies.extend((results.get() - recorded_at) * 1_000_000 for _ in processes)
+            for process in processes:
+                process.join()
+        table.close()
+
+    latencies.sort()
+    logging.info("Propagation, %d revocations x %d workers", rounds, workers)
+    logging.info(
+        "Latency: median %.1f us, p99 %.1f us, max %.1f us",
+        statistics.median(latencies),
+        latencies[int(len(latencies) * 0.99) - 1],
+        latencies[-1],
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000, help="Verifications per mode")
+    parser.add_argument("--workers", type=int, default=4, help="Polling worker processes")
+    parser.add_argument("--rounds", type=int, default=50, help="Revocations to time")
+    args = parser.parse_args()
+
+    asyncio.run(bench_auth_cost(args.requests))
+    bench_propagation(args.workers, args.rounds)
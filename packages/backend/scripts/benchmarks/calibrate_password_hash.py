@@ -0,0 +1,69 @@
+"""Password hash cost calibration.
+
+Measures how long hashing takes on this host and prints the cost settings
+that keep one hash within PASSWORD_HASH_TARGET_MS (or --target-ms). Run it on
+each kind of production host and put the printed values in its environment;
+stored hashes with another cost are rehashed as users log in:
+
+    python -m scripts.benchmarks.calibrate_password_hash --target-ms 250
+    python -m scripts.benchmarks.calibrate_password_hash --scheme argon2 --memory-cost 65536
+
+Logins run in the password hashing pool, so budget the target against
+PASSWORD_HASH_WORKERS hashes running at once on each worker.
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path to make imports work
+script_dir = Path(__file__).resolve().parent
+root_dir = script_dir.parent.parent
+sys.path.insert(0, str(root_dir))
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.password_hasher import calibrate_argon2_time_cost, calibrate_bcrypt_rounds
+
+
+def run_calibration(scheme: str, target_ms: float, memory_cost: int, parallelism: int) -> None:
+    """Calibrate the scheme's cost and log the settings to use.
+
+    Args:
+        scheme: "bcrypt" or "argon2"
+        target_ms: The latency budget for one hash in milliseconds
+        memory_cost: The argon2 memory cost in KiB
+        parallelism: The argon2 number of lanes
+    """
+    logging.info("Calibrating %s for %.0fms per hash", scheme, target_ms)
+    if scheme == "bcrypt":
+        rounds, elapsed = calibrate_bcrypt_rounds(target_ms)
+        logging.info("Measured %.1fms per hash at %d rounds", elapsed, rounds)
+        print("PASSWORD_HASH_SCHEME=bcrypt")
+        print(f"BCRYPT_ROUNDS={rounds}")
+    else:
+        time_cost, elapsed = calibrate_argon2_time_cost(target_ms, memory_cost, parallelism)
+        logging.info("Measured %.1fms per hash at time cost %d", elapsed, time_cost)
+        print("PASSWORD_HASH_SCHEME=argon2")
+        print(f"ARGON2_MEMORY_COST={memory_cost}")
+        print(f"ARGON2_TIME_COST={time_cost}")
+        print(f"ARGON2_PARALLELISM={parallelism}")
+    print(f"PASSWORD_HASH_TARGET_MS={target_ms:.0f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default=settings.PASSWORD_HASH_SCHEME)
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS, help="Budget per hash")
+    parser.add_argument("--memory-cost", type=int, default=settings.ARGON2_MEMORY_COST, help="argon2 memory in KiB")
+    parser.add_argument("--parallelism", type=int, default=settings.ARGON2_PARALLELISM, help="argon2 lanes")
+    args = parser.parse_args()
+
+    run_calibration(args.scheme, args.target_ms, args.memory_cost, args.parallelism)
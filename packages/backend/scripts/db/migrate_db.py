@@ -24,6 +24,9 @@ load_dotenv()
 # Import settings
 from src.side_quest_py.api.config import settings
 
+# Alembic configuration, relative to packages/backend
+ALEMBIC_CONFIG = "migrations/alembic.ini"
+
 
 def run_alembic_command(command):
     """Run an alembic command through subprocess.
@@ -32,7 +35,7 @@ def run_alembic_command(command):
         command: The alembic command to run
     """
     try:
-        subprocess.run(["alembic"] + command.split(), check=True)
+        subprocess.run(["alembic", "-c", ALEMBIC_CONFIG] + command.split(), check=True)
         return True
     except subprocess.CalledProcessError as e:
         print(f"Error running alembic command: {e}")
@@ -54,7 +57,7 @@ def init_migrations():
 
     try:
         # Check if alembic.ini exists
-        if not os.path.exists("alembic.ini"):
+        if not os.path.exists(ALEMBIC_CONFIG):
             print("Initializing alembic...")
             if not run_alembic_command("init migrations"):
                 print("❌ Failed to initialize alembic")
@@ -12,10 +12,17 @@ from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.side_quest_py.api.compression import CompressionMiddleware, compressed_bodies
 from src.side_quest_py.api.config import settings
-from src.side_quest_py.database import get_db
+from src.side_quest_py.api.middleware import BearerAuthMiddleware
+from src.side_quest_py.api.responses import FastJSONResponse
+from src.side_quest_py.database import get_db, get_pool_statistics
+from src.side_quest_py.login_throttle import login_throttle
+from src.side_quest_py.password_hasher import password_hasher
+from src.side_quest_py.principal_cache import principal_cache
+from src.side_quest_py.token_versions import token_versions
 
 # Use MySQLdb as driver for pymysql
 pymysql.install_as_MySQLdb()
@@ -28,7 +35,15 @@ def create_app() -> FastAPI:
         FastAPI: Configured FastAPI application instance
     """
     # Create FastAPI app using settings from config
-    app = FastAPI(title=settings.APP_NAME, description=settings.APP_DESCRIPTION, version=settings.APP_VERSION)
+    app = FastAPI(
+        title=settings.APP_NAME,
+        description=settings.APP_DESCRIPTION,
+        version=settings.APP_VERSION,
+        default_response_class=FastJSONResponse,
+    )
+
+    # Authenticate API requests before routing; added first so CORS wraps its 401s
+    app.add_middleware(BearerAuthMiddleware)
 
     # Configure CORS from settings
     app.add_middleware(
@@ -37,6 +52,14 @@ def create_app() -> FastAPI:
         allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
         allow_methods=settings.CORS_ALLOW_METHODS,
         allow_headers=settings.CORS_ALLOW_HEADERS,
+        expose_headers=settings.CORS_EXPOSE_HEADERS,
+    )
+
+    # Compress large responses; added last so it wraps everything, including CORS headers and 401s
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        thread_minimum_size=settings.COMPRESSION_THREAD_MIN_SIZE,
     )
 
     # Add a simple route to verify the app is working
@@ -46,10 +69,10 @@ def create_app() -> FastAPI:
 
     # Add health check endpoint
     @app.get("/health")
-    def health_check(db: Session = Depends(get_db)):
+    async def health_check(db: AsyncSession = Depends(get_db)):
         try:
             # Test the database connection
-            db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 1"))
             db_status = "connected"
         except SQLAlchemyError as e:
             db_status = f"error: {str(e)}"
@@ -64,6 +87,31 @@ def create_app() -> FastAPI:
             "app": {"env": settings.FASTAPI_ENV, "debug": settings.DEBUG},
         }
 
+    # Add connection pool statistics endpoint (per worker process)
+    @app.get("/health/db-pool")
+    def db_pool_statistics() -> Dict[str, Any]:
+        return get_pool_statistics()
+
+    # Add principal cache statistics endpoint (per worker process, with the token version table of the host)
+    @app.get("/health/auth-cache")
+    def auth_cache_statistics() -> Dict[str, Any]:
+        return {"pid": os.getpid(), **principal_cache.to_dict(), "token_versions": token_versions.to_dict()}
+
+    # Add password hashing pool statistics endpoint (per worker process)
+    @app.get("/health/password-hashing")
+    def password_hashing_statistics() -> Dict[str, Any]:
+        return {"pid": os.getpid(), **password_hasher.to_dict()}
+
+    # Add login throttle statistics endpoint (per worker process)
+    @app.get("/health/login-throttle")
+    def login_throttle_statistics() -> Dict[str, Any]:
+        return {"pid": os.getpid(), **login_throttle.to_dict()}
+
+    # Add compressed response cache statistics endpoint (per worker process)
+    @app.get("/health/compression")
+    def compression_statistics() -> Dict[str, Any]:
+        return {"pid": os.getpid(), **compressed_bodies.to_dict()}
+
     from src.side_quest_py.api.routes.adventurer_routes import router as adventurer_router
     from src.side_quest_py.api.routes.auth_routes import router as auth_router
     from src.side_quest_py.api.routes.quests_routes import router as quest_router
@@ -8,16 +8,16 @@ from typing import Dict, Any, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from src.side_quest_py.api.config import settings
+from src.side_quest_py.password_hasher import pwd_context
 from src.side_quest_py.services.auth_service import AuthService
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_hasher = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_hasher = pwd_context
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -68,7 +68,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), auth_service: Au
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    user = auth_service.verify_token(token)
+    user = await auth_service.verify_token(token)
     if user is None:
         raise credentials_exception
 
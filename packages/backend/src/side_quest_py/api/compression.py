@@ -0,0 +1,249 @@
+"""
+Response compression for the Side Quest Py application.
+
+A pure ASGI middleware compresses complete JSON and text bodies above
+``COMPRESSION_MIN_SIZE`` with the best encoding the client accepts: zstd or
+brotli when their optional modules (zstandard, brotli) are installed, and
+gzip otherwise. Bodies of ``COMPRESSION_THREAD_MIN_SIZE`` or more are
+compressed in a worker thread so the event loop keeps serving other requests.
+Streamed responses, such as NDJSON lists, are passed through.
+
+A response with an ETag is the same body for as long as its ETag holds, so its
+compressed form is kept in a small per-worker LRU, bounded in bytes, keyed by
+the user, URL, ETag and encoding. A repeat request then skips recompression.
+"""
+
+import asyncio
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.side_quest_py.api.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore[assignment]
+
+# Fast settings: on the fly, a few percent of ratio is not worth several times the CPU
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "application/problem+json", "text/")
+
+# (user ID, path, query string, ETag, encoding)
+CacheKey = Tuple[Optional[str], str, bytes, str, str]
+
+
+def _encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """The installed encoders, by content coding, in order of preference."""
+    encoders: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = lambda body: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if brotli is not None:
+        encoders["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+    encoders["gzip"] = lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return encoders
+
+
+ENCODERS = _encoders()
+
+
+def negotiate(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """
+    Pick the encoding for a response from the client's Accept-Encoding header.
+
+    Args:
+        accept_encoding: The Accept-Encoding header, e.g. "gzip, br;q=0.5"
+        encodings: The encodings the server offers, most preferred first
+
+    Returns:
+        Optional[str]: The most preferred offered encoding the client accepts, or None
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.strip().lower()] = weight
+    for encoding in encodings:
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressedBodyCache:
+    """An LRU of compressed response bodies, bounded by their total size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache with its size bound."""
+        self.max_bytes = max_bytes
+        self._bodies: "OrderedDict[CacheKey, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        """Get a compressed body, or None if it is not cached."""
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._bodies.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: CacheKey, body: bytes) -> None:
+        """Cache a compressed body, evicting the least recently used ones past the size bound."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._bodies.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._bodies[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._bodies.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Forget every body and reset the counters."""
+        with self._lock:
+            self._bodies.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the cache statistics to a dictionary for JSON serialization.
+
+        Returns:
+            Dict[str, Any]: Size and hit counters for this worker
+        """
+        with self._lock:
+            return {
+                "encodings": list(ENCODERS),
+                "entries": len(self._bodies),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+compressed_bodies = CompressedBodyCache(settings.COMPRESSION_CACHE_BYTES)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware that compresses complete response bodies."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        thread_minimum_size: int,
+        cache: CompressedBodyCache = compressed_bodies,
+    ) -> None:
+        """
+        Initialize the middleware around the application.
+
+        Args:
+            app: The application
+            minimum_size: Bodies smaller than this many bytes are sent as they are
+            thread_minimum_size: Bodies of this many bytes or more are compressed in a worker thread
+            cache: The cache of compressed bodies of responses with an ETag
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Compress the response body if the client accepts an encoding."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("Accept-Encoding", ""), list(ENCODERS))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if not self._compressible(headers, body) or message.get("more_body", False):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await self._compress(scope, start["status"], headers, encoding, body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, headers: MutableHeaders, body: bytes) -> bool:
+        """Whether a complete body is large enough and of a type worth compressing."""
+        return (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
+
+    async def _compress(self, scope: Scope, status: int, headers: MutableHeaders, encoding: str, body: bytes) -> bytes:
+        """Compress a body, reusing the cached result for a response whose ETag is unchanged."""
+        key: Optional[CacheKey] = None
+        etag = headers.get("etag")
+        if etag is not None and status == 200:
+            principal = scope.get("state", {}).get("principal")
+            key = (principal.id if principal else None, scope["path"], scope["query_string"], etag, encoding)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        encoder = ENCODERS[encoding]
+        if len(body) >= self.thread_minimum_size:
+            compressed = await asyncio.to_thread(encoder, body)
+        else:
+            compressed = encoder(body)
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
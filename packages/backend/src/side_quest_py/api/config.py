@@ -7,6 +7,7 @@ settings for different environments (development, testing, production).
 
 import os
 import sys
+import tempfile
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
@@ -41,20 +42,100 @@ class BaseConfig(BaseSettings):
         raise ValueError("SECRET_KEY is not set")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    # Per-worker cache of verified tokens; entries never outlive their token
+    AUTH_CACHE_SIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    # Accept a valid token from its claims alone on a cache miss, without looking the user up; routes that
+    # need more than the user ID load it themselves, and only this host's token version table revokes tokens
+    AUTH_STATELESS: bool = False
+    # Write each issued token and its expiry to users.auth_token/token_expiry on login. Nothing reads them:
+    # expiry comes from the JWT "exp" and revocation from token_version. Turn this off to make logins
+    # read-only, then drop the columns once no deployed version writes them
+    AUTH_PERSIST_TOKENS: bool = True
+    # Current token version per user, shared by the workers on a host through a memory-mapped file
+    AUTH_TOKEN_VERSIONS_FILE: str = os.environ.get("AUTH_TOKEN_VERSIONS_FILE") or os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "side_quest_token_versions"
+    )
+    AUTH_TOKEN_VERSIONS_SLOTS: int = 65_536
+    # bcrypt runs in a per-worker thread pool; logins beyond the queue bound get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    # "bcrypt", or "argon2" (argon2id, needs argon2-cffi); stored hashes with another scheme or cost are
+    # rehashed on login. scripts/benchmarks/calibrate_password_hash.py picks the cost for the target
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_HASH_TARGET_MS: int = 250
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_MEMORY_COST: int = 65_536  # KiB
+    ARGON2_TIME_COST: int = 3
+    ARGON2_PARALLELISM: int = 4
+    # Failed logins allowed per username and per client IP in a sliding window; further attempts are
+    # rejected before hashing. Set LOGIN_THROTTLE_SHARED_FILE to share the counts between a host's workers
+    LOGIN_MAX_FAILURES_PER_USERNAME: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 300
+    LOGIN_THROTTLE_SHARED_FILE: str | None = os.environ.get("LOGIN_THROTTLE_SHARED_FILE")
+    LOGIN_THROTTLE_KEYS: int = 65_536
 
     # Database settings
     DATABASE_URL: str | None = os.environ.get("DATABASE_URL")
     if not DATABASE_URL:
         raise ValueError("DATABASE_URL is not set")
+    # Optional async URL for the API, derived from DATABASE_URL when not set
+    ASYNC_DATABASE_URL: str | None = os.environ.get("ASYNC_DATABASE_URL")
+
+    # Connection pool settings (per gunicorn worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Total connections shared by all gunicorn workers; overrides pool size and overflow when set
+    DB_MAX_CONNECTIONS: int | None = None
+    # Connections of the synchronous engine, which only scripts and Celery tasks use; they come out of the
+    # worker's share of DB_MAX_CONNECTIONS
+    DB_SYNC_POOL_SIZE: int = 1
+    # Commit once per request instead of once per service call
+    DB_UNIT_OF_WORK: bool = True
+
+    # Read replica settings (optional - reads stay on the primary when not set)
+    REPLICA_DATABASE_URL: str | None = os.environ.get("REPLICA_DATABASE_URL")
+    # Seconds a user's reads stay on the primary after they write
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # Recent writers, shared by the workers on a host through a memory-mapped file so a user's next read is
+    # kept on the primary whichever worker serves it
+    READ_YOUR_WRITES_FILE: str = os.environ.get("READ_YOUR_WRITES_FILE") or os.path.join(
+        "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "side_quest_read_your_writes"
+    )
+    READ_YOUR_WRITES_SLOTS: int = 65_536
+
+    # Pagination settings for the list endpoints: a request without a limit or cursor gets the whole list, and
+    # a cursor without a limit gets pages of the default size
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    # Rows fetched per round trip when a list is streamed as NDJSON
+    STREAM_BATCH_SIZE: int = 1000
+    # Quests accepted by one POST /quests/batch, all inserted with a single multi-row INSERT
+    QUEST_BATCH_MAX_SIZE: int = 500
+
+    # Response compression: bodies below the minimum size are not worth the CPU, bodies from the thread
+    # minimum up are compressed off the event loop, and compressed bodies of responses with an ETag are
+    # kept per worker up to the cache size
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_THREAD_MIN_SIZE: int = 64 * 1024
+    COMPRESSION_CACHE_BYTES: int = 16 * 1024 * 1024
 
     # CORS settings
     CORS_ORIGINS: list = ["*"]
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: list = ["*"]
     CORS_ALLOW_HEADERS: list = ["*"]
+    # Response headers browsers may read, e.g. the next page cursor
+    CORS_EXPOSE_HEADERS: list = ["Link", "X-Next-Cursor"]
 
     # Debug flag
     DEBUG: bool = False
+    # Check the bodies routes encode with fast_response against their response model
+    VALIDATE_RESPONSES: bool = False
 
     # Gunicorn settings
     GUNICORN_BIND: str | None = os.environ.get("GUNICORN_BIND")
@@ -123,12 +204,14 @@ class DevelopmentConfig(BaseConfig):
     """Development configuration."""
 
     DEBUG: bool = True
+    VALIDATE_RESPONSES: bool = True
 
 
 class TestingConfig(BaseConfig):
     """Testing configuration."""
 
     TESTING: bool = True
+    VALIDATE_RESPONSES: bool = True
 
 
 class ProductionConfig(BaseConfig):
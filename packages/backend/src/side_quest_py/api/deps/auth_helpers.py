@@ -1,64 +1,65 @@
 """
-Authentication helper functions for validating requests and tokens.
+Authentication helper functions for the routes.
 """
 
-from fastapi import Request, HTTPException, status
+from typing import Optional
 
+from fastapi import Depends, HTTPException, Request, status
+
+from src.side_quest_py.principal_cache import Principal
 from src.side_quest_py.services.auth_service import AuthService
-from src.side_quest_py.models.db_models import User
 
 
-def extract_token_from_header(request: Request) -> str:
+def get_current_principal(request: Request) -> Principal:
     """
-    Extract the Bearer token from the Authorization header.
+    Get the user the authentication middleware verified for this request.
 
     Args:
         request: The FastAPI request object
 
     Returns:
-        The extracted token
+        Principal: The authenticated user
 
     Raises:
-        HTTPException: If Authorization header is missing or malformed
+        HTTPException: If the request was not authenticated
     """
-    auth_header = request.headers.get("Authorization")
-    if not auth_header:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing Authorization header. Please provide a Bearer token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    if not auth_header.startswith("Bearer "):
+    principal: Optional[Principal] = getattr(request.state, "principal", None)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid Authorization header format. Use 'Bearer your_token_here'",
+            detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    return auth_header.replace("Bearer ", "")
+    return principal
 
 
-def verify_auth_token(token: str, auth_service: AuthService) -> User:
+async def get_principal_with_profile(
+    principal: Principal = Depends(get_current_principal), auth_service: AuthService = Depends()
+) -> Principal:
     """
-    Verify the authentication token.
+    Get the authenticated user with their username, email and timestamps.
+
+    A principal accepted from its token claims alone (AUTH_STATELESS) carries
+    only the user ID, so the profile is looked up by primary key for the routes
+    that need it.
 
     Args:
-        token: The token to verify
-        auth_service: The authentication service
+        principal: The authenticated user
+        auth_service: The auth service
 
     Returns:
-        The authenticated user
+        Principal: The authenticated user with their profile loaded
 
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If the user no longer exists
     """
-    user = auth_service.verify_token(token)
+    if principal.username is not None:
+        return principal
+    user = await auth_service.get_principal_user(principal.id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-
-    return user
+    return AuthService.principal_for(user, principal.token_version)
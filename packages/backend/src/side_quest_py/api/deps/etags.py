@@ -0,0 +1,75 @@
+"""
+ETag helpers for the polled read endpoints.
+
+A weak ETag is derived from a cheap version of the resource, such as the row
+count and newest ``updated_at`` of a list, and the request's query string, so
+it is known before the body is read or built. A request whose
+``If-None-Match`` lists it is answered with 304 and no body.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# MySQL DATETIME columns keep whole seconds, so two changes within a second can share an updated_at;
+# no ETag is issued until the newest change is older than that
+SETTLE_TIME = timedelta(seconds=1)
+
+# Responses are per user, and the client must revalidate before reusing one
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(request: Request, changed_at: Optional[datetime], *version: Any) -> Optional[str]:
+    """
+    Build the weak ETag of a response from the version of what it shows.
+
+    Args:
+        request: The request, whose query string selects the representation
+        changed_at: When the resource last changed, or None if it never has
+        version: Anything else that changes with the resource, such as a row count
+
+    Returns:
+        Optional[str]: The ETag, or None while the last change is too recent to tell apart from the next
+    """
+    if changed_at is not None and datetime.now() - changed_at < SETTLE_TIME:
+        return None
+    key = "|".join(str(part) for part in (request.url.query, changed_at, *version))
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """
+    Answer a conditional GET whose client already has the current version.
+
+    ETags are compared weakly, as If-None-Match requires.
+
+    Args:
+        request: The request
+        etag: The ETag of the current version, or None if there is none
+
+    Returns:
+        Optional[Response]: A 304 response if If-None-Match matches the ETag, None otherwise
+    """
+    header = request.headers.get("If-None-Match")
+    if etag is None or header is None:
+        return None
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    if "*" not in candidates and etag.removeprefix("W/") not in candidates:
+        return None
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def set_etag(response: Response, etag: Optional[str]) -> None:
+    """
+    Send the ETag with a full response, so the client can make the next request conditional.
+
+    Args:
+        response: The response to add the headers to
+        etag: The ETag of the response, or None if there is none
+    """
+    if etag is None:
+        return
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
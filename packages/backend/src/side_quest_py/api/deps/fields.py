@@ -0,0 +1,87 @@
+"""
+Sparse fieldsets and embedded related lists for the read endpoints.
+"""
+
+from typing import Callable, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+from src.side_quest_py.api.config import settings
+
+# The related lists an adventurer response can embed
+ADVENTURER_RELATIONS = ("quests", "completions")
+
+
+def sparse_fields(model: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """
+    Build the dependency that reads the ``fields`` query parameter of a route.
+
+    The services select only the named columns, so a client that shows a
+    roster asks for ``?fields=name,level`` and the rest are never read. The
+    ``id`` is always included, since it identifies the item and pages are
+    keyed on it.
+
+    Args:
+        model: The response schema whose fields may be requested
+
+    Returns:
+        Callable[..., Optional[Tuple[str, ...]]]: The dependency, which returns the requested fields in
+        schema order, or None for all of them
+    """
+
+    def fields(
+        fields: Optional[str] = Query(
+            None, description=f"Comma-separated fields to return, of: {', '.join(model.model_fields)}"
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Check the requested fields against the response schema.
+
+        Raises:
+            HTTPException: If no field or an unknown field is requested
+        """
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - model.model_fields.keys())
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}")
+        if not requested:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields requested")
+        requested.add("id")
+        return tuple(name for name in model.model_fields if name in requested)
+
+    return fields
+
+
+class IncludeParams:
+    """The ``include`` and ``quests_limit`` query parameters of the adventurer reads."""
+
+    def __init__(
+        self,
+        include: Optional[str] = Query(
+            None, description=f"Comma-separated related lists to embed, of: {', '.join(ADVENTURER_RELATIONS)}"
+        ),
+        quests_limit: Optional[int] = Query(
+            None, ge=1, le=settings.PAGE_SIZE_MAX, description="The most quests to embed per adventurer"
+        ),
+    ) -> None:
+        """
+        Check the requested relations.
+
+        Args:
+            include: The related lists to embed in each adventurer
+            quests_limit: The maximum number of quests embedded per adventurer, or None for all of them
+
+        Raises:
+            HTTPException: If an unknown relation is requested
+        """
+        requested = {name.strip() for name in (include or "").split(",") if name.strip()}
+        unknown = sorted(requested - set(ADVENTURER_RELATIONS))
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown relations: {', '.join(unknown)}"
+            )
+        self.relations = tuple(name for name in ADVENTURER_RELATIONS if name in requested)
+        self.quests_limit = quests_limit
@@ -0,0 +1,68 @@
+"""
+Pagination helpers for the list endpoints.
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException, Query, Request, Response, status
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.pagination import InvalidCursorError, decode_cursor
+
+
+class PageParams:
+    """
+    The ``limit`` and ``after`` query parameters of a list endpoint.
+
+    A request with neither gets the whole list, as the endpoints returned
+    before they were paginated. A cursor without a limit gets pages of
+    ``PAGE_SIZE_DEFAULT`` items.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=settings.PAGE_SIZE_MAX),
+        after: Optional[str] = Query(None, description="Cursor returned in X-Next-Cursor by the previous page"),
+    ) -> None:
+        """
+        Read the page size and decode the cursor.
+
+        Args:
+            limit: The number of items to return, or None for the default
+            after: The cursor of the previous page, or None for the first page
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        self.limit = limit if limit is not None or after is None else settings.PAGE_SIZE_DEFAULT
+        try:
+            self.after = decode_cursor(after) if after else None
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    @property
+    def fetch_limit(self) -> Optional[int]:
+        """The rows to fetch: the page and one lookahead row, or None for the whole list."""
+        return None if self.limit is None else self.limit + 1
+
+
+def set_next_page_headers(
+    request: Request, response: Response, next_cursor: Optional[str], limit: Optional[int]
+) -> None:
+    """
+    Tell the client where the next page starts.
+
+    The cursor is sent in ``X-Next-Cursor`` together with a ``Link`` header to
+    the next page, so the response body stays a plain list.
+
+    Args:
+        request: The request for the current page
+        response: The response to add the headers to
+        next_cursor: The cursor for the next page, or None on the last page
+        limit: The page size, or None if the whole list was returned
+    """
+    if next_cursor is None or limit is None:
+        return
+    next_url = request.url.include_query_params(after=next_cursor, limit=limit)
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
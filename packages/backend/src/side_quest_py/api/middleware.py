@@ -0,0 +1,100 @@
+"""
+Bearer token authentication middleware for the API routes.
+
+Every API route except login and registration needs an authenticated user.
+The token is checked here, before routing, so a request with a missing or bad
+token is answered with 401 without resolving the route's dependencies or
+checking out a database connection. A token found in the principal cache is
+accepted without the database; only a valid token that is not cached opens a
+short-lived session to look its user up by primary key. With AUTH_STATELESS
+a valid token is accepted from its claims and the host's token version table
+alone, and routes that need more than the user ID load it themselves. The
+principal is stored on ``request.state.principal`` for the routes.
+"""
+
+from typing import Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import get_session_factory
+from src.side_quest_py.principal_cache import Principal
+from src.side_quest_py.services.auth_service import (
+    AuthService,
+    cached_principal,
+    decode_access_token,
+    stateless_principal,
+)
+
+# API paths that are reached without a token
+PUBLIC_PATHS = frozenset({f"{settings.API_PREFIX}/auth/login", f"{settings.API_PREFIX}/auth/register"})
+
+
+class BearerAuthMiddleware:
+    """Pure ASGI middleware that authenticates API requests before routing."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware around the application."""
+        self.app = app
+
+    @staticmethod
+    def _is_protected(scope: Scope) -> bool:
+        """Whether the request needs a token; CORS preflights never carry one."""
+        path = scope["path"]
+        return (
+            scope["method"] != "OPTIONS"
+            and (path == settings.API_PREFIX or path.startswith(settings.API_PREFIX + "/"))
+            and path not in PUBLIC_PATHS
+        )
+
+    @staticmethod
+    def _bearer_token(scope: Scope) -> Optional[str]:
+        """Get the token from the Authorization header, or None if it is missing or malformed."""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                header = value.decode("latin-1")
+                return header[len("Bearer ") :] if header.startswith("Bearer ") else None
+        return None
+
+    async def _authenticate(self, scope: Scope, token: str) -> Optional[Principal]:
+        """Resolve the token's principal, touching the database only for a valid token that is not cached."""
+        decided, principal = cached_principal(token)
+        if decided:
+            return principal
+
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+
+        if settings.AUTH_STATELESS:
+            decided, principal = stateless_principal(token, payload)
+            if decided:
+                return principal
+
+        # Honour the app's dependency overrides, so the lookup uses the same database as the routes
+        factory = scope["app"].dependency_overrides.get(get_session_factory, get_session_factory)()
+        async with factory() as db:
+            return await AuthService(db=db).principal_from_payload(token, payload)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Authenticate protected HTTP requests and pass everything else through."""
+        if scope["type"] != "http" or not self._is_protected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = self._bearer_token(scope)
+        principal = await self._authenticate(scope, token) if token else None
+        if principal is None:
+            detail = "Invalid or expired token" if token else "Missing or malformed Authorization header"
+            response = JSONResponse(
+                {"detail": detail},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["principal"] = principal
+        await self.app(scope, receive, send)
@@ -0,0 +1,93 @@
+"""
+Fast JSON responses for the API routes.
+
+A route that returns a dict or a list has it validated against its
+``response_model``, dumped back to Python and then encoded with ``json``. The
+adventurer and quest routes already build their results from typed database
+columns, so they return a ``FastJSONResponse`` instead: the result is encoded
+once by orjson, straight from the rows or dicts, and FastAPI skips the second
+validation. The ``response_model`` of each route still documents the schema,
+and with ``VALIDATE_RESPONSES`` on, as in development and testing, the encoded
+body is checked against it so a result that drifts from its schema fails loudly.
+"""
+
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import RowMapping
+
+from src.side_quest_py.api.config import settings
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode the values orjson cannot, such as the RowMappings of the Core list queries."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact JSON with orjson.
+
+    Args:
+        content: The content to encode; datetimes are written in ISO 8601
+
+    Returns:
+        bytes: The encoded JSON
+    """
+    if isinstance(content, list) and content and isinstance(content[0], RowMapping):
+        # The rows of one result share their keys, so they are read once instead of per row
+        keys = list(content[0].keys())
+        content = [dict(zip(keys, row.values())) for row in content]
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    """The validator of a response model, built once per model."""
+    return TypeAdapter(model)
+
+
+class FastJSONResponse(JSONResponse):
+    """A JSON response encoded with orjson; the app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        """Encode the content once with orjson."""
+        return dumps(content)
+
+
+def fast_response(
+    content: Any, response: Optional[Response] = None, status_code: int = 200, model: Any = None
+) -> FastJSONResponse:
+    """
+    Return a route's result without FastAPI validating it against the response model again.
+
+    Args:
+        content: The result, built from typed database columns
+        response: The response the route set headers on, if any
+        status_code: The response status code
+        model: The route's response model, which the body is checked against when VALIDATE_RESPONSES is on,
+            or None for a result that is not the whole model, such as a sparse fieldset
+
+    Returns:
+        FastJSONResponse: The encoded response, with the route's headers
+
+    Raises:
+        ResponseValidationError: If the body does not match the response model
+    """
+    fast = FastJSONResponse(content, status_code=status_code)
+    if model is not None and settings.VALIDATE_RESPONSES:
+        try:
+            _adapter(model).validate_json(fast.body)
+        except ValidationError as e:
+            raise ResponseValidationError(errors=e.errors(include_url=False), body=content) from e
+    if response is not None:
+        fast.raw_headers.extend(header for header in response.headers.raw if header[0] != b"content-length")
+    return fast
@@ -2,24 +2,89 @@
 This module contains the routes for the adventurer endpoints.
 """
 
-from typing import List
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.side_quest_py.api.schemas.adventurer import AdventurerCreate, AdventurerUpdate, AdventurerResponse
+from src.side_quest_py.api.schemas.quest import AdventurerWithQuestsResponse
 from src.side_quest_py.services.adventurer_service import AdventurerService
-from src.side_quest_py.services.auth_service import AuthService
-from src.side_quest_py.api.deps.auth_helpers import extract_token_from_header, verify_auth_token
+from src.side_quest_py.services.quest_completion_service import QuestCompletionService
+from src.side_quest_py.services.quest_service import QuestService
+from src.side_quest_py.api.deps.auth_helpers import get_current_principal
+from src.side_quest_py.api.deps.etags import make_etag, not_modified, set_etag
+from src.side_quest_py.api.deps.fields import IncludeParams, sparse_fields
+from src.side_quest_py.api.deps.pagination import PageParams, set_next_page_headers
+from src.side_quest_py.api.responses import fast_response
+from src.side_quest_py.api.streaming import ndjson_response, wants_ndjson
+from src.side_quest_py.database import get_session_factory
+from src.side_quest_py.pagination import split_page
+from src.side_quest_py.principal_cache import Principal
 
 router = APIRouter(prefix="/api/v1", tags=["adventurer"])
 
 
+def _latest_change(versions: Sequence[Tuple[int, Optional[datetime]]]) -> Optional[datetime]:
+    """When the newest of the adventurers and the related lists a response embeds changed."""
+    return max((changed_at for _, changed_at in versions if changed_at is not None), default=None)
+
+
+def _group_by_adventurer(rows: Sequence[RowMapping]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group related rows, ordered by adventurer, under their adventurer's ID."""
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        grouped[row["adventurer_id"]].append(dict(row))
+    return grouped
+
+
+async def _embed_related(
+    adventurers: Sequence[RowMapping],
+    include: IncludeParams,
+    quest_service: QuestService,
+    completion_service: QuestCompletionService,
+) -> Sequence[Any]:
+    """
+    Embed the requested related lists in each adventurer.
+
+    Each list is loaded for all the adventurers with one IN query, then the
+    responses are assembled in a single pass, so the number of queries does
+    not grow with the number of adventurers.
+
+    Args:
+        adventurers: The adventurer rows
+        include: The related lists to embed
+        quest_service: The quest service
+        completion_service: The quest completion service
+
+    Returns:
+        Sequence[Any]: The adventurers, with a list per requested relation
+    """
+    if not include.relations:
+        return adventurers
+    adventurer_ids = [adventurer["id"] for adventurer in adventurers]
+    related: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    if "quests" in include.relations:
+        quests = await quest_service.get_quest_rows_by_adventurer(adventurer_ids, include.quests_limit)
+        related["quests"] = _group_by_adventurer(quests)
+    if "completions" in include.relations:
+        completions = await completion_service.get_completion_rows_by_adventurer(adventurer_ids)
+        related["completions"] = _group_by_adventurer(completions)
+    return [
+        {**adventurer, **{name: rows.get(adventurer["id"], []) for name, rows in related.items()}}
+        for adventurer in adventurers
+    ]
+
+
 @router.post("/adventurer", response_model=AdventurerResponse, status_code=status.HTTP_201_CREATED)
 async def create_adventurer(
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     adventurer_service: AdventurerService = Depends(),
 ):
     """
@@ -29,17 +94,12 @@ async def create_adventurer(
 
     Args:
         adventurer: The adventurer to create
-        user: The authenticated user (injected by the validate_token dependency)
+        user: The authenticated user (verified by the authentication middleware)
 
     Returns:
         The created adventurer
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         request_body = await request.json()
         if not request_body:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is required")
@@ -58,7 +118,11 @@ async def create_adventurer(
         created_adventurer = await adventurer_service.create_adventurer(
             name=adventurer_data.name, user_id=user_id_str, adventurer_type=adventurer_data.adventurer_type
         )
-        return adventurer_service.adventurer_to_dict(created_adventurer)
+        return fast_response(
+            adventurer_service.adventurer_to_dict(created_adventurer),
+            status_code=status.HTTP_201_CREATED,
+            model=AdventurerResponse,
+        )
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -70,7 +134,7 @@ async def update_adventurer(
     adventurer_id: str,
     adventurer_update: AdventurerUpdate,
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     adventurer_service: AdventurerService = Depends(),
 ):
     """
@@ -80,7 +144,7 @@ async def update_adventurer(
         adventurer_id: The ID of the adventurer to update
         adventurer_update: The properties to update
         request: The request object
-        auth_service: The auth service
+        user: The authenticated user
         adventurer_service: The adventurer service
 
     Returns:
@@ -90,11 +154,6 @@ async def update_adventurer(
         HTTPException: If authentication fails or adventurer not found
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         update_data = {k: v for k, v in adventurer_update.model_dump().items() if v is not None}
 
         updated_adventurer = await adventurer_service.update_adventurer(adventurer_id, **update_data)
@@ -104,7 +163,7 @@ async def update_adventurer(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"Adventurer with ID {adventurer_id} not found"
             )
 
-        return adventurer_service.adventurer_to_dict(updated_adventurer)
+        return fast_response(adventurer_service.adventurer_to_dict(updated_adventurer), model=AdventurerResponse)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -115,7 +174,7 @@ async def update_adventurer(
 async def delete_adventurer(
     adventurer_id: str,
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     adventurer_service: AdventurerService = Depends(),
 ):
     """
@@ -124,18 +183,13 @@ async def delete_adventurer(
     Args:
         adventurer_id: The ID of the adventurer to delete
         request: The request object
-        auth_service: The auth service
+        user: The authenticated user
         adventurer_service: The adventurer service
 
     Returns:
         The deleted adventurer
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         success = await adventurer_service.delete_adventurer(adventurer_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adventurer not found")
@@ -150,68 +204,136 @@ async def delete_adventurer(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
 
 
-@router.get("/adventurers", response_model=List[AdventurerResponse])
+@router.get("/adventurers", response_model=List[AdventurerWithQuestsResponse])
 async def get_all_adventurers(
     request: Request,
-    auth_service: AuthService = Depends(),
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(AdventurerResponse)),
+    include: IncludeParams = Depends(),
+    user: Principal = Depends(get_current_principal),
     adventurer_service: AdventurerService = Depends(),
+    quest_service: QuestService = Depends(),
+    completion_service: QuestCompletionService = Depends(),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     """
-    Get all adventurers.
+    Get the user's adventurers, or a page of them.
+
+    Clients that send ``Accept: application/x-ndjson`` instead get every
+    adventurer after the cursor, streamed one JSON object per line.
+    ``?fields=`` limits each adventurer to the named fields, and only their
+    columns are read. ``?include=quests,completions`` embeds those lists in
+    each adventurer of the page.
 
     Args:
         request: The request object
-        auth_service: The auth service
+        response: The response object, which receives the next page headers
+        page: The page size and the cursor of the previous page, both optional
+        fields: The fields to return, or None for all of them
+        include: The related lists to embed in each adventurer
+        user: The authenticated user
         adventurer_service: The adventurer service
+        quest_service: The quest service, which loads embedded quests
+        completion_service: The quest completion service, which loads embedded completions
+        session_factory: Opens the session that reads a streamed list
 
     Returns:
-        A list of all adventurers
+        A list of adventurers, with the next page cursor in the X-Next-Cursor header, or 304 if the
+        client's If-None-Match holds the list's current ETag
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         current_user_id: str = user.id
-        adventurers = await adventurer_service.get_all_adventurers(current_user_id)
-        return [adventurer_service.adventurer_to_dict(adventurer) for adventurer in adventurers]
+        if wants_ndjson(request):
+            if include.relations:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="include is not supported for NDJSON lists"
+                )
+
+            async def rows(db: AsyncSession) -> AsyncIterator[Dict[str, Any]]:
+                async for row in AdventurerService(db=db).stream_all_adventurer_rows(
+                    current_user_id, after=page.after, fields=fields
+                ):
+                    yield dict(row)
+
+            return ndjson_response(session_factory, rows, user_id=current_user_id)
+
+        versions = [await adventurer_service.get_adventurers_version(current_user_id)]
+        if "quests" in include.relations:
+            versions.append(await quest_service.get_user_quests_version(current_user_id))
+        if "completions" in include.relations:
+            versions.append(await completion_service.get_user_completions_version(current_user_id))
+        etag = make_etag(request, _latest_change(versions), *versions)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        adventurers = await adventurer_service.get_all_adventurer_rows(
+            current_user_id, limit=page.fetch_limit, after=page.after, fields=fields
+        )
+        adventurers, next_cursor = split_page(adventurers, page.limit)
+        set_next_page_headers(request, response, next_cursor, page.limit)
+        set_etag(response, etag)
+        embedded = await _embed_related(adventurers, include, quest_service, completion_service)
+        return fast_response(embedded, response, model=None if fields else List[AdventurerWithQuestsResponse])
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
 
 
-@router.get("/adventurer/{adventurer_id}", response_model=AdventurerResponse)
+@router.get("/adventurer/{adventurer_id}", response_model=AdventurerWithQuestsResponse)
 async def get_adventurer_by_id(
     adventurer_id: str,
     request: Request,
-    auth_service: AuthService = Depends(),
+    response: Response,
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(AdventurerResponse)),
+    include: IncludeParams = Depends(),
+    user: Principal = Depends(get_current_principal),
     adventurer_service: AdventurerService = Depends(),
+    quest_service: QuestService = Depends(),
+    completion_service: QuestCompletionService = Depends(),
 ):
     """
     Get an adventurer by ID.
 
+    ``?include=quests,completions`` embeds those lists in the adventurer.
+
     Args:
         adventurer_id: The ID of the adventurer to get
         request: The request object
-        auth_service: The auth service
+        response: The response object, which receives the ETag
+        fields: The fields to return, or None for all of them
+        include: The related lists to embed
+        user: The authenticated user
         adventurer_service: The adventurer service
+        quest_service: The quest service, which loads embedded quests
+        completion_service: The quest completion service, which loads embedded completions
 
     Returns:
-        The adventurer
+        The adventurer, or 304 if the client's If-None-Match holds its current ETag
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
-        adventurer = await adventurer_service.get_adventurer_by_id(adventurer_id)
+        changed_at = await adventurer_service.get_adventurer_updated_at(adventurer_id)
+        etag = None
+        if changed_at is not None:
+            versions: List[Tuple[int, Optional[datetime]]] = [(1, changed_at)]
+            if "quests" in include.relations:
+                versions.append(await quest_service.get_quests_version(adventurer_id))
+            if "completions" in include.relations:
+                versions.append(await completion_service.get_completions_version(adventurer_id))
+            etag = make_etag(request, _latest_change(versions), *versions)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        adventurer = await adventurer_service.get_adventurer_row(adventurer_id, fields=fields)
         if not adventurer:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Adventurer not found")
 
-        return adventurer_service.adventurer_to_dict(adventurer)
+        set_etag(response, etag)
+        (embedded,) = await _embed_related([adventurer], include, quest_service, completion_service)
+        return fast_response(embedded, response, model=None if fields else AdventurerWithQuestsResponse)
     except HTTPException as e:
         raise e
     except Exception as e:
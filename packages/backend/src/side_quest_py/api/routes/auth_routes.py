@@ -2,12 +2,14 @@
 This module contains the routes for the authentication endpoints.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
 
 from src.side_quest_py.api.schemas.auth import Token, UserCreate, UserResponse
 from src.side_quest_py.services.auth_service import AuthService
-from src.side_quest_py.api.deps.auth_helpers import extract_token_from_header, verify_auth_token
+from src.side_quest_py.api.deps.auth_helpers import get_current_principal, get_principal_with_profile
+from src.side_quest_py.api.deps.etags import make_etag, not_modified, set_etag
+from src.side_quest_py.principal_cache import Principal
 
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
@@ -29,7 +31,7 @@ async def register(user_data: UserCreate, auth_service: AuthService = Depends())
         HTTPException: If username or email already exists or if registration fails
     """
     try:
-        new_user = auth_service.register_user(
+        new_user = await auth_service.register_user(
             username=user_data.username, email=user_data.email, password=user_data.password
         )
         return new_user
@@ -42,13 +44,16 @@ async def register(user_data: UserCreate, auth_service: AuthService = Depends())
 
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), auth_service: AuthService = Depends()):
+async def login(
+    request: Request, form_data: OAuth2PasswordRequestForm = Depends(), auth_service: AuthService = Depends()
+):
     """
     Authenticate a user and issue an access token.
 
     This endpoint validates user credentials and issues a JWT token for authentication.
 
     Args:
+        request: The FastAPI request object
         form_data: The username and password for authentication
 
     Returns:
@@ -58,7 +63,11 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), auth_service:
         HTTPException: If authentication fails
     """
     try:
-        access_token = auth_service.authenticate_user(username=form_data.username, password=form_data.password)
+        access_token = await auth_service.authenticate_user(
+            username=form_data.username,
+            password=form_data.password,
+            client_ip=request.client.host if request.client else None,
+        )
 
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException:
@@ -70,12 +79,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), auth_service:
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(request: Request, auth_service: AuthService = Depends()):
+async def logout(user: Principal = Depends(get_current_principal), auth_service: AuthService = Depends()):
     """
     Logout a user by invalidating their authentication token.
 
     Args:
-        request: The FastAPI request object
+        user: The authenticated user
         auth_service: The auth service
 
     Returns:
@@ -85,13 +94,8 @@ async def logout(request: Request, auth_service: AuthService = Depends()):
         HTTPException: If logout fails
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         current_user_id = str(user.id)
-        auth_service.logout_user(current_user_id)
+        await auth_service.logout_user(current_user_id)
         return {"detail": "Successfully logged out"}
     except HTTPException:
         raise
@@ -102,18 +106,20 @@ async def logout(request: Request, auth_service: AuthService = Depends()):
 
 
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
-async def get_current_user(request: Request, auth_service: AuthService = Depends()):
+async def get_current_user(request: Request, response: Response, user: Principal = Depends(get_principal_with_profile)):
     """
     Get the current user's information.
+
+    The ETag comes from the authenticated principal, so a conditional request
+    for an unchanged user is answered with 304 without a query.
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
-        # Get the db user model instead of the token user model
-        return auth_service.user_to_dict(user)
+        etag = make_etag(request, user.updated_at, user.id)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        set_etag(response, etag)
+        return AuthService.user_to_dict(user)
     except HTTPException:
         raise
     except Exception as exc:
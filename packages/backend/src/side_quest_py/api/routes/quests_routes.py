@@ -2,16 +2,34 @@
 This module contains the routes for the quests endpoints.
 """
 
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from src.side_quest_py.api.schemas.quest import QuestResponse, QuestUpdate, QuestCreate
+from src.side_quest_py.api.schemas.quest import (
+    QuestBatchComplete,
+    QuestBatchCompleteResponse,
+    QuestBatchCreate,
+    QuestBatchResponse,
+    QuestCreate,
+    QuestResponse,
+    QuestUpdate,
+)
+from src.side_quest_py.models.quest import QuestBatchValidationError
+from src.side_quest_py.services.adventurer_service import AdventurerService
 from src.side_quest_py.services.quest_service import QuestService
-from src.side_quest_py.services.auth_service import AuthService
-from src.side_quest_py.api.deps.auth_helpers import extract_token_from_header, verify_auth_token
+from src.side_quest_py.api.deps.auth_helpers import get_current_principal
+from src.side_quest_py.api.deps.etags import make_etag, not_modified, set_etag
+from src.side_quest_py.api.deps.fields import sparse_fields
+from src.side_quest_py.api.deps.pagination import PageParams, set_next_page_headers
+from src.side_quest_py.api.responses import fast_response
+from src.side_quest_py.api.streaming import ndjson_response, wants_ndjson
+from src.side_quest_py.database import get_session_factory
+from src.side_quest_py.pagination import split_page
+from src.side_quest_py.principal_cache import Principal
 
 router = APIRouter(prefix="/api/v1", tags=["quests"])
 
@@ -19,7 +37,7 @@ router = APIRouter(prefix="/api/v1", tags=["quests"])
 @router.post("/quest", response_model=QuestResponse, status_code=status.HTTP_201_CREATED)
 async def create_quest(
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     quest_service: QuestService = Depends(),
 ):
     """
@@ -27,18 +45,13 @@ async def create_quest(
 
     Args:
         request: The request object
-        auth_service: The auth service
+        user: The authenticated user
         quest_service: The quest service
 
     Returns:
         The created quest
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         request_body = await request.json()
         if not request_body:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is required")
@@ -58,18 +71,91 @@ async def create_quest(
             experience_reward=quest_data.experience_reward or 100,
             adventurer_id=quest_data.adventurer_id,
         )
-        return quest_service.quest_to_dict(created_quest)
+        return fast_response(
+            quest_service.quest_to_dict(created_quest), status_code=status.HTTP_201_CREATED, model=QuestResponse
+        )
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
 
 
+@router.post("/quests/batch", response_model=QuestBatchResponse, status_code=status.HTTP_201_CREATED)
+async def create_quests(
+    batch: QuestBatchCreate,
+    user: Principal = Depends(get_current_principal),
+    quest_service: QuestService = Depends(),
+) -> Response:
+    """
+    Create many quests for the user's adventurers in one request.
+
+    By default the batch is all or nothing. With ``allow_partial`` the valid
+    quests are created and the invalid ones are reported by index.
+
+    Args:
+        batch: The quests to create
+        user: The authenticated user, who must own every referenced adventurer
+        quest_service: The quest service
+
+    Returns:
+        The created quests and the errors of the quests that were not, or 422 if none was created
+    """
+    try:
+        created, errors = await quest_service.create_quests(
+            [quest.model_dump() for quest in batch.quests], user_id=str(user.id), allow_partial=batch.allow_partial
+        )
+    except QuestBatchValidationError as e:
+        return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"errors": e.errors})
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+
+    if not created:
+        return JSONResponse(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"errors": errors})
+    return fast_response(
+        {"created": created, "errors": errors}, status_code=status.HTTP_201_CREATED, model=QuestBatchResponse
+    )
+
+
+@router.post("/quests/batch/complete", response_model=QuestBatchCompleteResponse)
+async def complete_quests(
+    batch: QuestBatchComplete,
+    user: Principal = Depends(get_current_principal),
+    quest_service: QuestService = Depends(),
+    adventurer_service: AdventurerService = Depends(),
+) -> Response:
+    """
+    Complete many quests of the user's adventurers in one request.
+
+    Quests that are already completed, missing or not the user's are skipped.
+    Each adventurer gains the summed rewards of its completed quests at once.
+
+    Args:
+        batch: The IDs of the quests to complete
+        user: The authenticated user
+        quest_service: The quest service
+        adventurer_service: The adventurer service
+
+    Returns:
+        The IDs of the quests completed by this request and the adventurers that gained experience
+    """
+    try:
+        completed, adventurers = await quest_service.complete_quests(batch.quest_ids, user_id=str(user.id))
+        return fast_response(
+            {
+                "completed": completed,
+                "adventurers": [adventurer_service.adventurer_to_dict(adventurer) for adventurer in adventurers],
+            },
+            model=QuestBatchCompleteResponse,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)) from e
+
+
 @router.put("/quest/{quest_id}", response_model=QuestResponse)
 async def update_quest(
     quest_id: str,
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     quest_service: QuestService = Depends(),
 ):
     """
@@ -78,18 +164,13 @@ async def update_quest(
     Args:
         quest_id: The ID of the quest to update
         request: The request object
-        auth_service: The auth service
+        user: The authenticated user
         quest_service: The quest service
 
     Returns:
         The updated quest
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         request_body = await request.json()
         if not request_body:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is required")
@@ -111,7 +192,7 @@ async def update_quest(
             adventurer_id=quest_data.adventurer_id,
             completed=quest_data.completed,
         )
-        return quest_service.quest_to_dict(updated_quest)
+        return fast_response(quest_service.quest_to_dict(updated_quest), model=QuestResponse)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -122,7 +203,7 @@ async def update_quest(
 async def delete_quest(
     quest_id: str,
     request: Request,
-    auth_service: AuthService = Depends(),
+    user: Principal = Depends(get_current_principal),
     quest_service: QuestService = Depends(),
 ):
     """
@@ -131,15 +212,10 @@ async def delete_quest(
     Args:
         quest_id: The ID of the quest to delete
         request: The request object
-        auth_service: The auth service
+        user: The authenticated user
         quest_service: The quest service
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         success = await quest_service.delete_quest(quest_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quest not found")
@@ -155,31 +231,61 @@ async def delete_quest(
 async def get_all_quests(
     adventurer_id: str,
     request: Request,
-    auth_service: AuthService = Depends(),
+    response: Response,
+    page: PageParams = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(sparse_fields(QuestResponse)),
+    user: Principal = Depends(get_current_principal),
     quest_service: QuestService = Depends(),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
 ):
     """
-    Get all quests.
+    Get an adventurer's quests, or a page of them.
+
+    Clients that send ``Accept: application/x-ndjson`` instead get every
+    quest after the cursor, streamed one JSON object per line. ``?fields=``
+    limits each quest to the named fields, and only their columns are read.
 
     Args:
+        adventurer_id: The ID of the adventurer
         request: The request object
-        auth_service: The auth service
+        response: The response object, which receives the next page headers
+        page: The page size and the cursor of the previous page, both optional
+        fields: The fields to return, or None for all of them
+        user: The authenticated user
         quest_service: The quest service
+        session_factory: Opens the session that reads a streamed list
 
     Returns:
-        A list of all quests
+        A list of quests, with the next page cursor in the X-Next-Cursor header, or 304 if the
+        client's If-None-Match holds the list's current ETag
     """
     try:
-        auth_token = extract_token_from_header(request)
-        user = verify_auth_token(auth_token, auth_service)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-
         if not adventurer_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Adventurer ID is required")
 
-        quests = await quest_service.get_all_quests(adventurer_id)
-        return [quest_service.quest_to_dict(quest) for quest in quests]
+        if wants_ndjson(request):
+
+            async def rows(db: AsyncSession) -> AsyncIterator[Dict[str, Any]]:
+                async for row in QuestService(db=db).stream_all_quest_rows(
+                    adventurer_id, after=page.after, fields=fields
+                ):
+                    yield dict(row)
+
+            return ndjson_response(session_factory, rows, user_id=str(user.id))
+
+        count, changed_at = await quest_service.get_quests_version(adventurer_id)
+        etag = make_etag(request, changed_at, count)
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        quests = await quest_service.get_all_quest_rows(
+            adventurer_id, limit=page.fetch_limit, after=page.after, fields=fields
+        )
+        quests, next_cursor = split_page(quests, page.limit)
+        set_next_page_headers(request, response, next_cursor, page.limit)
+        set_etag(response, etag)
+        return fast_response(quests, response, model=None if fields else List[QuestResponse])
     except HTTPException as e:
         raise e
     except Exception as e:
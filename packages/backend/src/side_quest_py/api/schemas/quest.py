@@ -2,8 +2,12 @@
 This module contains the schemas for the quest endpoints.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.api.schemas.adventurer import AdventurerResponse
 
 
 class QuestBase(BaseModel):
@@ -40,3 +44,55 @@ class QuestResponse(QuestBase):
     completed: bool
     created_at: datetime
     updated_at: datetime
+
+
+class QuestBatchCreate(BaseModel):
+    """Schema for creating many quests in one request."""
+
+    quests: List[QuestCreate] = Field(min_length=1, max_length=settings.QUEST_BATCH_MAX_SIZE)
+    # Create the valid quests and report the invalid ones, instead of rejecting the whole batch
+    allow_partial: bool = False
+
+
+class QuestBatchItemError(BaseModel):
+    """Schema for a quest of a batch that was not created."""
+
+    index: int
+    detail: str
+
+
+class QuestBatchResponse(BaseModel):
+    """Schema for the quest batch response."""
+
+    created: List[QuestResponse]
+    errors: List[QuestBatchItemError]
+
+
+class QuestBatchComplete(BaseModel):
+    """Schema for completing many quests in one request."""
+
+    quest_ids: List[str] = Field(min_length=1, max_length=settings.QUEST_BATCH_MAX_SIZE)
+
+
+class QuestBatchCompleteResponse(BaseModel):
+    """Schema for the quest batch completion response."""
+
+    # Quests completed by this request; the others were already completed or not found
+    completed: List[str]
+    adventurers: List[AdventurerResponse]
+
+
+class QuestCompletionResponse(BaseModel):
+    """Schema for a quest completion embedded in an adventurer response."""
+
+    id: str
+    quest_id: str
+    adventurer_id: str
+    created_at: datetime
+
+
+class AdventurerWithQuestsResponse(AdventurerResponse):
+    """Schema for an adventurer response with the related lists requested through ``include``."""
+
+    quests: List[QuestResponse] | None = None
+    completions: List[QuestCompletionResponse] | None = None
@@ -0,0 +1,71 @@
+"""
+Streaming NDJSON responses for the list endpoints.
+
+A client that sends ``Accept: application/x-ndjson`` gets the complete list
+as one JSON object per line. Rows are read through a server-side cursor and
+written out as they arrive, so the worker never holds the whole list.
+"""
+
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.side_quest_py.api.responses import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Lines are buffered into chunks of about this many bytes before being sent
+CHUNK_SIZE = 64 * 1024
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Check whether the client asked for a streamed NDJSON list.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        bool: True if the Accept header lists application/x-ndjson
+    """
+    accept = request.headers.get("Accept", "")
+    return any(media_range.split(";")[0].strip() == NDJSON_MEDIA_TYPE for media_range in accept.split(","))
+
+
+def ndjson_response(
+    session_factory: async_sessionmaker,
+    rows: Callable[[AsyncSession], AsyncIterator[Dict[str, Any]]],
+    user_id: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Stream rows as NDJSON from a session that lives as long as the response.
+
+    The request's own session is closed before the body is sent, so the rows
+    are read through a new read-only session opened by the body itself.
+
+    Args:
+        session_factory: The factory for the streaming session
+        rows: Produces the rows to send, given the streaming session
+        user_id: The ID of the requesting user, so recent writers read from the primary
+
+    Returns:
+        StreamingResponse: The NDJSON response
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            db.info["read_only"] = True
+            db.info["user_id"] = user_id
+            chunk = bytearray()
+            async for row in rows(db):
+                chunk += dumps(row)
+                chunk += b"\n"
+                if len(chunk) >= CHUNK_SIZE:
+                    yield bytes(chunk)
+                    chunk.clear()
+            if chunk:
+                yield bytes(chunk)
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
@@ -1,34 +1,215 @@
 """
 Database configuration for the Side Quest Py application.
 
-This module initializes the SQLAlchemy engine, session, and base model.
+This module initializes the SQLAlchemy engines, sessions, and base model.
+The API uses the async engine so queries never block the event loop, while
+scripts and Celery tasks keep using the synchronous engine.
 It also provides the dependency to get a database session.
 """
 
-from sqlalchemy import create_engine
+import os
+from typing import Any, AsyncIterator, Callable, Dict
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.side_quest_py.api.config import settings
+from src.side_quest_py.db_pool import PoolStatistics, get_pool_options
+from src.side_quest_py.db_routing import RoutingSession
+
+# Async driver to use for each database backend
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "mariadb": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Convert a synchronous database URL into its async driver equivalent.
+
+    Args:
+        database_url: The database URL, e.g. ``mysql+pymysql://...``
+
+    Returns:
+        str: The same URL using the async driver, e.g. ``mysql+aiomysql://...``
 
-# Database URL from settings
+    Raises:
+        ValueError: If there is no async driver for the database backend
+    """
+    url = make_url(database_url)
+    if url.get_driver_name() in ASYNC_DRIVERS.values():
+        return database_url
+
+    backend = url.get_backend_name()
+    async_driver = ASYNC_DRIVERS.get(backend)
+    if not async_driver:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+
+    return url.set(drivername=f"{backend}+{async_driver}").render_as_string(hide_password=False)
+
+
+# Database URLs from settings
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(SQLALCHEMY_DATABASE_URL)
+ASYNC_REPLICA_DATABASE_URL = (
+    get_async_database_url(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else None
+)
+
+# HTTP methods whose requests only read, so their SELECTs may use the replica
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Pool statistics for each engine in this worker process
+sync_pool_stats = PoolStatistics()
+async_pool_stats = PoolStatistics()
+replica_pool_stats = PoolStatistics()
 
-# Create SQLAlchemy engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Create SQLAlchemy engine for scripts and background tasks
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **get_pool_options(SQLALCHEMY_DATABASE_URL, sync_pool_stats))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Create async SQLAlchemy engine for the API
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL, **get_pool_options(ASYNC_SQLALCHEMY_DATABASE_URL, async_pool_stats, is_async=True)
+)
+
+# Create async SQLAlchemy engine for replica reads
+replica_async_engine = (
+    create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL, **get_pool_options(ASYNC_REPLICA_DATABASE_URL, replica_pool_stats, is_async=True)
+    )
+    if ASYNC_REPLICA_DATABASE_URL
+    else None
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    replica_bind=replica_async_engine.sync_engine if replica_async_engine else None,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 
-def get_db():
+def make_get_db(session_factory: async_sessionmaker) -> Callable[[Request], AsyncIterator[AsyncSession]]:
     """
-    Dependency to get a database session.
+    Build the get_db dependency for a session factory.
 
-    Yields:
-        Session: SQLAlchemy session that will be automatically closed
+    Args:
+        session_factory: The factory that creates the request's session
+
+    Returns:
+        Callable: The dependency function
     """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+    async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+        """
+        Dependency to get an async database session.
+
+        Sessions for read-only requests send their SELECTs to the replica when
+        one is configured. In unit-of-work mode the services only flush, and
+        the request's changes are committed once here after the route returns,
+        or rolled back if it raised.
+
+        Args:
+            request: The incoming request
+
+        Yields:
+            AsyncSession: SQLAlchemy async session that will be automatically closed
+        """
+        async with session_factory() as db:
+            db.info["read_only"] = request.method in READ_ONLY_METHODS
+            db.info["unit_of_work"] = settings.DB_UNIT_OF_WORK
+            principal = getattr(request.state, "principal", None)
+            if principal is not None:
+                # Lets the session keep this user's reads on the primary after they write
+                db.info["user_id"] = principal.id
+            try:
+                yield db
+                if db.info["unit_of_work"]:
+                    await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    return get_db
+
+
+get_db = make_get_db(AsyncSessionLocal)
+
+
+def get_session_factory() -> async_sessionmaker:
+    """
+    Dependency to get the async session factory.
+
+    Routes use it to open a session that outlives the request's own, e.g. one
+    that keeps reading rows while a streaming response is being sent.
+
+    Returns:
+        async_sessionmaker: The factory for API sessions
+    """
+    return AsyncSessionLocal
+
+
+async def commit_or_flush(db: AsyncSession) -> None:
+    """
+    Commit the session, or only flush it when it belongs to a unit of work.
+
+    Args:
+        db: The session used by the service
+    """
+    if db.info.get("unit_of_work"):
+        await db.flush()
+    else:
+        await db.commit()
+
+
+def call_after_commit(db: AsyncSession, callback: Callable[[], Any]) -> None:
+    """
+    Run a callback once the session's transaction has been committed.
+
+    Use this for side effects such as Celery tasks that must not see
+    uncommitted data. The callback is dropped if the transaction rolls back.
+
+    Args:
+        db: The session used by the service
+        callback: The function to call after commit
+    """
+    db.info.setdefault("after_commit_callbacks", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    """Run the callbacks registered with call_after_commit."""
+    for callback in session.info.pop("after_commit_callbacks", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session) -> None:
+    """Drop the callbacks of a rolled back transaction."""
+    session.info.pop("after_commit_callbacks", None)
+
+
+def get_pool_statistics() -> Dict[str, Any]:
+    """
+    Get the connection pool statistics for this worker process.
+
+    Returns:
+        Dict[str, Any]: The worker's process ID and the statistics for each engine
+    """
+    engines = {
+        "async": async_pool_stats.to_dict(async_engine.pool),
+        "sync": sync_pool_stats.to_dict(engine.pool),
+    }
+    if replica_async_engine is not None:
+        engines["replica"] = replica_pool_stats.to_dict(replica_async_engine.pool)
+
+    return {"pid": os.getpid(), "engines": engines}
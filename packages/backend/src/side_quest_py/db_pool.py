@@ -0,0 +1,182 @@
+"""
+Connection pool configuration and statistics for the Side Quest Py application.
+
+Pool sizing comes from the settings in ``api/config.py``. When a total
+connection budget is configured it is split evenly across the gunicorn
+workers, so every worker process gets its own share of the database's
+connection limit. The synchronous engine, which only scripts and Celery tasks
+use, keeps ``DB_SYNC_POOL_SIZE`` connections taken out of that share, and the
+async engine gets the rest. Each engine's pool also records checkout, overflow
+and wait-time statistics for the worker it runs in.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple, Type, cast
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.default import DefaultDialect
+from sqlalchemy.pool import ConnectionPoolEntry, Pool, QueuePool
+
+from src.side_quest_py.api.config import settings
+
+
+@dataclass
+class PoolStatistics:
+    """Checkout counters and wait times for one engine's pool in this worker."""
+
+    checkouts: int = 0
+    checkins: int = 0
+    overflow_checkouts: int = 0
+    peak_overflow: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_checkout(self, wait: float, overflow: int) -> None:
+        """Record a successful checkout and how long it waited for a connection."""
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_checkin(self) -> None:
+        """Record a connection being returned to the pool."""
+        with self._lock:
+            self.checkins += 1
+
+    def record_timeout(self, wait: float) -> None:
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Convert the statistics to a dictionary for JSON serialization.
+
+        Args:
+            pool: The pool the statistics were collected for
+
+        Returns:
+            Dict[str, Any]: Counters plus the pool's current size and usage
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "overflow_checkouts": self.overflow_checkouts,
+                "peak_overflow": self.peak_overflow,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+        if isinstance(pool, QueuePool):
+            stats.update(
+                {
+                    "pool_size": pool.size(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                }
+            )
+        return stats
+
+
+def instrument_pool_class(pool_class: Type[QueuePool], stats: PoolStatistics) -> Type[QueuePool]:
+    """
+    Create a subclass of a queue pool that records statistics.
+
+    The subclass keeps working after ``engine.dispose()`` because SQLAlchemy
+    recreates pools from ``self.__class__``.
+
+    Args:
+        pool_class: The queue pool class chosen by the dialect
+        stats: The statistics object to record into
+
+    Returns:
+        Type[QueuePool]: The instrumented pool class
+    """
+
+    class InstrumentedPool(pool_class):  # type: ignore
+        """Queue pool that records checkout statistics."""
+
+        def _do_get(self) -> ConnectionPoolEntry:
+            start = time.perf_counter()
+            try:
+                entry: ConnectionPoolEntry = super()._do_get()
+            except exc.TimeoutError:
+                stats.record_timeout(time.perf_counter() - start)
+                raise
+            stats.record_checkout(time.perf_counter() - start, self.overflow())
+            return entry
+
+        def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+            stats.record_checkin()
+            super()._do_return_conn(record)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def resolve_pool_limits() -> Tuple[int, int]:
+    """
+    Work out the async engine's pool size and overflow for this worker process.
+
+    When ``DB_MAX_CONNECTIONS`` is set, the budget is divided across
+    ``GUNICORN_WORKERS``, the synchronous engine's connections are taken out
+    of each worker's share, and a quarter of the remainder is kept as
+    overflow, so that both engines together never exceed the share.
+
+    Returns:
+        Tuple[int, int]: The pool size and max overflow
+    """
+    if not settings.DB_MAX_CONNECTIONS:
+        return settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+
+    workers = settings.GUNICORN_WORKERS or 1
+    per_worker = max(1, settings.DB_MAX_CONNECTIONS // workers - settings.DB_SYNC_POOL_SIZE)
+    max_overflow = per_worker // 4
+    return per_worker - max_overflow, max_overflow
+
+
+def get_pool_options(database_url: str, stats: PoolStatistics, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build the pool keyword arguments for create_engine/create_async_engine.
+
+    A synchronous engine gets a fixed pool of ``DB_SYNC_POOL_SIZE``
+    connections with no overflow, since scripts and Celery tasks hold one
+    session at a time; an async engine gets the worker's share.
+
+    Args:
+        database_url: The database URL the engine will connect to
+        stats: The statistics object the pool should record into
+        is_async: Whether the engine uses an async driver
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for the engine
+    """
+    url = make_url(database_url)
+    dialect = cast(Type[DefaultDialect], url.get_dialect(_is_async=is_async))
+    pool_class = dialect.get_pool_class(url)
+    if not issubclass(pool_class, QueuePool):
+        # SQLite in-memory databases use single-connection pools that take no sizing options
+        return {}
+
+    pool_size, max_overflow = resolve_pool_limits() if is_async else (settings.DB_SYNC_POOL_SIZE, 0)
+    return {
+        "poolclass": instrument_pool_class(pool_class, stats),
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
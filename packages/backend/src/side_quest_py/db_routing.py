@@ -0,0 +1,150 @@
+"""
+Read-replica routing for the Side Quest Py application.
+
+Sessions created for read-only requests send their SELECTs to the replica
+engine, while flushes and every other statement stay on the primary. After a
+user commits a write, their reads stick to the primary for a configurable
+window so they never read their own stale data from a lagging replica.
+"""
+
+import mmap
+import struct
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.shared_table import SharedTable, hash_key
+
+MAGIC = b"SQRW"
+# User key, pinned until (milliseconds since the epoch)
+SLOT = struct.Struct("=QQ")
+
+
+def _now_ms() -> int:
+    """The wall-clock time in milliseconds, comparable between the workers on a host."""
+    return time.time_ns() // 1_000_000
+
+
+class ReadYourWritesTracker(SharedTable):
+    """
+    Remembers which users wrote recently so their reads stay on the primary.
+
+    The pins live in a table shared by the workers on a host, so a read that
+    lands on another worker than the write is still kept on the primary. A pin
+    that has expired frees its slot for the next writer. If a writer finds no
+    free slot, every user is kept on the primary for one window instead.
+    """
+
+    def __init__(self, path: str, slots: int, window_seconds: float) -> None:
+        """Initialize the tracker with its file, slot count and the read-your-writes window."""
+        super().__init__(path, slots, SLOT, MAGIC)
+        self.window_seconds = window_seconds
+
+    def _find(self, table: mmap.mmap, key: int, now: int) -> Optional[int]:
+        """Return the offset of the key's slot, or of the first slot on its probe path that is free or expired."""
+        free = None
+        for offset in self.probe(key):
+            slot_key, pinned_until = SLOT.unpack_from(table, offset)
+            if slot_key == key:
+                return offset
+            if free is None and (slot_key == 0 or pinned_until <= now):
+                free = offset
+        return free
+
+    def pin(self, user_id: str) -> None:
+        """
+        Pin a user's reads to the primary for the configured window.
+
+        Args:
+            user_id: The ID of the user who just wrote
+        """
+        hashed = hash_key(user_id)
+        now = _now_ms()
+        with self.locked() as table:
+            offset = self._find(table, hashed, now)
+            if offset is None:
+                self.mark_overflowed(table)
+                return
+            SLOT.pack_into(table, offset, hashed, now + int(self.window_seconds * 1000))
+
+    def is_pinned(self, user_id: Optional[str]) -> bool:
+        """
+        Check whether a user's reads must go to the primary.
+
+        Args:
+            user_id: The ID of the user, or None if not known yet
+
+        Returns:
+            bool: True if the user wrote within the window, or if a pin was dropped within the window
+        """
+        if user_id is None:
+            return False
+        table = self.mapping()
+        hashed = hash_key(user_id)
+        for offset in self.probe(hashed):
+            slot_key, pinned_until = SLOT.unpack_from(table, offset)
+            if slot_key == hashed:
+                return bool(pinned_until > _now_ms())
+        return self.overflowed_within(self.window_seconds)
+
+
+read_your_writes = ReadYourWritesTracker(
+    settings.READ_YOUR_WRITES_FILE, settings.READ_YOUR_WRITES_SLOTS, settings.READ_YOUR_WRITES_SECONDS
+)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends read-only SELECTs to a replica engine.
+
+    The session reads two keys from ``session.info``: ``read_only`` is set
+    by ``get_db`` for GET requests, and ``user_id`` is set once the request's
+    user is known so that recent writers are kept on the primary.
+    """
+
+    def __init__(self, *args: Any, replica_bind: Optional[Engine] = None, **kwargs: Any) -> None:
+        """Initialize the session with an optional replica engine."""
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        """Route SELECTs to the replica when the session is read-only."""
+        if (
+            self.replica_bind is not None
+            and self.info.get("read_only")
+            and isinstance(clause, Select)
+            and not read_your_writes.is_pinned(self.info.get("user_id"))
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_write(session: Session, _flush_context: Any) -> None:
+    """Remember that this session wrote to the primary."""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _record_statement_write(orm_execute_state: Any) -> None:
+    """Remember that this session ran an UPDATE or DELETE outside of a flush."""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_writer(session: Session) -> None:
+    """Pin the user to the primary after their writes are committed."""
+    user_id = session.info.get("user_id")
+    if session.info.pop("has_writes", False) and user_id is not None:
+        read_your_writes.pin(user_id)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_write(session: Session) -> None:
+    """Forget writes that were rolled back."""
+    session.info.pop("has_writes", None)
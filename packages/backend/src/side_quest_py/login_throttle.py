@@ -0,0 +1,260 @@
+"""
+Login brute-force throttle for the Side Quest Py application.
+
+Every login attempt costs a full password hash, so a credential-stuffing
+burst can saturate every worker. Failed attempts are counted per username and
+per client IP in a sliding window, and once either count reaches its limit
+further attempts are rejected before any hashing starts. A successful login
+clears its username's count.
+
+The window is a sliding window counter: the count of the current fixed window
+plus the previous window's count weighted by how much of it still overlaps
+the sliding window. It needs two counters per key instead of a timestamp per
+attempt, so the same slots work in process memory and in a table shared by
+the workers on a host (``LOGIN_THROTTLE_SHARED_FILE``). The shared table fails
+open: if it is full, attempts for keys it cannot hold are not counted.
+"""
+
+import math
+import mmap
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.shared_table import HEADER, SharedTable, hash_key
+
+MAGIC = b"SQLT"
+# Key, window number, count in that window, count in the window before
+SLOT = struct.Struct("=QQII")
+
+# (window number, current count, previous count)
+Counts = Tuple[int, int, int]
+
+
+def _roll(counts: Counts, window: int) -> Counts:
+    """Move stored counts forward to the given window."""
+    stored_window, current, previous = counts
+    if stored_window == window:
+        return counts
+    if stored_window == window - 1:
+        return window, 0, current
+    return window, 0, 0
+
+
+class MemoryCounters:
+    """Window counters in process memory, bounded with LRU eviction."""
+
+    def __init__(self, max_keys: int) -> None:
+        """Initialize the counters with their size bound."""
+        self.max_keys = max_keys
+        self._counts: "OrderedDict[str, Counts]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, window: int) -> Counts:
+        """Get a key's counts as of the given window."""
+        with self._lock:
+            return _roll(self._counts.get(key, (window, 0, 0)), window)
+
+    def add(self, key: str, window: int) -> None:
+        """Count one attempt for a key in the given window."""
+        with self._lock:
+            _, current, previous = _roll(self._counts.get(key, (window, 0, 0)), window)
+            self._counts[key] = (window, current + 1, previous)
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_keys:
+                self._counts.popitem(last=False)
+
+    def clear_key(self, key: str) -> None:
+        """Forget a key's attempts."""
+        with self._lock:
+            self._counts.pop(key, None)
+
+    def clear(self) -> None:
+        """Forget every key."""
+        with self._lock:
+            self._counts.clear()
+
+
+class SharedCounters(SharedTable):
+    """Window counters in a table shared by the workers on a host."""
+
+    def __init__(self, path: str, slots: int) -> None:
+        """Initialize the counters; the file is opened on first use."""
+        super().__init__(path, slots, SLOT, MAGIC)
+
+    def _find(self, table: mmap.mmap, key: int, window: int) -> Optional[int]:
+        """Return the offset of the key's slot, or of the first slot on its probe path that is free or stale."""
+        free = None
+        for offset in self.probe(key):
+            slot_key, slot_window, _, _ = SLOT.unpack_from(table, offset)
+            if slot_key == key:
+                return offset
+            if free is None and (slot_key == 0 or slot_window < window - 1):
+                free = offset
+        return free
+
+    def get(self, key: str, window: int) -> Counts:
+        """Get a key's counts as of the given window."""
+        table = self.mapping()
+        hashed = hash_key(key)
+        for offset in self.probe(hashed):
+            slot_key, slot_window, current, previous = SLOT.unpack_from(table, offset)
+            if slot_key == hashed:
+                return _roll((slot_window, current, previous), window)
+        return window, 0, 0
+
+    def add(self, key: str, window: int) -> None:
+        """Count one attempt for a key in the given window."""
+        hashed = hash_key(key)
+        with self.locked() as table:
+            offset = self._find(table, hashed, window)
+            if offset is None:
+                self.mark_overflowed(table)
+                return
+            slot_key, slot_window, current, previous = SLOT.unpack_from(table, offset)
+            if slot_key != hashed:
+                slot_window, current, previous = window, 0, 0
+            _, current, previous = _roll((slot_window, current, previous), window)
+            SLOT.pack_into(table, offset, hashed, window, current + 1, previous)
+
+    def clear_key(self, key: str) -> None:
+        """Forget a key's attempts."""
+        hashed = hash_key(key)
+        with self.locked() as table:
+            for offset in self.probe(hashed):
+                if SLOT.unpack_from(table, offset)[0] == hashed:
+                    SLOT.pack_into(table, offset, hashed, 0, 0, 0)
+                    return
+
+    def clear(self) -> None:
+        """Forget every key."""
+        with self.locked() as table:
+            table[HEADER.size :] = bytes(len(table) - HEADER.size)
+
+
+class LoginThrottledError(Exception):
+    """Raised when a login attempt is rejected by the throttle."""
+
+    def __init__(self, retry_after: int) -> None:
+        """Initialize the error with the seconds until the client should retry."""
+        super().__init__(f"Too many failed login attempts, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class LoginThrottle:
+    """Sliding-window limits on failed logins per username and per client IP."""
+
+    def __init__(
+        self,
+        max_per_username: int,
+        max_per_ip: int,
+        window_seconds: int,
+        counters: Union[MemoryCounters, SharedCounters],
+    ) -> None:
+        """Initialize the throttle with its limits, window and counter store."""
+        self.max_per_username = max_per_username
+        self.max_per_ip = max_per_ip
+        self.window_seconds = window_seconds
+        self.counters = counters
+        self._lock = threading.Lock()
+        self.rejected_by_username = 0
+        self.rejected_by_ip = 0
+        self.failures = 0
+
+    @staticmethod
+    def _keys(username: str, client_ip: Optional[str]) -> List[Tuple[str, str]]:
+        """The (kind, key) pairs an attempt is counted under."""
+        keys = [("username", f"username:{username.lower()}")]
+        if client_ip:
+            keys.append(("ip", f"ip:{client_ip}"))
+        return keys
+
+    def _window(self) -> Tuple[int, float]:
+        """The current window number and the fraction of it that has elapsed."""
+        window, elapsed = divmod(time.time(), self.window_seconds)
+        return int(window), elapsed / self.window_seconds
+
+    def check(self, username: str, client_ip: Optional[str]) -> None:
+        """
+        Reject an attempt if its username or client IP has too many recent failures.
+
+        Args:
+            username: The username being logged in to
+            client_ip: The client's IP address, if known
+
+        Raises:
+            LoginThrottledError: If the attempt is rejected
+        """
+        window, elapsed = self._window()
+        for kind, key in self._keys(username, client_ip):
+            limit = self.max_per_username if kind == "username" else self.max_per_ip
+            _, current, previous = self.counters.get(key, window)
+            if current + previous * (1 - elapsed) >= limit:
+                with self._lock:
+                    if kind == "username":
+                        self.rejected_by_username += 1
+                    else:
+                        self.rejected_by_ip += 1
+                raise LoginThrottledError(max(1, math.ceil((1 - elapsed) * self.window_seconds)))
+
+    def record_failure(self, username: str, client_ip: Optional[str]) -> None:
+        """
+        Count a failed attempt against its username and client IP.
+
+        Args:
+            username: The username that failed to log in
+            client_ip: The client's IP address, if known
+        """
+        window, _ = self._window()
+        for _, key in self._keys(username, client_ip):
+            self.counters.add(key, window)
+        with self._lock:
+            self.failures += 1
+
+    def record_success(self, username: str) -> None:
+        """
+        Clear a username's failures after it logs in.
+
+        Args:
+            username: The username that logged in
+        """
+        self.counters.clear_key(self._keys(username, None)[0][1])
+
+    def clear(self) -> None:
+        """Forget every attempt and reset the counters."""
+        self.counters.clear()
+        with self._lock:
+            self.rejected_by_username = self.rejected_by_ip = self.failures = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the throttle statistics to a dictionary for JSON serialization.
+
+        Returns:
+            Dict[str, Any]: Limits, failure and rejection counters for this worker
+        """
+        with self._lock:
+            return {
+                "shared": isinstance(self.counters, SharedCounters),
+                "max_per_username": self.max_per_username,
+                "max_per_ip": self.max_per_ip,
+                "window_seconds": self.window_seconds,
+                "failures": self.failures,
+                "rejected_by_username": self.rejected_by_username,
+                "rejected_by_ip": self.rejected_by_ip,
+            }
+
+
+login_throttle = LoginThrottle(
+    settings.LOGIN_MAX_FAILURES_PER_USERNAME,
+    settings.LOGIN_MAX_FAILURES_PER_IP,
+    settings.LOGIN_FAILURE_WINDOW_SECONDS,
+    (
+        SharedCounters(settings.LOGIN_THROTTLE_SHARED_FILE, settings.LOGIN_THROTTLE_KEYS)
+        if settings.LOGIN_THROTTLE_SHARED_FILE
+        else MemoryCounters(settings.LOGIN_THROTTLE_KEYS)
+    ),
+)
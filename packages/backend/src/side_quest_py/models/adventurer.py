@@ -1,6 +1,8 @@
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Union
 
 from ulid import ULID
 
@@ -31,9 +33,85 @@ class AdventurerDeletionError(Exception):
     """Exception raised when there's an error deleting an adventurer."""
 
 
+@dataclass(frozen=True)
+class LinearLevelCurve:
+    """Each level needs a fixed amount more experience than the one before it."""
+
+    exp_per_level: int = 100
+
+    def required_exp(self, level: int) -> int:
+        """Return the experience needed to go from ``level`` to the next level."""
+        return level * self.exp_per_level
+
+
+@dataclass(frozen=True)
+class ExponentialLevelCurve:
+    """Each level needs ``growth`` times the experience of the one before it."""
+
+    base_exp: int = 100
+    growth: float = 1.5
+
+    def required_exp(self, level: int) -> int:
+        """Return the experience needed to go from ``level`` to the next level."""
+        return round(self.base_exp * self.growth ** (level - 1))
+
+
+@dataclass(frozen=True)
+class TableLevelCurve:
+    """Experience requirements read from a table; levels past its end reuse the last entry."""
+
+    requirements: Tuple[int, ...]
+
+    def required_exp(self, level: int) -> int:
+        """Return the experience needed to go from ``level`` to the next level."""
+        return self.requirements[min(level, len(self.requirements)) - 1]
+
+
+LevelCurve = Union[LinearLevelCurve, ExponentialLevelCurve, TableLevelCurve]
+
+
+@lru_cache(maxsize=None)
+def _cumulative_exp_table(curve: LevelCurve, max_level: int) -> Tuple[int, ...]:
+    """
+    Build the total experience needed to reach each level of a curve.
+
+    Args:
+        curve: The level curve
+        max_level: The highest level an adventurer can reach
+
+    Raises:
+        AdventurerLevelError: If the curve requires a non-positive amount of experience
+
+    Returns:
+        Tuple[int, ...]: Entry ``i`` is the total experience needed to reach level ``i + 1``
+    """
+    table = [0]
+    for level in range(1, max_level):
+        required_exp = curve.required_exp(level)
+        if required_exp <= 0:
+            raise AdventurerLevelError(f"Level {level} must require positive experience, got {required_exp}")
+        table.append(table[-1] + required_exp)
+    return tuple(table)
+
+
 class LevelCalculator:
     """Handles the logic necessary when an adventurer levels up"""
 
+    # Adventurers stop leveling here; further experience keeps accumulating
+    MAX_LEVEL = 100
+
+    def __init__(self, curve: Optional[LevelCurve] = None, max_level: int = MAX_LEVEL) -> None:
+        """
+        Initialize the calculator with the cumulative experience table for a curve.
+
+        Args:
+            curve: The level curve to use (default: LinearLevelCurve())
+            max_level: The highest level an adventurer can reach
+        """
+        self.curve = curve or LinearLevelCurve()
+        self.max_level = max_level
+        self._cumulative_exp = _cumulative_exp_table(self.curve, max_level)
+
     def calculate_req_exp(self, level: int) -> int:
         """
         Calculate the experience needed to reach the next level.
@@ -50,7 +128,9 @@ class LevelCalculator:
         try:
             if level < 1:
                 raise AdventurerLevelError("Level must be greater than 0")
-            return level * 100
+            if level < self.max_level:
+                return self._cumulative_exp[level] - self._cumulative_exp[level - 1]
+            return self.curve.required_exp(level)
         except TypeError as e:
             raise AdventurerLevelError(f"Invalid level type: {str(e)}") from e
 
@@ -80,6 +160,88 @@ class LevelCalculator:
         except TypeError as e:
             raise AdventurerLevelError(f"Invalid input type: {str(e)}") from e
 
+    def total_experience(self, level: int, experience: int) -> int:
+        """
+        Convert a level and the experience within it into a total experience.
+
+        Args:
+            level (int): The level of the adventurer.
+            experience (int): The experience earned towards the next level.
+
+        Levels past the highest one, e.g. set through PUT /adventurer, count as the highest.
+
+        Raises:
+            AdventurerLevelError: If the level is less than 1.
+
+        Returns:
+            int: The total experience earned since level 1.
+        """
+        if level < 1:
+            raise AdventurerLevelError("Level must be greater than 0")
+        return self._cumulative_exp[min(level, self.max_level) - 1] + experience
+
+    def resolve(self, total_experience: int) -> Tuple[int, int]:
+        """
+        Resolve a total experience into a level and the experience within it.
+
+        Args:
+            total_experience (int): The total experience earned since level 1.
+
+        Raises:
+            AdventurerExperienceError: If the total experience is negative.
+
+        Returns:
+            Tuple[int, int]: The level and the experience earned towards the next level.
+        """
+        if total_experience < 0:
+            raise AdventurerExperienceError("Experience cannot be negative")
+        level = bisect_right(self._cumulative_exp, total_experience)
+        return level, total_experience - self._cumulative_exp[level - 1]
+
+    def resolve_many(self, total_experiences: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        Resolve many total experiences at once, e.g. when recomputing every adventurer.
+
+        Args:
+            total_experiences (Iterable[int]): The total experiences to resolve.
+
+        Raises:
+            AdventurerExperienceError: If any total experience is negative.
+
+        Returns:
+            List[Tuple[int, int]]: The level and remaining experience for each total, in order.
+        """
+        table = self._cumulative_exp
+        resolved = []
+        for total_experience in total_experiences:
+            if total_experience < 0:
+                raise AdventurerExperienceError("Experience cannot be negative")
+            level = bisect_right(table, total_experience)
+            resolved.append((level, total_experience - table[level - 1]))
+        return resolved
+
+    def apply_gain(self, level: int, experience: int, experience_gain: int) -> Tuple[int, int]:
+        """
+        Apply an experience gain, carrying any overflow across as many levels as it covers.
+
+        An adventurer already past the highest level keeps its level and accumulates the gain.
+
+        Args:
+            level (int): The current level of the adventurer.
+            experience (int): The experience earned towards the next level.
+            experience_gain (int): The experience gained by the adventurer.
+
+        Raises:
+            AdventurerExperienceError: If the experience gained is negative.
+
+        Returns:
+            Tuple[int, int]: The new level and the experience earned towards the level after it.
+        """
+        if experience_gain < 0:
+            raise AdventurerExperienceError("Experience cannot be negative")
+        new_level, remaining_experience = self.resolve(self.total_experience(level, experience) + experience_gain)
+        return max(new_level, level), remaining_experience
+
 
 @dataclass
 class Adventurer:
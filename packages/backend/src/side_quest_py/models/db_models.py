@@ -4,8 +4,8 @@ This module contains the SQLAlchemy models for the Side Quest application.
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import deferred, relationship
 
 from src.side_quest_py.database import Base
 
@@ -19,8 +19,11 @@ class User(Base):  # type: ignore
     username = Column(String(100), nullable=False, unique=True)
     email = Column(String(100), nullable=False, unique=True)
     password_hash = Column(String(128), nullable=False)
-    auth_token = Column(String(128), nullable=True)
-    token_expiry = Column(DateTime, nullable=True)
+    # Legacy copy of the last issued token, written only with AUTH_PERSIST_TOKENS and never loaded
+    auth_token = deferred(Column(String(128), nullable=True))
+    token_expiry = deferred(Column(DateTime, nullable=True))
+    # Embedded in access tokens as "ver"; bumping it revokes every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -32,6 +35,12 @@ class Adventurer(Base):  # type: ignore
     """SQLAlchemy model for adventurers"""
 
     __tablename__ = "adventurers"
+    __table_args__ = (
+        # get_all_adventurers filters by user
+        Index("ix_adventurers_user_id_id", "user_id", "id"),
+        # The adventurer list's ETag counts a user's adventurers and reads their newest updated_at
+        Index("ix_adventurers_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(String(36), primary_key=True)
     name = Column(String(100), nullable=False)
@@ -56,6 +65,14 @@ class Quest(Base):  # type: ignore
     """SQLAlchemy model for quests"""
 
     __tablename__ = "quests"
+    __table_args__ = (
+        # get_all_quests filters by adventurer
+        Index("ix_quests_adventurer_id_id", "adventurer_id", "id"),
+        # get_uncompleted_quests filters by completion state
+        Index("ix_quests_completed_adventurer_id", "completed", "adventurer_id"),
+        # The quest list's ETag counts an adventurer's quests and reads their newest updated_at
+        Index("ix_quests_adventurer_id_updated_at", "adventurer_id", "updated_at"),
+    )
 
     id = Column(String(36), primary_key=True)
     adventurer_id = Column(String(36), ForeignKey("adventurers.id"), nullable=False)
@@ -73,6 +90,14 @@ class QuestCompletion(Base):  # type: ignore
     """SQLAlchemy model for tracking quest completions by adventurers"""
 
     __tablename__ = "quest_completions"
+    __table_args__ = (
+        # get_quest_completion and delete_quest_completion look up by quest
+        Index("ix_quest_completions_quest_id_adventurer_id", "quest_id", "adventurer_id"),
+        # send_daily_recap_emails filters on a created_at range
+        Index("ix_quest_completions_created_at_adventurer_id", "created_at", "adventurer_id"),
+        # Adventurer reads that embed completions load them by adventurer
+        Index("ix_quest_completions_adventurer_id_id", "adventurer_id", "id"),
+    )
 
     id = Column(String(36), primary_key=True)
     adventurer_id = Column(String(36), ForeignKey("adventurers.id"), nullable=False)
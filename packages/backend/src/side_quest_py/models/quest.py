@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Dict, List
 
 from ulid import ULID
 
@@ -8,6 +9,15 @@ class QuestValidationError(Exception):
     """Raised when a quest fails validation."""
 
 
+class QuestBatchValidationError(QuestValidationError):
+    """Raised when items of a quest batch fail validation and the batch is rejected as a whole."""
+
+    def __init__(self, errors: List[Dict[str, Any]]) -> None:
+        """Initialize the error with the index and detail of every invalid item."""
+        super().__init__(f"{len(errors)} quests in the batch are invalid")
+        self.errors = errors
+
+
 class QuestCompletionError(Exception):
     """Raised when there's an error completing a quest."""
 
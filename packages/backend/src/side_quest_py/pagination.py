@@ -0,0 +1,96 @@
+"""
+Keyset pagination for the Side Quest Py application.
+
+List endpoints page through rows in primary-key order. The IDs are ULIDs, so
+that order is also creation order. A page starts after the last ID of the
+previous page, which the database finds with an index seek however deep the
+client has paged, unlike an OFFSET that reads and discards every earlier row.
+The last ID is handed to clients as an opaque cursor.
+"""
+
+import base64
+import binascii
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import Select
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(last_id: str) -> str:
+    """
+    Encode the last ID of a page as an opaque cursor.
+
+    Args:
+        last_id: The ID of the last row on the page
+
+    Returns:
+        str: The cursor for the next page
+    """
+    return base64.urlsafe_b64encode(last_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a cursor back into the last ID of the previous page.
+
+    Args:
+        cursor: The cursor returned with the previous page
+
+    Returns:
+        str: The ID the next page starts after
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        last_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    if not last_id:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return last_id
+
+
+def keyset_page(statement: Select, id_column: Any, limit: Optional[int], after: Optional[str]) -> Select:
+    """
+    Restrict a query to one page in ID order.
+
+    Args:
+        statement: The query to page through
+        id_column: The primary key column to order and seek by
+        limit: The number of rows to return, or None for all remaining rows
+        after: The ID the page starts after, or None for the first page
+
+    Returns:
+        Select: The query for the page
+    """
+    if after is not None:
+        statement = statement.where(id_column > after)
+    statement = statement.order_by(id_column)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def split_page(rows: Sequence[T], limit: Optional[int]) -> Tuple[List[T], Optional[str]]:
+    """
+    Split rows fetched with ``limit + 1`` into the page and the next cursor.
+
+    Args:
+        rows: The ORM objects or row mappings fetched for the page, including one lookahead row
+        limit: The page size, or None if the rows are the whole list
+
+    Returns:
+        Tuple[List[T], Optional[str]]: The page and the cursor for the next page, or None on the last page
+    """
+    if limit is None or len(rows) <= limit:
+        return list(rows), None
+    page = list(rows[:limit])
+    last_row: Any = page[-1]
+    last_id = last_row["id"] if isinstance(last_row, Mapping) else last_row.id
+    return page, encode_cursor(str(last_id))
@@ -0,0 +1,298 @@
+"""
+Password hashing off the event loop for the Side Quest Py application.
+
+bcrypt is deliberately slow, tens of milliseconds per hash or check. Run
+inline in an ``async def`` route, every login would stall all other requests
+on the worker for that long, so hashing runs in a small dedicated thread pool
+that the routes await (bcrypt releases the GIL while it works). The number of
+hashes waiting for a thread is bounded; past the bound new logins are turned
+away at once rather than queueing for seconds. Queue depth and wait time are
+tracked per worker.
+
+The scheme and its cost come from the settings. A hash stored with another
+scheme or cost is replaced on the next successful login, and
+``scripts/benchmarks/calibrate_password_hash.py`` measures the cost that fits
+``PASSWORD_HASH_TARGET_MS`` on a host.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from src.side_quest_py.api.config import settings
+
+T = TypeVar("T")
+
+SCHEMES = ("bcrypt", "argon2")
+# Lowest costs calibration will pick, whatever the target
+MIN_BCRYPT_ROUNDS = 10
+MAX_BCRYPT_ROUNDS = 31
+MIN_ARGON2_TIME_COST = 1
+
+
+def build_password_context(
+    scheme: str,
+    bcrypt_rounds: int,
+    argon2_memory_cost: int,
+    argon2_time_cost: int,
+    argon2_parallelism: int,
+) -> CryptContext:
+    """
+    Build the password context that hashes with the given scheme and cost.
+
+    Hashes made with the other scheme still verify, and both another scheme and
+    another cost are reported by ``needs_update`` so they get rehashed.
+
+    Args:
+        scheme: "bcrypt", or "argon2" (argon2id) if argon2-cffi is installed
+        bcrypt_rounds: The bcrypt work factor
+        argon2_memory_cost: The argon2 memory cost in KiB
+        argon2_time_cost: The argon2 number of passes
+        argon2_parallelism: The argon2 number of lanes
+
+    Returns:
+        CryptContext: The password context
+
+    Raises:
+        ValueError: If the scheme is unknown or its backend is not installed
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"Unknown PASSWORD_HASH_SCHEME: {scheme}")
+    context = CryptContext(
+        schemes=[scheme, *(other for other in SCHEMES if other != scheme)],
+        deprecated="auto",
+        bcrypt__default_rounds=bcrypt_rounds,
+        bcrypt__min_rounds=bcrypt_rounds,
+        bcrypt__max_rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__time_cost=argon2_time_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+    if not context.handler(scheme).has_backend():  # type: ignore[attr-defined]
+        raise ValueError(f"PASSWORD_HASH_SCHEME={scheme} requires its backend (argon2-cffi for argon2)")
+    return context
+
+
+def _bcrypt_context(rounds: int) -> CryptContext:
+    """Build a bcrypt context at the given work factor, leaving the argon2 settings as configured."""
+    return build_password_context(
+        "bcrypt", rounds, settings.ARGON2_MEMORY_COST, settings.ARGON2_TIME_COST, settings.ARGON2_PARALLELISM
+    )
+
+
+def _time_hash(context: CryptContext) -> float:
+    """Return the milliseconds one hash takes with the given context."""
+    started = time.perf_counter()
+    context.hash("calibration password")
+    return (time.perf_counter() - started) * 1000
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> Tuple[int, float]:
+    """
+    Find the highest bcrypt work factor whose hash fits the target time on this host.
+
+    Each extra round doubles the work, so the time measured at the minimum is
+    scaled up and the chosen factor is measured once more.
+
+    Args:
+        target_ms: The latency budget for one hash in milliseconds
+
+    Returns:
+        Tuple[int, float]: The work factor and its measured hash time in milliseconds
+    """
+    rounds = MIN_BCRYPT_ROUNDS
+    elapsed = _time_hash(_bcrypt_context(rounds))
+    while rounds < MAX_BCRYPT_ROUNDS and elapsed * 2 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    while True:
+        elapsed = _time_hash(_bcrypt_context(rounds))
+        if elapsed <= target_ms or rounds == MIN_BCRYPT_ROUNDS:
+            return rounds, elapsed
+        rounds -= 1
+
+
+def calibrate_argon2_time_cost(target_ms: float, memory_cost: int, parallelism: int) -> Tuple[int, float]:
+    """
+    Find the highest argon2id time cost whose hash fits the target time at a fixed memory cost.
+
+    Args:
+        target_ms: The latency budget for one hash in milliseconds
+        memory_cost: The argon2 memory cost in KiB
+        parallelism: The argon2 number of lanes
+
+    Returns:
+        Tuple[int, float]: The time cost and its measured hash time in milliseconds
+    """
+    time_cost = MIN_ARGON2_TIME_COST
+    elapsed = _time_hash(build_password_context("argon2", settings.BCRYPT_ROUNDS, memory_cost, time_cost, parallelism))
+    while True:
+        candidate = _time_hash(
+            build_password_context("argon2", settings.BCRYPT_ROUNDS, memory_cost, time_cost + 1, parallelism)
+        )
+        if candidate > target_ms:
+            return time_cost, elapsed
+        time_cost, elapsed = time_cost + 1, candidate
+
+
+pwd_context = build_password_context(
+    settings.PASSWORD_HASH_SCHEME,
+    settings.BCRYPT_ROUNDS,
+    settings.ARGON2_MEMORY_COST,
+    settings.ARGON2_TIME_COST,
+    settings.ARGON2_PARALLELISM,
+)
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when too many password hashes are already waiting for a thread."""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords in a bounded thread pool."""
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        """Initialize the hasher with its thread count and queue bound."""
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.rehashed = 0
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a hashing call in the pool, recording how long it waited for a thread."""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusyError("Too many password checks in progress")
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        submitted_at = time.perf_counter()
+
+        def timed() -> T:
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.total_wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.total_run_seconds += time.perf_counter() - started_at
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password.
+
+        Args:
+            password: The plain text password
+
+        Returns:
+            str: The password hash
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full
+        """
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash.
+
+        Args:
+            password: The plain text password
+            hashed_password: The stored bcrypt hash
+
+        Returns:
+            bool: True if the password matches
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full
+        """
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    async def dummy_verify(self) -> None:
+        """
+        Spend the time of one verification without a stored hash, so unknown usernames take as long as known ones.
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full
+        """
+        await self._run(pwd_context.dummy_verify)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and rehash it if the hash uses another scheme or cost than configured.
+
+        Args:
+            password: The plain text password
+            hashed_password: The stored hash
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the password matches, and the new hash to store, if any
+
+        Raises:
+            PasswordHasherBusyError: If the queue is full
+        """
+        verified, new_hash = await self._run(pwd_context.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            with self._lock:
+                self.rehashed += 1
+        return verified, new_hash
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the hasher statistics to a dictionary for JSON serialization.
+
+        Returns:
+            Dict[str, Any]: Configured cost, measured hash time, pool bounds, queue depth and wait times for this worker
+        """
+        scheme = settings.PASSWORD_HASH_SCHEME
+        with self._lock:
+            return {
+                "scheme": scheme,
+                "cost": (
+                    {"rounds": settings.BCRYPT_ROUNDS}
+                    if scheme == "bcrypt"
+                    else {
+                        "memory_cost": settings.ARGON2_MEMORY_COST,
+                        "time_cost": settings.ARGON2_TIME_COST,
+                        "parallelism": settings.ARGON2_PARALLELISM,
+                    }
+                ),
+                "target_ms": settings.PASSWORD_HASH_TARGET_MS,
+                "avg_hash_ms": round(self.total_run_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+                "rehashed": self.rehashed,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE)
@@ -0,0 +1,160 @@
+"""
+Per-worker cache of authenticated principals for the Side Quest Py application.
+
+Every authenticated request verifies its bearer token. Without a cache that
+means a query on ``users`` per request, so the resolved principal is kept in
+memory, keyed by a hash of the token. Entries expire after a short TTL that
+never outlives the token itself, the cache is bounded with LRU eviction, and
+logging out drops the user's entries in this worker.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from src.side_quest_py.api.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user, detached from any database session.
+
+    In the AUTH_STATELESS mode a principal built from token claims alone has no
+    username, email or timestamps.
+    """
+
+    id: str
+    username: Optional[str] = None
+    email: Optional[str] = None
+    token_version: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class PrincipalCache:
+    """A bounded TTL + LRU cache from token hash to principal."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """Initialize the cache with its size bound and TTL."""
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[Principal, float]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """Hash the token so raw tokens are never kept in memory."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        """
+        Get the principal cached for a token.
+
+        Args:
+            token: The bearer token
+
+        Returns:
+            Optional[Principal]: The principal, or None if it is not cached or has expired
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, principal.id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, valid_for: float) -> None:
+        """
+        Cache the principal for a token.
+
+        Args:
+            token: The bearer token
+            principal: The principal the token resolved to
+            valid_for: Seconds until the token stops being valid; the entry never lives longer
+        """
+        ttl = min(self.ttl_seconds, valid_for)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                evicted_key, (evicted, _) = self._entries.popitem(last=False)
+                self._discard_user_key(evicted_key, evicted.id)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Drop every cached token of a user.
+
+        Args:
+            user_id: The ID of the user
+        """
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def _remove(self, key: bytes, user_id: str) -> None:
+        """Remove an entry; the caller holds the lock."""
+        self._entries.pop(key, None)
+        self._discard_user_key(key, user_id)
+
+    def _discard_user_key(self, key: bytes, user_id: str) -> None:
+        """Remove a key from the user index; the caller holds the lock."""
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the cache statistics to a dictionary for JSON serialization.
+
+        Returns:
+            Dict[str, Any]: Size, bounds and hit/miss counters for this worker
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS)
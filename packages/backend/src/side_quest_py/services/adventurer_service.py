@@ -1,10 +1,12 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import Column, RowMapping, Select, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
-from src.side_quest_py.database import get_db
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import call_after_commit, commit_or_flush, get_db
 from src.side_quest_py.models.adventurer import (
     AdventurerValidationError,
     LevelCalculator,
@@ -12,13 +14,22 @@ from src.side_quest_py.models.adventurer import (
     AdventurerDeletionError,
 )
 from src.side_quest_py.models.db_models import Adventurer
+from src.side_quest_py.pagination import keyset_page
 from src.side_quest_py.tasks.email_tasks import send_level_up_email
 
+adventurers_table = Adventurer.__table__
+
+# The columns adventurer_to_dict reads, for read paths that skip the ORM
+ADVENTURER_RESPONSE_COLUMNS = tuple(
+    adventurers_table.c[name]
+    for name in ("id", "name", "level", "adventurer_type", "experience", "created_at", "updated_at")
+)
+
 
 class AdventurerService:
     """Service for handling adventurer-related operations."""
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """Initialize the adventurer service with a level calculator."""
         self.level_calculator = LevelCalculator()
         self.db = db
@@ -66,14 +77,14 @@ class AdventurerService:
 
             # Add to database
             self.db.add(adventurer)
-            self.db.commit()
+            await commit_or_flush(self.db)
 
             return adventurer
         except AdventurerValidationError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise AdventurerValidationError(f"Error creating adventurer: {str(e)}") from e
 
     async def get_adventurer_by_id(self, adventurer_id: str) -> Optional[Adventurer]:
@@ -86,19 +97,128 @@ class AdventurerService:
         Returns:
             Optional[Adventurer]: The adventurer if found, None otherwise
         """
-        adventurer: Optional[Adventurer] = self.db.query(Adventurer).filter_by(id=adventurer_id).first()
+        result = await self.db.execute(select(Adventurer).filter_by(id=adventurer_id))
+        adventurer: Optional[Adventurer] = result.scalars().first()
         return adventurer
 
-    async def get_all_adventurers(self, user_id: str) -> List[Adventurer]:
+    async def get_all_adventurers(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Adventurer]:
         """
-        Get all adventurers for a user.
+        Get all adventurers for a user, in ID order.
+
+        Args:
+            user_id: The ID of the user
+            limit: Optional - The maximum number of adventurers to return
+            after: Optional - Only return adventurers with an ID after this one
 
         Returns:
             List[Adventurer]: A list of all adventurers
         """
-        adventurers: List[Adventurer] = self.db.query(Adventurer).filter_by(user_id=user_id).all()
+        statement = keyset_page(select(Adventurer).filter_by(user_id=user_id), Adventurer.id, limit, after)
+        result = await self.db.execute(statement)
+        adventurers: List[Adventurer] = list(result.scalars().all())
         return adventurers
 
+    async def get_adventurer_row(
+        self, adventurer_id: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[RowMapping]:
+        """
+        Get the response columns of an adventurer without loading the ORM object.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+            fields: Optional - The response columns to select, all of them by default
+
+        Returns:
+            Optional[RowMapping]: The adventurer, keyed like adventurer_to_dict, or None if it does not exist
+        """
+        statement = select(*self._response_columns(fields)).where(adventurers_table.c.id == adventurer_id)
+        result = await self.db.execute(statement)
+        return result.mappings().first()
+
+    async def get_all_adventurer_rows(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[RowMapping]:
+        """
+        Get the response columns of a user's adventurers, in ID order, without loading ORM objects.
+
+        Args:
+            user_id: The ID of the user
+            limit: Optional - The maximum number of adventurers to return
+            after: Optional - Only return adventurers with an ID after this one
+            fields: Optional - The response columns to select, all of them by default
+
+        Returns:
+            List[RowMapping]: The adventurers, keyed like adventurer_to_dict
+        """
+        statement = keyset_page(self._adventurer_rows(user_id, fields), adventurers_table.c.id, limit, after)
+        result = await self.db.execute(statement)
+        return list(result.mappings().all())
+
+    async def stream_all_adventurer_rows(
+        self, user_id: str, after: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream the response columns of a user's adventurers, in ID order, through a server-side cursor.
+
+        Args:
+            user_id: The ID of the user
+            after: Optional - Only return adventurers with an ID after this one
+            fields: Optional - The response columns to select, all of them by default
+
+        Yields:
+            RowMapping: Each adventurer, keyed like adventurer_to_dict, as its batch arrives from the database
+        """
+        statement = keyset_page(self._adventurer_rows(user_id, fields), adventurers_table.c.id, None, after)
+        result = await self.db.stream(statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE))
+        async for row in result.mappings():
+            yield row
+
+    async def get_adventurers_version(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of a user's adventurers and when the latest of them changed, for the list's ETag.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The number of adventurers and their newest updated_at
+        """
+        statement = select(func.count(), func.max(adventurers_table.c.updated_at)).where(
+            adventurers_table.c.user_id == user_id
+        )
+        count, changed_at = (await self.db.execute(statement)).one()
+        return count, changed_at
+
+    async def get_adventurer_updated_at(self, adventurer_id: str) -> Optional[datetime]:
+        """
+        Get when an adventurer last changed, for its ETag, without loading it.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+
+        Returns:
+            Optional[datetime]: The adventurer's updated_at, or None if it does not exist
+        """
+        statement = select(adventurers_table.c.updated_at).where(adventurers_table.c.id == adventurer_id)
+        return await self.db.scalar(statement)
+
+    def _adventurer_rows(self, user_id: str, fields: Optional[Sequence[str]] = None) -> Select:
+        """Build a Core query for the response columns of a user's adventurers."""
+        return select(*self._response_columns(fields)).where(adventurers_table.c.user_id == user_id)
+
+    @staticmethod
+    def _response_columns(fields: Optional[Sequence[str]]) -> Tuple[Column, ...]:
+        """The columns of the requested response fields, or all response columns if none were requested."""
+        if fields is None:
+            return ADVENTURER_RESPONSE_COLUMNS
+        return tuple(adventurers_table.c[name] for name in fields)
+
     async def delete_adventurer(self, adventurer_id: str) -> bool:
         """
         Delete an adventurer by ID.
@@ -112,14 +232,14 @@ class AdventurerService:
         adventurer = await self.get_adventurer_by_id(adventurer_id)
         if adventurer:
             try:
-                self.db.delete(adventurer)
-                self.db.commit()
+                await self.db.delete(adventurer)
+                await commit_or_flush(self.db)
                 return True
             except (TypeError, ValueError) as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise AdventurerValidationError(f"Error deleting adventurer: {str(e)}") from e
             except Exception as e:
-                self.db.rollback()
+                await self.db.rollback()
                 raise AdventurerDeletionError(f"Unexpected error deleting adventurer: {str(e)}") from e
         return False
 
@@ -134,7 +254,7 @@ class AdventurerService:
         Returns:
             Optional[Adventurer]: The updated adventurer if found, None otherwise
         """
-        adventurer = self.db.query(Adventurer).filter_by(id=adventurer_id).first()
+        adventurer = await self.get_adventurer_by_id(adventurer_id)
         if not adventurer:
             return None
 
@@ -143,60 +263,107 @@ class AdventurerService:
                 if hasattr(adventurer, key):
                     setattr(adventurer, key, value)
 
-            self.db.commit()
+            await commit_or_flush(self.db)
             return adventurer
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise AdventurerValidationError(f"Error updating adventurer: {str(e)}") from e
 
     async def gain_experience(self, adventurer_id: str, experience_gain: int) -> Optional[Adventurer]:
         """
         Add experience to the adventurer and handle level up if necessary.
 
+        The experience is added by a single UPDATE, so concurrent gains for the
+        same adventurer can never overwrite each other. A gain large enough to
+        cover several levels carries its overflow across all of them.
+
         Args:
             adventurer_id: ID of the adventurer gaining experience
             experience_gain: Amount of experience gained
 
         Returns:
-            Optional[Adventurer]: The updated adventurer or None if not found
+            Optional[Adventurer]: The updated adventurer
 
         Raises:
             AdventurerValidationError: If the experience gained is negative or other validation errors occur
+            AdventurerNotFoundError: If the adventurer is not found
         """
+        adventurer = await self.apply_experience(adventurer_id, experience_gain)
+        if experience_gain:
+            await commit_or_flush(self.db)
+        return adventurer
 
-        if experience_gain < 0:
-            raise AdventurerValidationError("Experience gain cannot be negative")
+    async def apply_experience(self, adventurer_id: str, experience_gain: int) -> Optional[Adventurer]:
+        """
+        Add experience to the adventurer in the caller's transaction, without committing.
 
-        adventurer = await self.get_adventurer_by_id(adventurer_id)
-        if not adventurer:
-            raise AdventurerNotFoundError(f"Adventurer with ID {adventurer_id} not found")
+        Works like gain_experience, for callers that grant experience as part of
+        a larger change and commit once themselves. A level-up email is sent
+        after that commit.
 
-        try:
-            current_experience = adventurer.experience
-            current_level = adventurer.level
-            adventurer.experience += experience_gain  # type: ignore
+        Args:
+            adventurer_id: ID of the adventurer gaining experience
+            experience_gain: Amount of experience gained
 
-            required_exp = self.level_calculator.calculate_req_exp(current_level)  # type: ignore
+        Returns:
+            Optional[Adventurer]: The updated adventurer
 
-            leveled_up = False
-            if current_experience + experience_gain >= required_exp:  # type: ignore
+        Raises:
+            AdventurerValidationError: If the experience gained is negative or other validation errors occur
+            AdventurerNotFoundError: If the adventurer is not found
+        """
 
-                adventurer.level += 1  # type: ignore
-                adventurer.experience = 0  # type: ignore
+        if experience_gain < 0:
+            raise AdventurerValidationError("Experience gain cannot be negative")
 
-                leveled_up = True
-                adventurer.leveled_up = True  # type: ignore
+        if experience_gain == 0:
+            adventurer = await self.get_adventurer_by_id(adventurer_id)
+            if not adventurer:
+                raise AdventurerNotFoundError(f"Adventurer with ID {adventurer_id} not found")
+            return adventurer
 
-            self.db.commit()
+        try:
+            statement = (
+                update(Adventurer)
+                .where(Adventurer.id == adventurer_id)
+                .values(experience=Adventurer.experience + experience_gain)
+            )
+            if self.db.get_bind().dialect.update_returning:
+                result = await self.db.execute(
+                    statement.returning(Adventurer),
+                    execution_options={"synchronize_session": False, "populate_existing": True},
+                )
+                adventurer = result.scalars().first()
+            else:
+                # The UPDATE holds the row lock, so reading the row back cannot see another grant
+                result = await self.db.execute(statement, execution_options={"synchronize_session": False})
+                adventurer = (
+                    await self.db.get(Adventurer, adventurer_id, populate_existing=True) if result.rowcount else None
+                )
 
-            if leveled_up:
-                send_level_up_email.delay(
-                    adventurer_id=str(adventurer.id), old_level=current_level, new_level=adventurer.level
+            if not adventurer:
+                raise AdventurerNotFoundError(f"Adventurer with ID {adventurer_id} not found")
+
+            # The row stays locked until commit, so the level can be resolved here and written back
+            current_level = adventurer.level
+            # The UPDATE already added the gain, so only carry the overflow across levels
+            new_level, remaining_experience = self.level_calculator.apply_gain(
+                current_level, adventurer.experience, 0  # type: ignore
+            )
+            if new_level != current_level:
+                adventurer.level = new_level  # type: ignore
+                adventurer.experience = remaining_experience  # type: ignore
+                adventurer.leveled_up = True  # type: ignore
+                call_after_commit(
+                    self.db,
+                    lambda: send_level_up_email.delay(
+                        adventurer_id=adventurer_id, old_level=current_level, new_level=new_level
+                    ),
                 )
 
             return adventurer
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise AdventurerValidationError(f"Error gaining experience: {str(e)}") from e
 
     def adventurer_to_dict(self, adventurer: Adventurer) -> Dict[str, Any]:
@@ -2,53 +2,155 @@
 This module contains the authentication service for the Side Quest application.
 """
 
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple, Union
 
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.orm import QueryableAttribute, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
-from src.side_quest_py.database import get_db
+from src.side_quest_py.database import call_after_commit, commit_or_flush, get_db
 from src.side_quest_py.models.db_models import User
 from src.side_quest_py.api.config import settings
-from src.side_quest_py.api.schemas.auth import TokenData
+from src.side_quest_py.login_throttle import LoginThrottledError, login_throttle
+from src.side_quest_py.password_hasher import PasswordHasherBusyError, password_hasher
+from src.side_quest_py.principal_cache import Principal, principal_cache
+from src.side_quest_py.token_versions import token_versions
+
+# The mapped attributes a principal is built from; the password hash and stored token are never needed
+PRINCIPAL_ATTRIBUTES: Tuple[QueryableAttribute[Any], ...] = tuple(
+    getattr(User, name) for name in ("id", "username", "email", "token_version", "created_at", "updated_at")
+)
 
 # JWT configuration
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def _busy_exception() -> HTTPException:
+    """The error returned when the password hasher's queue is full."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def cached_principal(token: str) -> Tuple[bool, Optional[Principal]]:
+    """
+    Resolve a token from the principal cache and the token version table alone, without the database.
+
+    Args:
+        token: The JWT token
+
+    Returns:
+        Tuple[bool, Optional[Principal]]: Whether the token could be resolved this way, and if so
+            the principal, or None if the token has been revoked
+    """
+    principal = principal_cache.get(token)
+    if principal is None:
+        return False, None
+    current_version = token_versions.current(principal.id)
+    # An unknown version (full table) has to be checked against the database
+    if current_version is None:
+        return False, None
+    return True, principal if principal.token_version >= current_version else None
+
+
+def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Check a JWT token's signature and expiry and return its claims.
+
+    Args:
+        token: The JWT token
+
+    Returns:
+        Optional[Dict[str, Any]]: The claims, or None if the token is invalid, expired or has no subject
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    return payload if isinstance(payload.get("sub"), str) else None
+
+
+def stateless_principal(token: str, payload: Dict[str, Any]) -> Tuple[bool, Optional[Principal]]:
+    """
+    Resolve a decoded token from its claims alone, for the AUTH_STATELESS mode.
+
+    The principal carries only the user ID and token version. Revocations are
+    seen through this host's token version table only.
+
+    Args:
+        token: The JWT token
+        payload: The token's verified claims
+
+    Returns:
+        Tuple[bool, Optional[Principal]]: Whether the token could be resolved this way, and if so
+            the principal, or None if the token has been revoked
+    """
+    user_id = payload["sub"]
+    current_version = token_versions.current(user_id)
+    # An unknown version (full table) has to be checked against the database
+    if current_version is None:
+        return False, None
+    token_version = int(payload.get("ver", 0))
+    if token_version < current_version:
+        return True, None
+    principal = Principal(id=user_id, token_version=token_version)
+    principal_cache.put(token, principal, float(payload["exp"]) - time.time())
+    return True, principal
 
 
 class AuthService:
     """Service for handling authentication-related operations."""
 
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_db)):
         """Initialize the auth service with a database session."""
         self.db = db
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against a hashed password."""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a hashed password without blocking the event loop."""
+        try:
+            return await password_hasher.verify(plain_password, hashed_password)
+        except PasswordHasherBusyError as exc:
+            raise _busy_exception() from exc
+
+    async def verify_and_update_password(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password and get a new hash for it if the stored one is not at the configured cost."""
+        try:
+            return await password_hasher.verify_and_update(plain_password, hashed_password)
+        except PasswordHasherBusyError as exc:
+            raise _busy_exception() from exc
 
-    def get_password_hash(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        """Hash a password using bcrypt without blocking the event loop."""
+        try:
+            return await password_hasher.hash(password)
+        except PasswordHasherBusyError as exc:
+            raise _busy_exception() from exc
 
-    def get_user_by_username(self, username: str) -> Optional[User]:
+    async def get_user_by_username(self, username: str) -> Optional[User]:
         """Get a user by username."""
-        return self.db.query(User).filter(User.username == username).first()
+        result = await self.db.execute(select(User).filter(User.username == username))
+        return result.scalars().first()
+
+    async def get_principal_user(self, user_id: str) -> Optional[User]:
+        """Get a user by primary key, loading only the columns a principal needs."""
+        result = await self.db.execute(select(User).options(load_only(*PRINCIPAL_ATTRIBUTES)).where(User.id == user_id))
+        return result.scalars().first()
 
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get a user by email."""
-        return self.db.query(User).filter(User.email == email).first()
+        result = await self.db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
 
-    def register_user(self, username: str, email: str, password: str) -> User:
+    async def register_user(self, username: str, email: str, password: str) -> User:
         """
         Register a new user with a hashed password.
 
@@ -63,14 +165,14 @@ class AuthService:
         Raises:
             HTTPException: If registration fails
         """
-        if self.get_user_by_username(username):
+        if await self.get_user_by_username(username):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username already registered")
 
-        if self.get_user_by_email(email):
+        if await self.get_user_by_email(email):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
+        hashed_password = await self.get_password_hash(password)
         try:
-            hashed_password = self.get_password_hash(password)
             new_user = User(
                 id=str(ULID()),
                 username=username,
@@ -81,57 +183,84 @@ class AuthService:
             )
 
             self.db.add(new_user)
-            self.db.commit()
-            self.db.refresh(new_user)
+            await commit_or_flush(self.db)
+            await self.db.refresh(new_user)
             return new_user
 
         except Exception as exc:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to register user: {str(exc)}"
             ) from exc
 
-    def authenticate_user(self, username: str, password: str) -> str:
+    async def authenticate_user(self, username: str, password: str, client_ip: Optional[str] = None) -> str:
         """
         Authenticate a user with their username and password.
 
+        Attempts from a username or client IP with too many recent failures are
+        rejected before any password hashing is done.
+
         Args:
             username: The username of the user
             password: The plain text password of the user
+            client_ip: The IP address of the client, if known
 
         Returns:
             str: The access token for the authenticated user
 
         Raises:
-            HTTPException: If authentication fails
+            HTTPException: If authentication fails or the attempt is throttled
         """
-        user = self.get_user_by_username(username)
+        try:
+            login_throttle.check(username, client_ip)
+        except LoginThrottledError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts, please retry later",
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
+
+        user = await self.get_user_by_username(username)
         if not user:
+            # Spend the same hashing time as a known user so timing does not reveal which usernames exist
+            try:
+                await password_hasher.dummy_verify()
+            except PasswordHasherBusyError as exc:
+                raise _busy_exception() from exc
+            login_throttle.record_failure(username, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if not self.verify_password(password, str(user.password_hash)):
+        verified, new_hash = await self.verify_and_update_password(password, str(user.password_hash))
+        if not verified:
+            login_throttle.record_failure(username, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        login_throttle.record_success(username)
 
         # Create access token
-        access_token = self.create_access_token(data={"sub": user.username})
-
-        # Update user's token in DB
-        user.auth_token = access_token  # type: ignore
-        user.token_expiry = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)  # type: ignore
-        self.db.commit()
+        access_token = self.create_access_token(data={"sub": str(user.id), "ver": user.token_version})
+
+        # Store a hash at the configured scheme and cost, and the token itself if still persisted;
+        # otherwise the login writes nothing
+        if new_hash is not None:
+            user.password_hash = new_hash  # type: ignore
+        if settings.AUTH_PERSIST_TOKENS:
+            user.auth_token = access_token  # type: ignore
+            user.token_expiry = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)  # type: ignore
+        if new_hash is not None or settings.AUTH_PERSIST_TOKENS:
+            await commit_or_flush(self.db)
 
         return access_token
 
     def create_access_token(self, data: Dict[str, Any]) -> str:
-        """Create an access token with expiration."""
+        """Create an access token with expiration; the claims are kept to the user ID ("sub") and token version."""
         to_encode = data.copy()
         expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
@@ -139,36 +268,114 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
-    def verify_token(self, token: str) -> Optional[User]:
+    async def verify_token(self, token: str) -> Optional[Principal]:
         """
-        Verify a JWT token and return the user.
+        Verify a JWT token and return the user it belongs to.
+
+        Verified tokens are cached per worker, and revocations are shared through
+        the token version table, so a repeated token is resolved without decoding
+        it again or querying the database.
 
         Args:
             token: The JWT token to verify
 
         Returns:
-            Optional[User]: The user if token is valid, None otherwise
+            Optional[Principal]: The user if token is valid, None otherwise
         """
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username = payload.get("sub")
-            if username is None:
-                return None
+        decided, principal = cached_principal(token)
+        if decided:
+            if principal is not None:
+                # Lets the session keep this user's reads on the primary after they write
+                self.db.info["user_id"] = principal.id
+            return principal
+
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        return await self.principal_from_payload(token, payload)
+
+    async def principal_from_payload(self, token: str, payload: Dict[str, Any]) -> Optional[Principal]:
+        """
+        Look up the user of a decoded token, check its version and cache the result.
+
+        Args:
+            token: The JWT token
+            payload: The token's verified claims
+
+        Returns:
+            Optional[Principal]: The user if the token is still valid, None otherwise
+        """
+        user = await self.get_principal_user(payload["sub"])
+        if not user:
+            return None
 
-            token_data = TokenData(username=username)
-        except JWTError:
+        # Tokens issued before versioning carry no "ver" and are revoked by the first logout
+        token_version = int(payload.get("ver", 0))
+        # The table also covers a replica that has not caught up with the bump yet
+        current_version = max(int(user.token_version or 0), token_versions.current(str(user.id)) or 0)
+        if token_version < current_version:
             return None
 
-        user = self.get_user_by_username(username=token_data.username or "")
+        # Lets the session keep this user's reads on the primary after they write
+        self.db.info["user_id"] = str(user.id)
+
+        principal = self.principal_for(user, token_version)
+        principal_cache.put(token, principal, float(payload["exp"]) - time.time())
+
+        return principal
 
-        if user and hasattr(user, "token_expiry") and user.token_expiry and user.token_expiry < datetime.now():  # type: ignore
+    @staticmethod
+    def principal_for(user: User, token_version: int) -> Principal:
+        """Build the detached principal of a user for a token of the given version."""
+        return Principal(
+            id=str(user.id),
+            username=str(user.username),
+            email=str(user.email),
+            token_version=token_version,
+            created_at=user.created_at,  # type: ignore
+            updated_at=user.updated_at,  # type: ignore
+        )
+
+    async def revoke_tokens(self, user_id: str) -> Optional[int]:
+        """
+        Revoke every token issued to a user by bumping their token version.
+
+        Logout uses this; a password change should too.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Optional[int]: The user's new token version, or None if the user does not exist
+        """
+        values: Dict[str, Any] = {"token_version": User.token_version + 1}
+        if settings.AUTH_PERSIST_TOKENS:
+            values.update(auth_token=None, token_expiry=None)
+        statement = update(User).where(User.id == user_id).values(**values)
+        if self.db.get_bind().dialect.update_returning:
+            result = await self.db.execute(
+                statement.returning(User.token_version), execution_options={"synchronize_session": False}
+            )
+            new_version = result.scalar()
+        else:
+            # The UPDATE holds the row lock, so reading the version back cannot see another bump
+            result = await self.db.execute(statement, execution_options={"synchronize_session": False})
+            new_version = (
+                await self.db.scalar(select(User.token_version).where(User.id == user_id)) if result.rowcount else None
+            )
+        if new_version is None:
             return None
 
-        return user
+        def publish_revocation() -> None:
+            token_versions.record(user_id, new_version)
+            principal_cache.invalidate_user(user_id)
+
+        call_after_commit(self.db, publish_revocation)
+        return new_version
 
-    def logout_user(self, user_id: str) -> bool:
+    async def logout_user(self, user_id: str) -> bool:
         """
-        Invalidate a user's authentication token.
+        Revoke a user's authentication tokens.
 
         Args:
             user_id: The ID of the user to log out
@@ -180,20 +387,19 @@ class AuthService:
             HTTPException: If logout fails
         """
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if user:
-                user.auth_token = None  # type: ignore
-                user.token_expiry = None  # type: ignore
-                self.db.commit()
-                return True
-            return False
+            new_version = await self.revoke_tokens(user_id)
+            if new_version is None:
+                return False
+            await commit_or_flush(self.db)
+            return True
         except Exception as exc:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Logout failed: {str(exc)}"
             ) from exc
 
-    def user_to_dict(self, user: User) -> Dict[str, Any]:
+    @staticmethod
+    def user_to_dict(user: Union[User, Principal]) -> Dict[str, Any]:
         """Convert a User object to a dictionary."""
         return {
             "id": user.id,
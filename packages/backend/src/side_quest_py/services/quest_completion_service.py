@@ -2,23 +2,34 @@
 This module contains the service for handling quest completion-related operations.
 """
 
+from typing import List, Optional, Sequence, Tuple
+
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import RowMapping, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from ulid import ULID
 
-from src.side_quest_py.database import get_db
-from src.side_quest_py.models.db_models import QuestCompletion
+from src.side_quest_py.database import commit_or_flush, get_db
+from src.side_quest_py.models.db_models import Adventurer, QuestCompletion
 from src.side_quest_py.models.quest import QuestCompletionError, QuestNotFoundError
 
+quest_completions_table = QuestCompletion.__table__
+adventurers_table = Adventurer.__table__
+
+# The columns of a completion embedded in an adventurer response
+QUEST_COMPLETION_RESPONSE_COLUMNS = tuple(
+    quest_completions_table.c[name] for name in ("id", "quest_id", "adventurer_id", "created_at")
+)
+
 
 class QuestCompletionService:
     """Service for handling quest completion-related operations."""
 
-    def __init__(self, db: Session = Depends(get_db)):
+    def __init__(self, db: AsyncSession = Depends(get_db)):
         self.db = db
 
-    def create_quest_completion(self, quest_id: str, adventurer_id: str) -> QuestCompletion:
+    async def create_quest_completion(self, quest_id: str, adventurer_id: str) -> QuestCompletion:
         """
         Create a new quest completion record.
 
@@ -42,19 +53,19 @@ class QuestCompletionService:
                 updated_at=datetime.now(),
             )
             self.db.add(quest_completion)
-            self.db.commit()
+            await commit_or_flush(self.db)
             return quest_completion
         except QuestNotFoundError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except QuestCompletionError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestCompletionError(f"Error creating quest completion: {str(e)}") from e
 
-    def get_quest_completion(self, quest_id: str) -> QuestCompletion:
+    async def get_quest_completion(self, quest_id: str) -> Optional[QuestCompletion]:
         """
         Get a quest completion record by quest ID.
 
@@ -62,22 +73,23 @@ class QuestCompletionService:
             quest_id: The ID of the quest
 
         Returns:
-            QuestCompletion: The quest completion record
+            Optional[QuestCompletion]: The quest completion record, or None if the quest has not been completed
 
         Raises:
             QuestCompletionError: If there's an error getting the quest completion
         """
         try:
-            quest_completion = self.db.query(QuestCompletion).filter_by(quest_id=quest_id).first()
+            result = await self.db.execute(select(QuestCompletion).filter_by(quest_id=quest_id))
+            quest_completion = result.scalars().first()
             return quest_completion
         except QuestCompletionError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestCompletionError(f"Error getting quest completion: {str(e)}") from e
 
-    def delete_quest_completion(self, quest_id: str) -> bool:
+    async def delete_quest_completion(self, quest_id: str) -> bool:
         """
         Delete a quest completion record by quest ID.
 
@@ -91,15 +103,71 @@ class QuestCompletionService:
             QuestCompletionError: If there's an error deleting the quest completion
         """
         try:
-            quest_completion = self.db.query(QuestCompletion).filter_by(quest_id=quest_id).first()
+            quest_completion = await self.get_quest_completion(quest_id)
             if quest_completion:
-                self.db.delete(quest_completion)
-                self.db.commit()
+                await self.db.delete(quest_completion)
+                await commit_or_flush(self.db)
                 return True
             return False
         except QuestCompletionError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestCompletionError(f"Error deleting quest completion: {str(e)}") from e
+
+    async def get_completion_rows_by_adventurer(self, adventurer_ids: Sequence[str]) -> List[RowMapping]:
+        """
+        Get the completions of several adventurers with one IN query, to embed in their responses.
+
+        Args:
+            adventurer_ids: The IDs of the adventurers
+
+        Returns:
+            List[RowMapping]: The completions, ordered by adventurer and ID
+        """
+        if not adventurer_ids:
+            return []
+        statement = (
+            select(*QUEST_COMPLETION_RESPONSE_COLUMNS)
+            .where(quest_completions_table.c.adventurer_id.in_(adventurer_ids))
+            .order_by(quest_completions_table.c.adventurer_id, quest_completions_table.c.id)
+        )
+        result = await self.db.execute(statement)
+        return list(result.mappings().all())
+
+    async def get_completions_version(self, adventurer_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of an adventurer's completions and when the latest of them changed, for the ETag of a
+        response that embeds them.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The number of completions and their newest updated_at
+        """
+        statement = select(func.count(), func.max(quest_completions_table.c.updated_at)).where(
+            quest_completions_table.c.adventurer_id == adventurer_id
+        )
+        count, changed_at = (await self.db.execute(statement)).one()
+        return count, changed_at
+
+    async def get_user_completions_version(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of completions of a user's adventurers and when the latest of them changed, for the
+        ETag of a list that embeds them.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The number of completions and their newest updated_at
+        """
+        statement = (
+            select(func.count(), func.max(quest_completions_table.c.updated_at))
+            .join(adventurers_table, adventurers_table.c.id == quest_completions_table.c.adventurer_id)
+            .where(adventurers_table.c.user_id == user_id)
+        )
+        count, changed_at = (await self.db.execute(statement)).one()
+        return count, changed_at
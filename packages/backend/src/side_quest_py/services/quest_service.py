@@ -3,28 +3,42 @@ This module contains the service for handling quest-related operations.
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import Column, RowMapping, Select, false, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from ulid import ULID
 
-from src.side_quest_py.database import get_db
-from src.side_quest_py.models.db_models import Quest, Adventurer
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.database import commit_or_flush, get_db
+from src.side_quest_py.models.db_models import Quest, Adventurer, QuestCompletion
 from src.side_quest_py.models.quest import (
+    QuestBatchValidationError,
     QuestCompletionError,
     QuestNotFoundError,
     QuestServiceError,
     QuestValidationError,
 )
+from src.side_quest_py.pagination import keyset_page
 from .quest_completion_service import QuestCompletionService
 from .adventurer_service import AdventurerService
 
+quests_table = Quest.__table__
+adventurers_table = Adventurer.__table__
+quest_completions_table = QuestCompletion.__table__
+
+# The columns quest_to_dict reads, for read paths that skip the ORM
+QUEST_RESPONSE_COLUMNS = tuple(
+    quests_table.c[name]
+    for name in ("id", "adventurer_id", "title", "experience_reward", "completed", "created_at", "updated_at")
+)
+
 
 class QuestService:
     """Service for handling quest-related operations."""
 
-    def __init__(self, db: Session = Depends(get_db)) -> None:
+    def __init__(self, db: AsyncSession = Depends(get_db)) -> None:
         """Initialize the quest service."""
         self.db = db
 
@@ -51,7 +65,8 @@ class QuestService:
             if not adventurer_id:
                 raise QuestValidationError("Adventurer ID is required")
 
-            adventurer = self.db.query(Adventurer).filter_by(id=adventurer_id).first()
+            result = await self.db.execute(select(Adventurer).filter_by(id=adventurer_id))
+            adventurer = result.scalars().first()
             if not adventurer:
                 raise QuestValidationError(f"Adventurer with ID {adventurer_id} does not exist")
 
@@ -66,16 +81,93 @@ class QuestService:
             )
 
             self.db.add(quest)
-            self.db.commit()
+            await commit_or_flush(self.db)
 
             return quest
         except QuestValidationError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestValidationError(f"Error creating quest: {str(e)}") from e
 
+    async def create_quests(
+        self, quests: List[Dict[str, Any]], user_id: str, allow_partial: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Create many quests for a user's adventurers with one query, one INSERT and one commit.
+
+        Every item is validated first, and the ownership of all referenced
+        adventurers is checked in a single query. The valid quests are then
+        inserted with a single multi-row INSERT.
+
+        Args:
+            quests: The quests to create, each with a title, adventurer_id and optional experience_reward
+            user_id: The ID of the user, who must own every referenced adventurer
+            allow_partial: Whether to create the valid quests when some are invalid, instead of none
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: The created quests, keyed like quest_to_dict,
+                and the index and detail of every quest that was not created
+
+        Raises:
+            QuestBatchValidationError: If any quest is invalid and allow_partial is False
+            QuestServiceError: If the quests cannot be inserted
+        """
+        adventurer_ids = {quest["adventurer_id"] for quest in quests if quest.get("adventurer_id")}
+        owned = set(
+            (
+                await self.db.execute(
+                    select(adventurers_table.c.id).where(
+                        adventurers_table.c.id.in_(adventurer_ids), adventurers_table.c.user_id == user_id
+                    )
+                )
+            ).scalars()
+        )
+
+        now = datetime.now()
+        rows: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        for index, quest in enumerate(quests):
+            title = quest.get("title")
+            adventurer_id = quest.get("adventurer_id")
+            experience_reward = quest.get("experience_reward")
+            experience_reward = 100 if experience_reward is None else experience_reward
+            if not title or not title.strip():
+                errors.append({"index": index, "detail": "Quest title cannot be empty"})
+            elif experience_reward < 0:
+                errors.append({"index": index, "detail": "Experience reward cannot be negative"})
+            elif not adventurer_id:
+                errors.append({"index": index, "detail": "Adventurer ID is required"})
+            elif adventurer_id not in owned:
+                errors.append({"index": index, "detail": f"Adventurer with ID {adventurer_id} does not exist"})
+            else:
+                rows.append(
+                    {
+                        "id": str(ULID()),
+                        "adventurer_id": adventurer_id,
+                        "title": title,
+                        "experience_reward": experience_reward,
+                        "completed": False,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+
+        if errors and not allow_partial:
+            raise QuestBatchValidationError(errors)
+        if not rows:
+            return rows, errors
+
+        try:
+            # One INSERT ... VALUES (...), (...) statement, rather than an executemany the driver may loop over
+            await self.db.execute(insert(quests_table).values(rows))
+            await commit_or_flush(self.db)
+        except Exception as e:
+            await self.db.rollback()
+            raise QuestServiceError(f"Error creating quests: {str(e)}") from e
+        return rows, errors
+
     async def get_quest(self, quest_id: str) -> Optional[Quest]:
         """
         Get a quest by its ID.
@@ -90,14 +182,22 @@ class QuestService:
             QuestNotFoundError: If there's an error finding the quest
         """
         try:
-            quest: Optional[Quest] = self.db.query(Quest).filter_by(id=quest_id).first()
+            result = await self.db.execute(select(Quest).filter_by(id=quest_id))
+            quest: Optional[Quest] = result.scalars().first()
             return quest
         except Exception as e:
             raise QuestNotFoundError(f"Quest with ID: {quest_id} not found") from e
 
-    async def get_all_quests(self, adventurer_id: str) -> List[Quest]:
+    async def get_all_quests(
+        self, adventurer_id: str, limit: Optional[int] = None, after: Optional[str] = None
+    ) -> List[Quest]:
         """
-        Get all quests.
+        Get all quests for an adventurer, in ID order.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+            limit: Optional - The maximum number of quests to return
+            after: Optional - Only return quests with an ID after this one
 
         Returns:
             List[Quest]: A list of all quests
@@ -106,11 +206,159 @@ class QuestService:
             QuestServiceError: If there's an error getting all quests
         """
         try:
-            quests: List[Quest] = self.db.query(Quest).filter_by(adventurer_id=adventurer_id).all()
+            statement = keyset_page(select(Quest).filter_by(adventurer_id=adventurer_id), Quest.id, limit, after)
+            result = await self.db.execute(statement)
+            quests: List[Quest] = list(result.scalars().all())
             return quests
         except Exception as e:
             raise QuestServiceError(f"Error getting all quests: {str(e)}") from e
 
+    async def get_all_quest_rows(
+        self,
+        adventurer_id: str,
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[RowMapping]:
+        """
+        Get the response columns of an adventurer's quests, in ID order, without loading ORM objects.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+            limit: Optional - The maximum number of quests to return
+            after: Optional - Only return quests with an ID after this one
+            fields: Optional - The response columns to select, all of them by default
+
+        Returns:
+            List[RowMapping]: The quests, keyed like quest_to_dict
+
+        Raises:
+            QuestServiceError: If there's an error getting the quests
+        """
+        try:
+            statement = keyset_page(self._quest_rows(adventurer_id, fields), quests_table.c.id, limit, after)
+            result = await self.db.execute(statement)
+            return list(result.mappings().all())
+        except Exception as e:
+            raise QuestServiceError(f"Error getting all quests: {str(e)}") from e
+
+    async def stream_all_quest_rows(
+        self, adventurer_id: str, after: Optional[str] = None, fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[RowMapping]:
+        """
+        Stream the response columns of an adventurer's quests, in ID order, through a server-side cursor.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+            after: Optional - Only return quests with an ID after this one
+            fields: Optional - The response columns to select, all of them by default
+
+        Yields:
+            RowMapping: Each quest, keyed like quest_to_dict, as its batch arrives from the database
+        """
+        statement = keyset_page(self._quest_rows(adventurer_id, fields), quests_table.c.id, None, after)
+        result = await self.db.stream(statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE))
+        async for row in result.mappings():
+            yield row
+
+    async def get_quests_version(self, adventurer_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of an adventurer's quests and when the latest of them changed, for the list's ETag.
+
+        Args:
+            adventurer_id: The ID of the adventurer
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The number of quests and their newest updated_at
+
+        Raises:
+            QuestServiceError: If there's an error reading the version
+        """
+        try:
+            statement = select(func.count(), func.max(quests_table.c.updated_at)).where(
+                quests_table.c.adventurer_id == adventurer_id
+            )
+            count, changed_at = (await self.db.execute(statement)).one()
+            return count, changed_at
+        except Exception as e:
+            raise QuestServiceError(f"Error getting the quests version: {str(e)}") from e
+
+    async def get_user_quests_version(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """
+        Get the number of quests of a user's adventurers and when the latest of them changed, for the ETag of
+        a list that embeds them.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Tuple[int, Optional[datetime]]: The number of quests and their newest updated_at
+
+        Raises:
+            QuestServiceError: If there's an error reading the version
+        """
+        try:
+            statement = (
+                select(func.count(), func.max(quests_table.c.updated_at))
+                .join(adventurers_table, adventurers_table.c.id == quests_table.c.adventurer_id)
+                .where(adventurers_table.c.user_id == user_id)
+            )
+            count, changed_at = (await self.db.execute(statement)).one()
+            return count, changed_at
+        except Exception as e:
+            raise QuestServiceError(f"Error getting the quests version: {str(e)}") from e
+
+    async def get_quest_rows_by_adventurer(
+        self, adventurer_ids: Sequence[str], limit_per_adventurer: Optional[int] = None
+    ) -> List[RowMapping]:
+        """
+        Get the quests of several adventurers with one IN query, to embed in their responses.
+
+        Args:
+            adventurer_ids: The IDs of the adventurers
+            limit_per_adventurer: Optional - The maximum number of quests to return for each adventurer
+
+        Returns:
+            List[RowMapping]: The quests, keyed like quest_to_dict and ordered by adventurer and ID
+
+        Raises:
+            QuestServiceError: If there's an error getting the quests
+        """
+        if not adventurer_ids:
+            return []
+        try:
+            owned = quests_table.c.adventurer_id.in_(adventurer_ids)
+            if limit_per_adventurer is None:
+                statement = select(*QUEST_RESPONSE_COLUMNS).where(owned)
+                ordering = (quests_table.c.adventurer_id, quests_table.c.id)
+            else:
+                # Number each adventurer's quests in ID order and keep the first few, still in one query
+                position = (
+                    func.row_number()
+                    .over(partition_by=quests_table.c.adventurer_id, order_by=quests_table.c.id)
+                    .label("position")
+                )
+                ranked = select(*QUEST_RESPONSE_COLUMNS, position).where(owned).subquery()
+                statement = select(*(ranked.c[column.name] for column in QUEST_RESPONSE_COLUMNS)).where(
+                    ranked.c.position <= limit_per_adventurer
+                )
+                ordering = (ranked.c.adventurer_id, ranked.c.id)
+            result = await self.db.execute(statement.order_by(*ordering))
+            return list(result.mappings().all())
+        except Exception as e:
+            raise QuestServiceError(f"Error getting the quests of adventurers: {str(e)}") from e
+
+    def _quest_rows(self, adventurer_id: str, fields: Optional[Sequence[str]] = None) -> Select:
+        """Build a Core query for the response columns of an adventurer's quests."""
+        return select(*self._response_columns(fields)).where(quests_table.c.adventurer_id == adventurer_id)
+
+    @staticmethod
+    def _response_columns(fields: Optional[Sequence[str]]) -> Tuple[Column, ...]:
+        """The columns of the requested response fields, or all response columns if none were requested."""
+        if fields is None:
+            return QUEST_RESPONSE_COLUMNS
+        return tuple(quests_table.c[name] for name in fields)
+
     async def get_uncompleted_quests(self) -> List[Quest]:
         """
         Get all uncompleted quests.
@@ -122,7 +370,8 @@ class QuestService:
             QuestServiceError: If there's an error getting the quests
         """
         try:
-            quests: List[Quest] = self.db.query(Quest).filter_by(completed=False).all()
+            result = await self.db.execute(select(Quest).filter_by(completed=False))
+            quests: List[Quest] = list(result.scalars().all())
             return quests
         except Exception as e:
             raise QuestServiceError(f"Error getting uncompleted quests: {str(e)}") from e
@@ -171,7 +420,7 @@ class QuestService:
             if completed is not None:
                 if was_previously_completed is True and completed is False:
                     quest_completion_service = QuestCompletionService(db=self.db)
-                    quest_completion_service.delete_quest_completion(quest_id)
+                    await quest_completion_service.delete_quest_completion(quest_id)
                 setattr(quest, "completed", completed)
                 if completed is True:
                     adventurer_id_str = str(adventurer_id) if adventurer_id is not None else str(quest.adventurer_id)
@@ -179,21 +428,97 @@ class QuestService:
                         experience_reward if experience_reward is not None else quest.experience_reward
                     )
                     quest_completion_service = QuestCompletionService(db=self.db)
-                    quest_completion_service.create_quest_completion(quest_id, adventurer_id_str)
+                    await quest_completion_service.create_quest_completion(quest_id, adventurer_id_str)
                     adventurer_service = AdventurerService(db=self.db)
                     await adventurer_service.gain_experience(adventurer_id_str, experience_reward_int)  # type: ignore
                     setattr(quest, "completed", True)
 
-            self.db.commit()
+            await commit_or_flush(self.db)
 
             return quest
         except (QuestNotFoundError, QuestCompletionError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
         except (TypeError, ValueError) as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestCompletionError(f"Error completing quest: {str(e)}") from e
 
+    async def complete_quests(self, quest_ids: List[str], user_id: str) -> Tuple[List[str], List[Adventurer]]:
+        """
+        Complete many of a user's quests at once, granting each adventurer its experience in one go.
+
+        One UPDATE flips the quests that are still open, one INSERT records
+        their completions, and each adventurer's rewards are summed and granted
+        with a single experience UPDATE. That resolves any number of level-ups
+        and sends at most one level-up email per adventurer. Everything is
+        committed once.
+
+        Args:
+            quest_ids: The IDs of the quests to complete
+            user_id: The ID of the user, who must own the quests' adventurers
+
+        Returns:
+            Tuple[List[str], List[Adventurer]]: The IDs of the quests this call completed, and the
+                adventurers that gained experience
+
+        Raises:
+            QuestCompletionError: If the quests cannot be completed
+        """
+        now = datetime.now()
+        open_quests = (
+            quests_table.c.id.in_(set(quest_ids)),
+            quests_table.c.completed == false(),
+            quests_table.c.adventurer_id.in_(
+                select(adventurers_table.c.id).where(adventurers_table.c.user_id == user_id)
+            ),
+        )
+        flip = update(quests_table).where(*open_quests).values(completed=True, updated_at=now)
+        rewarded = (quests_table.c.id, quests_table.c.adventurer_id, quests_table.c.experience_reward)
+        try:
+            if self.db.get_bind().dialect.update_returning:
+                completed = list((await self.db.execute(flip.returning(*rewarded))).all())
+            else:
+                # Lock the open quests first, so the UPDATE flips exactly the quests that are rewarded
+                completed = list((await self.db.execute(select(*rewarded).where(*open_quests).with_for_update())).all())
+                if completed:
+                    await self.db.execute(flip.where(quests_table.c.id.in_([quest.id for quest in completed])))
+            if not completed:
+                return [], []
+
+            await self.db.execute(
+                insert(quest_completions_table).values(
+                    [
+                        {
+                            "id": str(ULID()),
+                            "quest_id": quest.id,
+                            "adventurer_id": quest.adventurer_id,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for quest in completed
+                    ]
+                )
+            )
+
+            experience: Dict[str, int] = {}
+            for quest in completed:
+                experience[quest.adventurer_id] = experience.get(quest.adventurer_id, 0) + (
+                    quest.experience_reward or 0
+                )
+            adventurer_service = AdventurerService(db=self.db)
+            adventurers = []
+            # In ID order, so concurrent batches lock the adventurers in the same order
+            for adventurer_id in sorted(experience):
+                adventurer = await adventurer_service.apply_experience(adventurer_id, experience[adventurer_id])
+                if adventurer is not None:
+                    adventurers.append(adventurer)
+
+            await commit_or_flush(self.db)
+            return [quest.id for quest in completed], adventurers
+        except Exception as e:
+            await self.db.rollback()
+            raise QuestCompletionError(f"Error completing quests: {str(e)}") from e
+
     async def delete_quest(self, quest_id: str) -> bool:
         """
         Delete a quest by ID.
@@ -213,14 +538,14 @@ class QuestService:
             if not quest:
                 raise QuestNotFoundError(f"Quest with ID: {quest_id} not found")
 
-            self.db.delete(quest)
-            self.db.commit()
+            await self.db.delete(quest)
+            await commit_or_flush(self.db)
 
             return True
         except QuestNotFoundError as e:
             raise e
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise QuestServiceError(f"Error deleting quest: {str(e)}") from e
 
     def quest_to_dict(self, quest: Quest) -> Dict[str, Any]:
@@ -0,0 +1,119 @@
+"""
+Memory-mapped tables shared by the workers on a host.
+
+A table is a file of fixed-size slots that every gunicorn worker maps, used
+as an open-addressing hash table keyed by a 64-bit hash. Reads are plain
+memory loads; writes are serialized between processes with ``flock``. The
+first worker to open the file creates and sizes it; later workers keep its
+size, so a table never changes shape under a running worker.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Magic, slot count, time of the last overflow (seconds since the epoch, 0 if none), slot size
+HEADER = struct.Struct("=4sIII")
+# Slots examined before a lookup or insert gives up
+MAX_PROBES = 32
+
+
+def hash_key(key: str) -> int:
+    """
+    Hash a key to a non-zero 64-bit integer; zero marks an empty slot.
+
+    Args:
+        key: The key to hash
+
+    Returns:
+        int: The hashed key
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedTable:
+    """A fixed-size table of slots in a memory-mapped file; the file is opened on first use."""
+
+    def __init__(self, path: str, slots: int, slot: struct.Struct, magic: bytes) -> None:
+        """Initialize the table with its file, slot count, slot layout and file magic."""
+        self.path = path
+        self.slots = slots
+        self.slot = slot
+        self.magic = magic
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._open_lock = threading.Lock()
+
+    def mapping(self) -> mmap.mmap:
+        """Open and map the file, creating and sizing it if this is the first worker."""
+        if self._map is not None:
+            return self._map
+        with self._open_lock:
+            if self._map is None:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    header = os.pread(fd, HEADER.size, 0)
+                    if len(header) == HEADER.size and header[:4] == self.magic:
+                        # Another worker created the table; keep its size
+                        self.slots = HEADER.unpack(header)[1]
+                    else:
+                        os.ftruncate(fd, HEADER.size + self.slots * self.slot.size)
+                        os.pwrite(fd, HEADER.pack(self.magic, self.slots, 0, self.slot.size), 0)
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                self._map = mmap.mmap(fd, HEADER.size + self.slots * self.slot.size)
+                self._fd = fd
+        return self._map
+
+    @contextmanager
+    def locked(self) -> Iterator[mmap.mmap]:
+        """Hold the cross-process write lock and yield the mapping."""
+        table = self.mapping()
+        assert self._fd is not None
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield table
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def probe(self, key: int) -> Iterator[int]:
+        """Yield the offsets of the slots on a key's probe path."""
+        for probe in range(MAX_PROBES):
+            yield HEADER.size + ((key + probe) % self.slots) * self.slot.size
+
+    @property
+    def overflowed(self) -> bool:
+        """Whether an insert has ever found no free slot on its probe path."""
+        return self.overflowed_at != 0
+
+    @property
+    def overflowed_at(self) -> int:
+        """When an insert last found no free slot on its probe path, in seconds since the epoch, or 0 if never."""
+        return int(HEADER.unpack_from(self.mapping(), 0)[2])
+
+    def overflowed_within(self, seconds: float) -> bool:
+        """Whether an insert found no free slot in the last ``seconds`` seconds."""
+        overflowed_at = self.overflowed_at
+        return overflowed_at != 0 and time.time() - overflowed_at < seconds
+
+    def mark_overflowed(self, table: mmap.mmap) -> None:
+        """Record that an insert found no free slot, and when; the caller holds the lock."""
+        magic, slots, _, slot_size = HEADER.unpack_from(table, 0)
+        HEADER.pack_into(table, 0, magic, slots, int(time.time()), slot_size)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        with self._open_lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
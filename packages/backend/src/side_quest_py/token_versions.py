@@ -0,0 +1,136 @@
+"""
+Shared token version table for the Side Quest Py application.
+
+Every access token carries the user's ``token_version`` as its ``ver`` claim,
+and logging out bumps the version in the database, which revokes every token
+issued before. So that a cached principal can be checked without a query,
+the latest bumped version of each user is also written to a small table in a
+memory-mapped file that all gunicorn workers on the host map. Reading it is a
+hash and two memory loads; writes are rare and serialized with ``flock``.
+
+Each slot holds an 8-byte hash of the user ID, the user's current token
+version and when it was recorded. Versions only ever increase, so a reader
+racing a writer sees either the old or the new version. A version recorded
+more than ``ACCESS_TOKEN_EXPIRE_MINUTES`` ago can no longer revoke anything,
+since every token issued before it has expired, so its slot is reused. If a
+user's slot cannot be found because the table is full, lookups for unrecorded
+users answer "unknown" for one token lifetime and the caller falls back to
+the database.
+"""
+
+import mmap
+import struct
+import time
+from typing import Any, Dict, Optional
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.shared_table import HEADER, SharedTable, hash_key
+
+MAGIC = b"SQT2"
+# User key, token version, recorded at (seconds since the epoch)
+SLOT = struct.Struct("=QQQ")
+FIELD = struct.Struct("=Q")
+
+
+class TokenVersionTable(SharedTable):
+    """A per-host table of current token versions, shared by the workers through mmap."""
+
+    def __init__(
+        self, path: str, slots: int, retention_seconds: float = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    ) -> None:
+        """Initialize the table with how long a recorded version can revoke tokens; the file is opened on first use."""
+        super().__init__(path, slots, SLOT, MAGIC)
+        self.retention_seconds = retention_seconds
+
+    def _lookup(self, table: mmap.mmap, key: int) -> Optional[int]:
+        """Return the offset of the key's slot, or None if the key is not recorded."""
+        for offset in self.probe(key):
+            slot_key = FIELD.unpack_from(table, offset)[0]
+            if slot_key == key:
+                return offset
+            if slot_key == 0:
+                return None
+        return None
+
+    def _find(self, table: mmap.mmap, key: int) -> Optional[int]:
+        """Return the offset of the key's slot, or of the first slot on its probe path that is empty or expired."""
+        expired_before = time.time() - self.retention_seconds
+        free = None
+        for offset in self.probe(key):
+            slot_key, _, recorded_at = SLOT.unpack_from(table, offset)
+            if slot_key == key:
+                return offset
+            if slot_key == 0:
+                return offset if free is None else free
+            if free is None and recorded_at < expired_before:
+                free = offset
+        return free
+
+    def current(self, user_id: str) -> Optional[int]:
+        """
+        Get the current token version of a user.
+
+        Args:
+            user_id: The ID of the user
+
+        Returns:
+            Optional[int]: The recorded version, 0 if the user has not revoked their tokens within a token
+                lifetime, or None if the table was full within a token lifetime and cannot tell
+        """
+        table = self.mapping()
+        offset = self._lookup(table, hash_key(user_id))
+        if offset is not None:
+            return int(FIELD.unpack_from(table, offset + 8)[0])
+        return None if self.overflowed_within(self.retention_seconds) else 0
+
+    def record(self, user_id: str, version: int) -> None:
+        """
+        Record a user's new token version for every worker on this host.
+
+        Args:
+            user_id: The ID of the user
+            version: The user's token version after the bump
+        """
+        key = hash_key(user_id)
+        with self.locked() as table:
+            offset = self._find(table, key)
+            if offset is None:
+                self.mark_overflowed(table)
+                return
+            slot_key, recorded, _ = SLOT.unpack_from(table, offset)
+            if slot_key == key and recorded >= version:
+                return
+            FIELD.pack_into(table, offset + 16, int(time.time()))
+            if slot_key != key:
+                # Reusing an expired slot: zero the version first, which is what its previous user's lookups
+                # already mean, so a reader never sees either key with the other user's version
+                FIELD.pack_into(table, offset + 8, 0)
+                FIELD.pack_into(table, offset, key)
+            FIELD.pack_into(table, offset + 8, version)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the table's usage to a dictionary for JSON serialization.
+
+        Returns:
+            Dict[str, Any]: Slot counts and overflow state for this host
+        """
+        table = self.mapping()
+        expired_before = time.time() - self.retention_seconds
+        used = live = 0
+        for offset in range(HEADER.size, HEADER.size + self.slots * SLOT.size, SLOT.size):
+            slot_key, _, recorded_at = SLOT.unpack_from(table, offset)
+            if slot_key:
+                used += 1
+                live += recorded_at >= expired_before
+        overflowed_at = self.overflowed_at
+        return {
+            "slots": self.slots,
+            "used": used,
+            "live": live,
+            "overflowed_at": overflowed_at or None,
+            "overflowing": self.overflowed_within(self.retention_seconds),
+        }
+
+
+token_versions = TokenVersionTable(settings.AUTH_TOKEN_VERSIONS_FILE, settings.AUTH_TOKEN_VERSIONS_SLOTS)
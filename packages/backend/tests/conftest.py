@@ -1,31 +1,123 @@
+import os
+from typing import AsyncIterator, Dict, Iterator
+
 import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+# The settings module validates the environment on import, so provide test defaults first
+os.environ.setdefault("FASTAPI_ENV", "testing")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("GUNICORN_BIND", "127.0.0.1:5000")
+os.environ.setdefault("GUNICORN_WORKERS", "1")
+os.environ.setdefault("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+os.environ.setdefault("GUNICORN_ACCESS_LOG", "-")
+os.environ.setdefault("GUNICORN_ERROR_LOG", "-")
+os.environ.setdefault("GUNICORN_LOG_LEVEL", "info")
+os.environ.setdefault("GUNICORN_TIMEOUT", "120")
+os.environ.setdefault("GUNICORN_KEEPALIVE", "5")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("RABBITMQ_URL", "memory://")
+os.environ.setdefault("SMTP_SERVER", "localhost")
+os.environ.setdefault("SMTP_PORT", "1025")
+os.environ.setdefault("SMTP_USERNAME", "user")
+os.environ.setdefault("SMTP_PASSWORD", "password")
+os.environ.setdefault("SMTP_SENDER_EMAIL", "noreply@sidequest.dev")
+# Keep bcrypt cheap so tests that register and log in stay fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from src.side_quest_py import create_app  # noqa: E402
+from src.side_quest_py.api.compression import compressed_bodies  # noqa: E402
+from src.side_quest_py.database import Base, get_db, get_session_factory, make_get_db  # noqa: E402
+from src.side_quest_py.db_routing import read_your_writes  # noqa: E402
+from src.side_quest_py.login_throttle import login_throttle  # noqa: E402
+from src.side_quest_py.principal_cache import principal_cache  # noqa: E402
+from src.side_quest_py.services.auth_service import AuthService  # noqa: E402
+from src.side_quest_py.token_versions import token_versions  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache() -> None:
+    """Start every test with an empty principal cache, since each test has its own database."""
+    principal_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_compressed_bodies() -> None:
+    """Start every test with no cached compressed bodies, since ETags repeat across test databases."""
+    compressed_bodies.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_login_throttle() -> None:
+    """Start every test with no recorded login failures."""
+    login_throttle.clear()
+
 
-from packages.backend.src.side_quest_py import create_app, db
+@pytest.fixture(autouse=True)
+def isolated_token_versions(tmp_path) -> Iterator[None]:
+    """Give every test its own token version table file."""
+    token_versions.close()
+    token_versions.path = str(tmp_path / "token_versions")
+    yield
+    token_versions.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_read_your_writes(tmp_path) -> Iterator[None]:
+    """Give every test its own read-your-writes table file."""
+    read_your_writes.close()
+    read_your_writes.path = str(tmp_path / "read_your_writes")
+    yield
+    read_your_writes.close()
+
+
+@pytest.fixture
+async def db_engine(tmp_path) -> AsyncIterator[AsyncEngine]:
+    """Create an aiosqlite engine with all tables for a single test."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'side_quest_test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    await engine.dispose()
 
 
 @pytest.fixture
-def app():
-    """Create and configure a Flask app for testing."""
-    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+def session_factory(db_engine: AsyncEngine) -> async_sessionmaker:
+    """Session factory bound to the test engine."""
+    return async_sessionmaker(bind=db_engine, autoflush=False, expire_on_commit=False)
 
-    # Create the database and tables
-    with app.app_context():
-        db.create_all()
 
-    yield app
+@pytest.fixture
+async def db_session(session_factory: async_sessionmaker) -> AsyncIterator[AsyncSession]:
+    """An async session against the test database."""
+    async with session_factory() as session:
+        yield session
 
-    # Clean up after the test
-    with app.app_context():
-        db.drop_all()
+
+@pytest.fixture
+def app(session_factory: async_sessionmaker):
+    """Create a FastAPI app whose database dependencies use the test database."""
+    app = create_app()
+    app.dependency_overrides[get_db] = make_get_db(session_factory)
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    return app
 
 
 @pytest.fixture
-def client(app):
-    """A test client for the app."""
-    return app.test_client()
+async def client(app) -> AsyncIterator[AsyncClient]:
+    """An async test client for the app."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
 
 
 @pytest.fixture
-def runner(app):
-    """A test CLI runner for the app."""
-    return app.test_cli_runner()
+async def auth_headers(db_session: AsyncSession) -> Dict[str, str]:
+    """Register a test user and return the Authorization header for it."""
+    auth_service = AuthService(db=db_session)
+    await auth_service.register_user(username="test_user", email="test_user@example.com", password="password123")
+    access_token = await auth_service.authenticate_user(username="test_user", password="password123")
+    return {"Authorization": f"Bearer {access_token}"}
@@ -0,0 +1,27 @@
+from datetime import timedelta
+from typing import Any, Iterator, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.side_quest_py.api.deps import etags
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> Iterator[List[str]]:
+    """Records every statement sent to the test database"""
+    recorded: List[str] = []
+
+    def on_execute(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        recorded.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", on_execute)
+    yield recorded
+    event.remove(db_engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture
+def settled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Issue ETags for changes made just now"""
+    monkeypatch.setattr(etags, "SETTLE_TIME", timedelta(0))
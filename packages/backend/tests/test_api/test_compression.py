@@ -0,0 +1,157 @@
+import threading
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+import pytest
+from httpx import AsyncClient
+
+from src.side_quest_py.api import compression
+from src.side_quest_py.api.compression import CompressedBodyCache, compressed_bodies, negotiate
+from src.side_quest_py.api.deps import etags
+
+
+async def _adventurer_with_quests(client: AsyncClient, auth_headers: Dict[str, str], count: int) -> str:
+    """Create an adventurer with count quests and return its ID"""
+    created = await client.post(
+        "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+    )
+    adventurer_id = created.json()["id"]
+    quests = [
+        {"title": f"Quest {i}", "description": "Carry the ring a little further", "adventurer_id": adventurer_id}
+        for i in range(count)
+    ]
+    response = await client.post("/api/v1/quests/batch", json={"quests": quests}, headers=auth_headers)
+    assert response.status_code == 201
+    return adventurer_id
+
+
+@pytest.fixture
+def gzip_calls(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Records the ID of the thread of every gzip compression"""
+    calls: List[int] = []
+    encode: Callable[[bytes], bytes] = compression.ENCODERS["gzip"]
+
+    def recording_encode(body: bytes) -> bytes:
+        calls.append(threading.get_ident())
+        return encode(body)
+
+    monkeypatch.setitem(compression.ENCODERS, "gzip", recording_encode)
+    return calls
+
+
+class TestCompression:
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            ("gzip, deflate", "gzip"),
+            ("GZIP;q=0.5", "gzip"),
+            ("br;q=0.1, gzip", "br"),
+            ("deflate, *;q=0.1", "br"),
+            ("gzip;q=0, br;q=0, *", None),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiation(self, accept_encoding: str, expected: str) -> None:
+        """Test that the most preferred offered encoding the client accepts is chosen"""
+        # Act
+        encoding = negotiate(accept_encoding, ["br", "gzip"])
+
+        # Assert
+        assert encoding == expected
+
+    async def test_large_response_is_compressed(
+        self, client: AsyncClient, auth_headers: Dict[str, str], gzip_calls: List[int]
+    ) -> None:
+        """Test that a body above the minimum size is gzipped on the event loop with a correct Content-Length"""
+        # Arrange
+        adventurer_id = await _adventurer_with_quests(client, auth_headers, 20)
+        gzip_calls.clear()
+
+        # Act
+        compressed = await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)
+        plain = await client.get(
+            f"/api/v1/quests/{adventurer_id}", headers={**auth_headers, "Accept-Encoding": "identity"}
+        )
+
+        # Assert
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["Vary"]
+        assert int(compressed.headers["Content-Length"]) < len(plain.content)
+        assert compressed.json() == plain.json()
+        assert "Content-Encoding" not in plain.headers
+        assert gzip_calls == [threading.get_ident()]
+
+    async def test_small_response_is_not_compressed(self, client: AsyncClient, gzip_calls: List[int]) -> None:
+        """Test that a body below the minimum size is sent as it is"""
+        # Act
+        response = await client.get("/hello", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert "Content-Encoding" not in response.headers
+        assert response.json() == {"message": "Hello, Side Quest!"}
+        assert gzip_calls == []
+
+    async def test_very_large_response_is_compressed_in_a_thread(
+        self, client: AsyncClient, auth_headers: Dict[str, str], gzip_calls: List[int]
+    ) -> None:
+        """Test that a body above the thread minimum size is compressed off the event loop"""
+        # Arrange
+        adventurer_id = await _adventurer_with_quests(client, auth_headers, 400)
+        gzip_calls.clear()
+
+        # Act
+        response = await client.get(f"/api/v1/quests/{adventurer_id}?limit=1000", headers=auth_headers)
+
+        # Assert
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.content) >= compression.settings.COMPRESSION_THREAD_MIN_SIZE
+        assert len(response.json()) == 400
+        assert len(gzip_calls) == 1 and gzip_calls[0] != threading.get_ident()
+
+    async def test_compressed_body_is_reused_while_etag_holds(
+        self,
+        client: AsyncClient,
+        auth_headers: Dict[str, str],
+        gzip_calls: List[int],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that an unchanged response is served from the cache and a changed one is compressed again"""
+        # Arrange
+        monkeypatch.setattr(etags, "SETTLE_TIME", timedelta(0))
+        adventurer_id = await _adventurer_with_quests(client, auth_headers, 20)
+        first = await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)
+        gzip_calls.clear()
+
+        # Act
+        second = await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)
+        await client.post(
+            "/api/v1/quest", json={"title": "Quest", "adventurer_id": adventurer_id}, headers=auth_headers
+        )
+        changed = await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)
+
+        # Assert
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert second.json() == first.json()
+        assert changed.headers["ETag"] != first.headers["ETag"]
+        assert len(changed.json()) == 21
+        assert len(gzip_calls) == 1
+        assert compressed_bodies.hits == 1
+
+    def test_cache_evicts_least_recently_used_bodies(self) -> None:
+        """Test that the cache stays within its byte bound by dropping the oldest bodies"""
+        # Arrange
+        cache = CompressedBodyCache(max_bytes=10)
+        keys = [("user", f"/path/{i}", b"", f'W/"{i}"', "gzip") for i in range(3)]
+        cache.put(keys[0], b"aaaa")
+        cache.put(keys[1], b"bbbb")
+        cache.get(keys[0])
+
+        # Act
+        cache.put(keys[2], b"cccc")
+
+        # Assert
+        assert cache.get(keys[0]) == b"aaaa"
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) == b"cccc"
+        assert cache.to_dict()["bytes"] == 8 and cache.evictions == 1
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+
+from src.side_quest_py.api.deps import etags
+
+
+@pytest.mark.usefixtures("settled")
+class TestConditionalGet:
+    async def test_unchanged_list_is_not_modified_without_reading_rows(
+        self, client: AsyncClient, auth_headers: Dict[str, str], statements: List[str]
+    ) -> None:
+        """Test that a matching If-None-Match gets a bodiless 304 after only the aggregate query"""
+        # Arrange
+        await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        first = await client.get("/api/v1/adventurers", headers=auth_headers)
+        etag = first.headers["ETag"]
+        statements.clear()
+
+        # Act
+        response = await client.get("/api/v1/adventurers", headers={**auth_headers, "If-None-Match": etag})
+
+        # Assert
+        assert etag.startswith('W/"')
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert len(statements) == 1 and "count(*)" in statements[0]
+
+    async def test_changes_produce_a_new_etag(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that creating and updating items changes the list and item ETags"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        adventurer_id = created.json()["id"]
+        list_etag = (await client.get("/api/v1/adventurers", headers=auth_headers)).headers["ETag"]
+        item_etag = (await client.get(f"/api/v1/adventurer/{adventurer_id}", headers=auth_headers)).headers["ETag"]
+        quests_etag = (await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)).headers["ETag"]
+
+        # Act
+        await client.put(f"/api/v1/adventurer/{adventurer_id}", json={"name": "Frodo Baggins"}, headers=auth_headers)
+        await client.post(
+            "/api/v1/quest", json={"title": "Quest", "adventurer_id": adventurer_id}, headers=auth_headers
+        )
+        adventurers = await client.get("/api/v1/adventurers", headers={**auth_headers, "If-None-Match": list_etag})
+        adventurer = await client.get(
+            f"/api/v1/adventurer/{adventurer_id}", headers={**auth_headers, "If-None-Match": item_etag}
+        )
+        quests = await client.get(
+            f"/api/v1/quests/{adventurer_id}", headers={**auth_headers, "If-None-Match": quests_etag}
+        )
+
+        # Assert
+        assert adventurers.status_code == 200 and adventurers.headers["ETag"] != list_etag
+        assert adventurer.status_code == 200 and adventurer.json()["name"] == "Frodo Baggins"
+        assert quests.status_code == 200 and len(quests.json()) == 1
+
+    async def test_me_is_not_modified_without_database(
+        self, client: AsyncClient, auth_headers: Dict[str, str], statements: List[str]
+    ) -> None:
+        """Test that /auth/me revalidates from the cached principal alone"""
+        # Arrange
+        etag = (await client.get("/api/v1/auth/me", headers=auth_headers)).headers["ETag"]
+        statements.clear()
+
+        # Act
+        response = await client.get("/api/v1/auth/me", headers={**auth_headers, "If-None-Match": f'"other", {etag}'})
+
+        # Assert
+        assert response.status_code == 304
+        assert statements == []
+
+    async def test_recent_change_gets_no_etag(
+        self, client: AsyncClient, auth_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that no ETag is issued while the newest change could still share its timestamp with the next"""
+        # Arrange
+        monkeypatch.setattr(etags, "SETTLE_TIME", timedelta(hours=1))
+        await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+
+        # Act
+        response = await client.get("/api/v1/adventurers", headers={**auth_headers, "If-None-Match": "*"})
+
+        # Assert
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
@@ -0,0 +1,147 @@
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+
+
+class TestSparseFields:
+    async def test_list_selects_only_requested_columns(
+        self, client: AsyncClient, auth_headers: Dict[str, str], statements: List[str]
+    ) -> None:
+        """Test that ?fields= becomes the SELECT list and the response holds only those fields and the ID"""
+        # Arrange
+        for name in ("Frodo", "Sam"):
+            await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+        statements.clear()
+
+        # Act
+        response = await client.get("/api/v1/adventurers?fields=name,level", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert [set(adventurer) for adventurer in response.json()] == [{"id", "name", "level"}] * 2
+        select_list = statements[-1].split("FROM")[0]
+        assert "name" in select_list and "level" in select_list
+        assert "experience" not in select_list and "created_at" not in select_list
+
+    async def test_get_and_quest_list_accept_fields(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that the adventurer and quest reads return the requested fields, and all of them by default"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        adventurer_id = created.json()["id"]
+        await client.post(
+            "/api/v1/quest", json={"title": "Quest", "adventurer_id": adventurer_id}, headers=auth_headers
+        )
+
+        # Act
+        adventurer = await client.get(f"/api/v1/adventurer/{adventurer_id}?fields=level", headers=auth_headers)
+        full = await client.get(f"/api/v1/adventurer/{adventurer_id}", headers=auth_headers)
+        quests = await client.get(f"/api/v1/quests/{adventurer_id}?fields=title,completed", headers=auth_headers)
+
+        # Assert
+        assert adventurer.json() == {"id": adventurer_id, "level": 1}
+        assert full.json() == created.json()
+        assert quests.json() == [{"id": quests.json()[0]["id"], "title": "Quest", "completed": False}]
+
+    async def test_unknown_fields_are_rejected(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that fields outside the response schema, or none at all, get a 400"""
+        # Act
+        unknown = await client.get("/api/v1/adventurers?fields=name,user_id", headers=auth_headers)
+        empty = await client.get("/api/v1/adventurers?fields=,", headers=auth_headers)
+
+        # Assert
+        assert unknown.status_code == 400
+        assert unknown.json()["detail"] == "Unknown fields: user_id"
+        assert empty.status_code == 400
+
+
+async def _adventurer_with_quests(client: AsyncClient, auth_headers: Dict[str, str], quests: int) -> str:
+    """Create an adventurer with some quests, complete the first one and return the adventurer's ID"""
+    created = await client.post(
+        "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+    )
+    adventurer_id = created.json()["id"]
+    batch = [{"title": f"Quest {i}", "adventurer_id": adventurer_id} for i in range(quests)]
+    response = await client.post("/api/v1/quests/batch", json={"quests": batch}, headers=auth_headers)
+    first_quest = response.json()["created"][0]["id"]
+    await client.post("/api/v1/quests/batch/complete", json={"quest_ids": [first_quest]}, headers=auth_headers)
+    return adventurer_id
+
+
+class TestEmbeddedRelations:
+    async def test_query_count_does_not_grow_with_adventurers(
+        self, client: AsyncClient, auth_headers: Dict[str, str], statements: List[str]
+    ) -> None:
+        """Test that embedding quests and completions costs one query per relation, however many adventurers"""
+        # Arrange
+        path = "/api/v1/adventurers?include=quests,completions"
+        for _ in range(2):
+            await _adventurer_with_quests(client, auth_headers, 2)
+        statements.clear()
+        few = await client.get(path, headers=auth_headers)
+        few_queries = len(statements)
+        for _ in range(6):
+            await _adventurer_with_quests(client, auth_headers, 2)
+        statements.clear()
+
+        # Act
+        many = await client.get(path, headers=auth_headers)
+
+        # Assert
+        assert len(few.json()) == 2 and len(many.json()) == 8
+        assert len(statements) == few_queries
+        assert all(len(adventurer["quests"]) == 2 for adventurer in many.json())
+        assert all(len(adventurer["completions"]) == 1 for adventurer in many.json())
+
+    async def test_get_embeds_limited_quests_and_completions(
+        self, client: AsyncClient, auth_headers: Dict[str, str]
+    ) -> None:
+        """Test that quests_limit caps the embedded quests of each adventurer in ID order"""
+        # Arrange
+        adventurer_id = await _adventurer_with_quests(client, auth_headers, 3)
+        quests = (await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)).json()
+
+        # Act
+        response = await client.get(
+            f"/api/v1/adventurer/{adventurer_id}?include=quests,completions&quests_limit=2", headers=auth_headers
+        )
+        plain = await client.get(f"/api/v1/adventurer/{adventurer_id}", headers=auth_headers)
+
+        # Assert
+        body = response.json()
+        assert body["quests"] == quests[:2]
+        assert [completion["quest_id"] for completion in body["completions"]] == [
+            quest["id"] for quest in quests if quest["completed"]
+        ]
+        assert "quests" not in plain.json() and "completions" not in plain.json()
+
+    @pytest.mark.usefixtures("settled")
+    async def test_embedded_changes_produce_a_new_etag(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that a new quest changes the ETag of an adventurer read that embeds quests"""
+        # Arrange
+        adventurer_id = await _adventurer_with_quests(client, auth_headers, 1)
+        path = f"/api/v1/adventurer/{adventurer_id}?include=quests"
+        etag = (await client.get(path, headers=auth_headers)).headers["ETag"]
+
+        # Act
+        await client.post(
+            "/api/v1/quest", json={"title": "Quest", "adventurer_id": adventurer_id}, headers=auth_headers
+        )
+        response = await client.get(path, headers={**auth_headers, "If-None-Match": etag})
+
+        # Assert
+        assert response.status_code == 200
+        assert len(response.json()["quests"]) == 2
+
+    async def test_unknown_relations_are_rejected(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that relations other than quests and completions get a 400"""
+        # Act
+        response = await client.get("/api/v1/adventurers?include=quests,user", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown relations: user"
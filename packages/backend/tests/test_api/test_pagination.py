@@ -0,0 +1,138 @@
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.side_quest_py.api.deps import pagination as pagination_deps
+from src.side_quest_py.pagination import InvalidCursorError, decode_cursor, encode_cursor, split_page
+from src.side_quest_py.services.adventurer_service import AdventurerService
+from src.side_quest_py.services.quest_service import QuestService
+
+
+class TestCursors:
+    def test_cursor_round_trip(self) -> None:
+        """Test that a cursor decodes back to the ID it was made from"""
+        # Arrange
+        last_id = "01JQ8Z6Q0N9W2X3Y4Z5A6B7C8D"
+
+        # Act
+        cursor = encode_cursor(last_id)
+
+        # Assert
+        assert last_id not in cursor
+        assert decode_cursor(cursor) == last_id
+
+    @pytest.mark.parametrize("cursor", ["!!!", "_w", ""])
+    def test_invalid_cursor(self, cursor: str) -> None:
+        """Test that a malformed cursor raises InvalidCursorError"""
+        # Act & Assert
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+    def test_split_page(self) -> None:
+        """Test that the lookahead row is dropped and turned into a cursor for the last row"""
+
+        class Row:
+            def __init__(self, id: str) -> None:
+                self.id = id
+
+        # Arrange
+        rows = [Row("a"), Row("b"), Row("c")]
+
+        # Act & Assert
+        page, next_cursor = split_page(rows, 2)
+        assert [row.id for row in page] == ["a", "b"]
+        assert next_cursor is not None and decode_cursor(next_cursor) == "b"
+        assert split_page(rows, 3) == (rows, None)
+        assert split_page(rows, None) == (rows, None)
+
+
+class TestKeysetPagination:
+    async def test_walk_quest_pages(
+        self, client: AsyncClient, auth_headers: Dict[str, str], db_session: AsyncSession
+    ) -> None:
+        """Test that following X-Next-Cursor returns every quest exactly once, in creation order"""
+        # Arrange
+        adventurer = await AdventurerService(db=db_session).create_adventurer(name="Aragorn", user_id="test_user_id")
+        quest_service = QuestService(db=db_session)
+        created: List[str] = []
+        for i in range(7):
+            quest = await quest_service.create_quest(
+                title=f"Quest {i}", adventurer_id=str(adventurer.id), experience_reward=10
+            )
+            created.append(str(quest.id))
+
+        # Act
+        seen: List[str] = []
+        params: Dict[str, str] = {"limit": "3"}
+        pages = 0
+        while True:
+            response = await client.get(f"/api/v1/quests/{adventurer.id}", params=params, headers=auth_headers)
+            assert response.status_code == 200
+            seen.extend(quest["id"] for quest in response.json())
+            pages += 1
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                assert "Link" not in response.headers
+                break
+            assert 'rel="next"' in response.headers["Link"]
+            params = {"limit": "3", "after": next_cursor}
+
+        # Assert
+        assert pages == 3
+        assert seen == sorted(created)
+
+    async def test_adventurers_page(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that the adventurer list honours the limit and returns a cursor for the rest"""
+        # Arrange
+        for name in ("Frodo", "Sam", "Merry"):
+            response = await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+            assert response.status_code == 201
+
+        # Act
+        first = await client.get("/api/v1/adventurers", params={"limit": 2}, headers=auth_headers)
+        rest = await client.get(
+            "/api/v1/adventurers", params={"after": first.headers["X-Next-Cursor"]}, headers=auth_headers
+        )
+
+        # Assert
+        assert [adventurer["name"] for adventurer in first.json()] == ["Frodo", "Sam"]
+        assert [adventurer["name"] for adventurer in rest.json()] == ["Merry"]
+        assert "X-Next-Cursor" not in rest.headers
+
+    async def test_list_without_page_params_is_whole(
+        self, client: AsyncClient, auth_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a list requested without limit or cursor returns every row, as before pagination"""
+        # Arrange
+        monkeypatch.setattr(pagination_deps.settings, "PAGE_SIZE_DEFAULT", 1)
+        for name in ("Frodo", "Sam", "Merry"):
+            response = await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+            assert response.status_code == 201
+
+        # Act
+        whole = await client.get("/api/v1/adventurers", headers=auth_headers)
+        first = await client.get("/api/v1/adventurers", params={"limit": 2}, headers=auth_headers)
+        rest = await client.get(
+            "/api/v1/adventurers", params={"after": first.headers["X-Next-Cursor"]}, headers=auth_headers
+        )
+
+        # Assert
+        assert [adventurer["name"] for adventurer in whole.json()] == ["Frodo", "Sam", "Merry"]
+        assert "X-Next-Cursor" not in whole.headers and "Link" not in whole.headers
+        assert [adventurer["name"] for adventurer in rest.json()] == ["Merry"]
+
+    async def test_invalid_cursor_is_rejected(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that a malformed cursor is a 400 and an oversized limit is a 422"""
+        # Act
+        bad_cursor = await client.get("/api/v1/adventurers", params={"after": "!!!"}, headers=auth_headers)
+        bad_limit = await client.get("/api/v1/adventurers", params={"limit": 100_000}, headers=auth_headers)
+
+        # Assert
+        assert bad_cursor.status_code == 400
+        assert bad_limit.status_code == 422
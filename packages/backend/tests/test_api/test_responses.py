@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import routing
+from fastapi.exceptions import ResponseValidationError
+from httpx import AsyncClient
+from pydantic import TypeAdapter
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.side_quest_py.api import responses
+from src.side_quest_py.api.responses import dumps, fast_response
+from src.side_quest_py.api.schemas.adventurer import AdventurerResponse
+from src.side_quest_py.api.schemas.quest import QuestResponse
+
+
+class TestFastJSONResponses:
+    async def test_lists_match_response_models_without_revalidation(
+        self, client: AsyncClient, auth_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the list bodies satisfy their response models although FastAPI never validates them"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Aragorn", "adventurer_type": "Ranger"}, headers=auth_headers
+        )
+        assert created.status_code == 201
+        adventurer_id = created.json()["id"]
+        quest = await client.post(
+            "/api/v1/quest", json={"title": "Quest", "adventurer_id": adventurer_id}, headers=auth_headers
+        )
+        assert quest.status_code == 201
+        serialized: List[Any] = []
+        original = routing.serialize_response
+
+        async def counting_serialize_response(**kwargs: Any) -> Any:
+            serialized.append(kwargs)
+            return await original(**kwargs)
+
+        monkeypatch.setattr(routing, "serialize_response", counting_serialize_response)
+
+        # Act
+        adventurers = await client.get("/api/v1/adventurers", headers=auth_headers)
+        quests = await client.get(f"/api/v1/quests/{adventurer_id}", headers=auth_headers)
+
+        # Assert
+        assert adventurers.status_code == 200 and quests.status_code == 200
+        assert TypeAdapter(List[AdventurerResponse]).validate_json(adventurers.content)[0].name == "Aragorn"
+        assert TypeAdapter(List[QuestResponse]).validate_json(quests.content)[0].title == "Quest"
+        assert serialized == []
+
+    async def test_page_headers_survive(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that the next page headers set by a route are kept on the fast response"""
+        # Arrange
+        for name in ("Frodo", "Sam"):
+            await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+
+        # Act
+        response = await client.get("/api/v1/adventurers", params={"limit": "1"}, headers=auth_headers)
+
+        # Assert
+        assert response.headers["content-type"] == "application/json"
+        assert len(response.json()) == 1
+        assert "X-Next-Cursor" in response.headers
+        assert 'rel="next"' in response.headers["Link"]
+
+    async def test_row_mappings_and_datetimes_are_encoded(self, db_session: AsyncSession) -> None:
+        """Test that Core row mappings encode as objects and datetimes as ISO 8601, like the JSON encoder did"""
+        # Arrange
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678)
+        rows = (await db_session.execute(select(literal("a").label("id"), literal(1).label("level")))).mappings().all()
+
+        # Act
+        encoded_rows = dumps(rows)
+        encoded_row = dumps({"row": rows[0], "created_at": created_at})
+
+        # Assert
+        assert encoded_rows == b'[{"id":"a","level":1}]'
+        assert encoded_row == b'{"row":{"id":"a","level":1},"created_at":"2025-01-02T03:04:05.000678"}'
+
+    def test_body_is_checked_against_response_model(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a body which drifts from its response model fails when validation is on, and only then"""
+        # Arrange
+        quest = {"id": "q", "adventurer_id": "a", "title": "Quest", "experience_reward": 10, "completed": False}
+        created_at = datetime(2025, 1, 2, 3, 4, 5)
+
+        # Act & Assert
+        fast_response({**quest, "created_at": created_at, "updated_at": created_at}, model=QuestResponse)
+        with pytest.raises(ResponseValidationError):
+            fast_response(quest, model=QuestResponse)
+        fast_response(quest, model=None)
+        monkeypatch.setattr(responses.settings, "VALIDATE_RESPONSES", False)
+        fast_response(quest, model=QuestResponse)
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.api.streaming import NDJSON_MEDIA_TYPE
+from src.side_quest_py.pagination import encode_cursor
+from src.side_quest_py.services.adventurer_service import AdventurerService
+from src.side_quest_py.services.quest_service import QuestService
+
+
+@pytest.fixture
+async def quest_ids(db_session: AsyncSession) -> List[str]:
+    """Create an adventurer with a handful of quests and return the quest IDs in order"""
+    adventurer = await AdventurerService(db=db_session).create_adventurer(name="Aragorn", user_id="test_user_id")
+    quest_service = QuestService(db=db_session)
+    ids = []
+    for i in range(5):
+        quest = await quest_service.create_quest(title=f"Quest {i}", adventurer_id=str(adventurer.id))
+        ids.append(str(quest.id))
+    return sorted(ids)
+
+
+class TestNdjsonStreaming:
+    async def test_stream_quests(
+        self,
+        client: AsyncClient,
+        auth_headers: Dict[str, str],
+        quest_ids: List[str],
+        db_session: AsyncSession,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that an NDJSON request streams every quest, ignoring the page size"""
+        # Arrange - a small batch size makes the server-side cursor fetch several batches
+        monkeypatch.setattr(settings, "STREAM_BATCH_SIZE", 2)
+        quest = await QuestService(db=db_session).get_quest(quest_ids[0])
+        headers = {**auth_headers, "Accept": NDJSON_MEDIA_TYPE}
+
+        # Act
+        response = await client.get(f"/api/v1/quests/{quest.adventurer_id}", params={"limit": 1}, headers=headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.headers["content-type"] == NDJSON_MEDIA_TYPE
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == quest_ids
+        assert datetime.fromisoformat(rows[0]["created_at"]) is not None
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_stream_quests_after_cursor(
+        self, client: AsyncClient, auth_headers: Dict[str, str], quest_ids: List[str], db_session: AsyncSession
+    ) -> None:
+        """Test that a streamed list starts after the given cursor"""
+        # Arrange
+        quest = await QuestService(db=db_session).get_quest(quest_ids[0])
+        headers = {**auth_headers, "Accept": f"{NDJSON_MEDIA_TYPE}; q=1.0, application/json; q=0.5"}
+
+        # Act
+        response = await client.get(
+            f"/api/v1/quests/{quest.adventurer_id}", params={"after": encode_cursor(quest_ids[1])}, headers=headers
+        )
+
+        # Assert
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == quest_ids[2:]
+
+    async def test_stream_adventurers(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that the adventurer list streams the user's adventurers"""
+        # Arrange
+        for name in ("Frodo", "Sam"):
+            await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+
+        # Act
+        response = await client.get("/api/v1/adventurers", headers={**auth_headers, "Accept": NDJSON_MEDIA_TYPE})
+
+        # Assert
+        assert [json.loads(line)["name"] for line in response.text.splitlines()] == ["Frodo", "Sam"]
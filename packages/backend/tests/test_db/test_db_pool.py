@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.db_pool import PoolStatistics, get_pool_options, resolve_pool_limits
+
+
+class TestResolvePoolLimits:
+    def test_uses_pool_settings_without_budget(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the configured pool size and overflow are used when no budget is set"""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", None)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 3)
+
+        # Act & Assert
+        assert resolve_pool_limits() == (7, 3)
+
+    def test_splits_budget_across_workers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the connection budget is divided across the gunicorn workers, less the sync engine's pool"""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 100)
+        monkeypatch.setattr(settings, "GUNICORN_WORKERS", 8)
+        monkeypatch.setattr(settings, "DB_SYNC_POOL_SIZE", 1)
+
+        # Act
+        pool_size, max_overflow = resolve_pool_limits()
+
+        # Assert
+        assert (pool_size, max_overflow) == (9, 2)
+        assert (pool_size + max_overflow + settings.DB_SYNC_POOL_SIZE) * 8 <= 100
+
+    def test_budget_smaller_than_workers(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that every worker still gets one connection when the budget is tiny"""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 2)
+        monkeypatch.setattr(settings, "GUNICORN_WORKERS", 4)
+
+        # Act & Assert
+        assert resolve_pool_limits() == (1, 0)
+
+
+class TestPoolStatistics:
+    def test_in_memory_sqlite_gets_no_pool_options(self) -> None:
+        """Test that single-connection SQLite pools are left alone"""
+        assert get_pool_options("sqlite:///:memory:", PoolStatistics()) == {}
+
+    def test_records_checkouts(self, tmp_path) -> None:
+        """Test that checkouts, checkins and pool usage are recorded"""
+        # Arrange
+        database_url = f"sqlite:///{tmp_path / 'pool.db'}"
+        stats = PoolStatistics()
+        engine = create_engine(database_url, **get_pool_options(database_url, stats))
+
+        # Act
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            during = stats.to_dict(engine.pool)
+        after = stats.to_dict(engine.pool)
+        engine.dispose()
+
+        # Assert
+        assert during["checkouts"] == 1
+        assert during["checked_out"] == 1
+        assert after["checkins"] == 1
+        assert after["checked_out"] == 0
+
+    def test_sync_engine_gets_a_minimal_pool(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the synchronous engine keeps its own small pool while the async engine gets the share"""
+        # Arrange
+        monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 100)
+        monkeypatch.setattr(settings, "GUNICORN_WORKERS", 8)
+        monkeypatch.setattr(settings, "DB_SYNC_POOL_SIZE", 1)
+        database_url = f"sqlite:///{tmp_path / 'pool.db'}"
+
+        # Act
+        sync_options = get_pool_options(database_url, PoolStatistics())
+        async_options = get_pool_options(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", PoolStatistics(), is_async=True)
+
+        # Assert
+        assert (sync_options["pool_size"], sync_options["max_overflow"]) == (1, 0)
+        assert (async_options["pool_size"], async_options["max_overflow"]) == resolve_pool_limits()
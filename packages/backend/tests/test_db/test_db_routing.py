@@ -0,0 +1,139 @@
+from typing import AsyncIterator, Tuple
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.side_quest_py.database import Base
+from src.side_quest_py.db_routing import ReadYourWritesTracker, RoutingSession
+from src.side_quest_py.models.db_models import Adventurer
+
+
+@pytest.fixture
+async def engines(tmp_path) -> AsyncIterator[Tuple[AsyncEngine, AsyncEngine]]:
+    """Two SQLite databases standing in for the primary and the replica"""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    yield primary, replica
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.fixture
+def routing_session_factory(engines: Tuple[AsyncEngine, AsyncEngine]) -> async_sessionmaker:
+    """Session factory that routes read-only SELECTs to the replica"""
+    primary, replica = engines
+    return async_sessionmaker(
+        bind=primary,
+        sync_session_class=RoutingSession,
+        replica_bind=replica.sync_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+async def _find_adventurer(factory: async_sessionmaker, read_only: bool, user_id: str = "reader") -> bool:
+    """Look up the test adventurer and return whether it was found"""
+    async with factory() as session:
+        session.info["read_only"] = read_only
+        session.info["user_id"] = user_id
+        result = await session.execute(select(Adventurer).filter_by(id="adventurer_1"))
+        return result.scalars().first() is not None
+
+
+class TestRoutingSession:
+    async def test_routes_reads_by_request_type(self, routing_session_factory: async_sessionmaker) -> None:
+        """Test that read-only sessions read from the replica and others from the primary"""
+        # Arrange - the write has not reached the replica yet
+        async with routing_session_factory() as session:
+            session.add(Adventurer(id="adventurer_1", name="Aragorn", user_id="writer"))
+            await session.commit()
+
+        # Act & Assert
+        assert await _find_adventurer(routing_session_factory, read_only=True) is False
+        assert await _find_adventurer(routing_session_factory, read_only=False) is True
+
+    async def test_writer_reads_own_writes(self, routing_session_factory: async_sessionmaker) -> None:
+        """Test that a user who just wrote keeps reading from the primary"""
+        # Arrange
+        async with routing_session_factory() as session:
+            session.info["user_id"] = "writer"
+            session.add(Adventurer(id="adventurer_1", name="Aragorn", user_id="writer"))
+            await session.commit()
+
+        # Act & Assert
+        assert await _find_adventurer(routing_session_factory, read_only=True, user_id="writer") is True
+        assert await _find_adventurer(routing_session_factory, read_only=True, user_id="someone_else") is False
+
+
+class TestReadYourWritesTracker:
+    def test_pin_expires_after_window(self, tmp_path) -> None:
+        """Test that a pin only lasts for the configured window"""
+        # Arrange
+        tracker = ReadYourWritesTracker(str(tmp_path / "pins"), slots=64, window_seconds=0)
+
+        # Act
+        tracker.pin("user_1")
+
+        # Assert
+        assert tracker.is_pinned("user_1") is False
+        assert tracker.is_pinned(None) is False
+
+    def test_pin_within_window(self, tmp_path) -> None:
+        """Test that a pinned user stays pinned inside the window"""
+        # Arrange
+        tracker = ReadYourWritesTracker(str(tmp_path / "pins"), slots=64, window_seconds=60)
+
+        # Act
+        tracker.pin("user_1")
+
+        # Assert
+        assert tracker.is_pinned("user_1") is True
+        assert tracker.is_pinned("user_2") is False
+
+    def test_pin_is_seen_by_other_workers(self, tmp_path) -> None:
+        """Test that a pin made by one worker keeps the user on the primary in another worker"""
+        # Arrange
+        writer = ReadYourWritesTracker(str(tmp_path / "pins"), slots=64, window_seconds=60)
+        reader = ReadYourWritesTracker(str(tmp_path / "pins"), slots=64, window_seconds=60)
+        assert reader.is_pinned("user_1") is False
+
+        # Act
+        writer.pin("user_1")
+
+        # Assert
+        assert reader.is_pinned("user_1") is True
+        assert reader.is_pinned("user_2") is False
+
+    def test_expired_pins_free_their_slots(self, tmp_path) -> None:
+        """Test that expired pins are reused, so a small table never overflows"""
+        # Arrange
+        tracker = ReadYourWritesTracker(str(tmp_path / "pins"), slots=4, window_seconds=0)
+
+        # Act
+        for i in range(100):
+            tracker.pin(f"user_{i}")
+
+        # Assert
+        assert tracker.overflowed is False
+
+    def test_overflow_keeps_everyone_on_the_primary_for_a_window(self, tmp_path) -> None:
+        """Test that a pin dropped for lack of slots pins every unknown user until the window passes"""
+        # Arrange
+        tracker = ReadYourWritesTracker(str(tmp_path / "pins"), slots=4, window_seconds=60)
+        for i in range(5):
+            tracker.pin(f"user_{i}")
+
+        # Act
+        pinned = tracker.is_pinned("user_never_wrote")
+        tracker.window_seconds = 0
+
+        # Assert
+        assert tracker.overflowed is True
+        assert pinned is True
+        assert tracker.is_pinned("user_never_wrote") is False
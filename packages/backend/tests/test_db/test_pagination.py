@@ -0,0 +1,46 @@
+from typing import List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.side_quest_py.services.adventurer_service import AdventurerService
+from src.side_quest_py.services.quest_service import QuestService
+
+
+class TestKeysetQueries:
+    async def test_quest_rows_resume_after_the_last_id(self, db_session: AsyncSession) -> None:
+        """Test that each keyset page starts right after the previous page's last ID, in ID order"""
+        # Arrange
+        adventurer = await AdventurerService(db=db_session).create_adventurer(name="Aragorn", user_id="test_user_id")
+        quest_service = QuestService(db=db_session)
+        created: List[str] = []
+        for i in range(7):
+            quest = await quest_service.create_quest(
+                title=f"Quest {i}", adventurer_id=str(adventurer.id), experience_reward=10
+            )
+            created.append(str(quest.id))
+
+        # Act
+        first = await quest_service.get_all_quest_rows(str(adventurer.id), limit=3)
+        second = await quest_service.get_all_quest_rows(str(adventurer.id), limit=3, after=first[-1]["id"])
+        rest = await quest_service.get_all_quest_rows(str(adventurer.id), after=second[-1]["id"])
+
+        # Assert
+        assert [row["id"] for row in first + second + rest] == sorted(created)
+        assert (len(first), len(second), len(rest)) == (3, 3, 1)
+
+    async def test_adventurer_rows_only_page_the_users_adventurers(self, db_session: AsyncSession) -> None:
+        """Test that a keyset page of adventurers skips other users' adventurers between the user's IDs"""
+        # Arrange
+        adventurer_service = AdventurerService(db=db_session)
+        own: List[str] = []
+        for i in range(4):
+            adventurer = await adventurer_service.create_adventurer(name=f"Hobbit {i}", user_id="test_user_id")
+            own.append(str(adventurer.id))
+            await adventurer_service.create_adventurer(name=f"Orc {i}", user_id="other_user_id")
+
+        # Act
+        first = await adventurer_service.get_all_adventurer_rows("test_user_id", limit=2)
+        rest = await adventurer_service.get_all_adventurer_rows("test_user_id", limit=2, after=first[-1]["id"])
+
+        # Assert
+        assert [row["id"] for row in first + rest] == sorted(own)
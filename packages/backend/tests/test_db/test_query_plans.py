@@ -0,0 +1,194 @@
+"""
+Query-plan regression tests for the hot lookups.
+
+Each test runs a real service method against a large seeded dataset, captures
+the SQL it emits and runs EXPLAIN on every statement. A test fails if any
+statement falls back to a full table scan.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.side_quest_py.models.db_models import Adventurer, Quest, QuestCompletion, User
+from src.side_quest_py.services.adventurer_service import AdventurerService
+from src.side_quest_py.services.quest_completion_service import QuestCompletionService
+from src.side_quest_py.services.quest_service import QuestService
+from src.side_quest_py.tasks import email_tasks
+
+pytestmark = pytest.mark.slow
+
+USERS = 20
+ADVENTURERS_PER_USER = 50
+QUESTS_PER_ADVENTURER = 40
+
+
+@pytest.fixture
+async def seeded_engine(db_engine: AsyncEngine) -> AsyncEngine:
+    """Seed the test database with a large dataset and gather planner statistics"""
+    now = datetime.now()
+    users: List[Dict[str, Any]] = []
+    adventurers: List[Dict[str, Any]] = []
+    quests: List[Dict[str, Any]] = []
+    completions: List[Dict[str, Any]] = []
+
+    for u in range(USERS):
+        user_id = f"user_{u:04d}"
+        users.append({"id": user_id, "username": user_id, "email": f"{user_id}@example.com", "password_hash": "x"})
+        for a in range(ADVENTURERS_PER_USER):
+            adventurer_id = f"{user_id}_adventurer_{a:04d}"
+            adventurers.append({"id": adventurer_id, "name": adventurer_id, "user_id": user_id})
+            for q in range(QUESTS_PER_ADVENTURER):
+                quest_id = f"{adventurer_id}_quest_{q:04d}"
+                completed = q % 10 != 0
+                quests.append(
+                    {"id": quest_id, "adventurer_id": adventurer_id, "title": quest_id, "completed": completed}
+                )
+                if completed:
+                    completions.append(
+                        {
+                            "id": f"{quest_id}_completion",
+                            "quest_id": quest_id,
+                            "adventurer_id": adventurer_id,
+                            "created_at": now - timedelta(minutes=len(completions)),
+                        }
+                    )
+
+    async with db_engine.begin() as conn:
+        await conn.execute(insert(User), users)
+        await conn.execute(insert(Adventurer), adventurers)
+        await conn.execute(insert(Quest), quests)
+        await conn.execute(insert(QuestCompletion), completions)
+        await conn.execute(text("ANALYZE"))
+
+    return db_engine
+
+
+@contextmanager
+def _capture_statements(engine: Engine) -> Iterator[List[Tuple[str, Any]]]:
+    """Collect the SELECT/UPDATE/DELETE statements an engine sends to the database"""
+    captured: List[Tuple[str, Any]] = []
+
+    def capture(_conn: Any, _cursor: Any, statement: str, parameters: Any, _context: Any, _many: bool) -> None:
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def _full_scans(dialect_name: str, plan: List[Dict[str, Any]], allow_sort: bool) -> List[str]:
+    """Return the plan steps that read a whole table, or sort the result when allow_sort is False"""
+    if dialect_name == "sqlite":
+        # Index lookups read "SEARCH <table> USING INDEX ...", full scans read "SCAN <table>"
+        return [
+            step["detail"]
+            for step in plan
+            if step["detail"].startswith("SCAN ") or (not allow_sort and "TEMP B-TREE" in step["detail"])
+        ]
+    # MySQL / MariaDB access type ALL is a full table scan
+    return [
+        f"{step['table']}: {step}"
+        for step in plan
+        if step["type"] == "ALL" or (not allow_sort and "filesort" in (step.get("Extra") or ""))
+    ]
+
+
+async def _assert_no_full_scans(engine: AsyncEngine, captured: List[Tuple[str, Any]], allow_sort: bool = True) -> None:
+    """EXPLAIN every captured statement and fail on full table scans"""
+    assert captured, "the query did not reach the database"
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            plan = [dict(step) for step in result.mappings()]
+            assert not _full_scans(engine.dialect.name, plan, allow_sort), f"full table scan in {statement!r}: {plan}"
+
+
+class TestHotQueryPlans:
+    async def test_get_all_adventurers(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """get_all_adventurers must search adventurers by user"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await AdventurerService(db=db_session).get_all_adventurers("user_0007")
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_get_all_quests(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """get_all_quests must search quests by adventurer"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await QuestService(db=db_session).get_all_quests("user_0007_adventurer_0003")
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_get_all_adventurers_page(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """A later adventurer page must seek by user and ID without sorting"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await AdventurerService(db=db_session).get_all_adventurer_rows(
+                "user_0007", limit=11, after="user_0007_adventurer_0030"
+            )
+        await _assert_no_full_scans(seeded_engine, captured, allow_sort=False)
+
+    async def test_get_all_quests_page(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """A later quest page must seek by adventurer and ID without sorting"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await QuestService(db=db_session).get_all_quest_rows(
+                "user_0007_adventurer_0003", limit=11, after="user_0007_adventurer_0003_quest_0020"
+            )
+        await _assert_no_full_scans(seeded_engine, captured, allow_sort=False)
+
+    async def test_list_etag_versions(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """The list ETag aggregates must search adventurers by user and quests by adventurer"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await AdventurerService(db=db_session).get_adventurers_version("user_0007")
+            await QuestService(db=db_session).get_quests_version("user_0007_adventurer_0003")
+            await AdventurerService(db=db_session).get_adventurer_updated_at("user_0007_adventurer_0003")
+        await _assert_no_full_scans(seeded_engine, captured, allow_sort=False)
+
+    async def test_embedded_relations(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """Embedded quests and completions must search by adventurer, and their versions by user"""
+        adventurer_ids = [f"user_0007_adventurer_{a:04d}" for a in range(10)]
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await QuestService(db=db_session).get_quest_rows_by_adventurer(adventurer_ids)
+            await QuestService(db=db_session).get_user_quests_version("user_0007")
+            await QuestCompletionService(db=db_session).get_completion_rows_by_adventurer(adventurer_ids)
+            await QuestCompletionService(db=db_session).get_completions_version("user_0007_adventurer_0003")
+            await QuestCompletionService(db=db_session).get_user_completions_version("user_0007")
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_get_uncompleted_quests(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """get_uncompleted_quests must search quests by completion state"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await QuestService(db=db_session).get_uncompleted_quests()
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_get_quest_completion(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """get_quest_completion must search completions by quest"""
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await QuestCompletionService(db=db_session).get_quest_completion("user_0007_adventurer_0003_quest_0005")
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_delete_quest_completion(self, seeded_engine: AsyncEngine, db_session: AsyncSession) -> None:
+        """delete_quest_completion must find and delete the completion without scanning"""
+        service = QuestCompletionService(db=db_session)
+        with _capture_statements(seeded_engine.sync_engine) as captured:
+            await service.delete_quest_completion("user_0007_adventurer_0003_quest_0005")
+        await _assert_no_full_scans(seeded_engine, captured)
+
+    async def test_send_daily_recap_emails(self, seeded_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The daily recap must search completions by created_at range"""
+        sync_engine = create_engine(seeded_engine.url.set(drivername="sqlite"))
+        monkeypatch.setattr(email_tasks, "SessionLocal", sessionmaker(bind=sync_engine))
+        monkeypatch.setattr(email_tasks, "send_user_daily_recap", lambda *args, **kwargs: None)
+
+        with _capture_statements(sync_engine) as captured:
+            email_tasks.send_daily_recap_emails()
+        sync_engine.dispose()
+
+        await _assert_no_full_scans(seeded_engine, captured)
@@ -8,7 +8,9 @@ from src.side_quest_py.models.adventurer import (
     AdventurerLevelError,
     AdventurerQuestError,
     AdventurerValidationError,
+    ExponentialLevelCurve,
     LevelCalculator,
+    TableLevelCurve,
 )
 from src.side_quest_py.models.user import User
 
@@ -127,3 +129,76 @@ class TestLevelCalculator:
         with pytest.raises(AdventurerExperienceError) as exc_info:
             calculator.has_leveled_up(5, -100)
         assert "Experience cannot be negative" in str(exc_info.value)
+
+    def test_resolve(self, calculator: LevelCalculator) -> None:
+        """Test that a total experience resolves to its level and the experience left within it"""
+        # Arrange is handled by fixture
+
+        # Assert
+        assert calculator.resolve(0) == (1, 0)
+        assert calculator.resolve(99) == (1, 99)
+        assert calculator.resolve(100) == (2, 0)
+        assert calculator.resolve(450) == (3, 150)
+
+    def test_resolve_past_max_level(self) -> None:
+        """Test that experience past the highest level keeps accumulating at that level"""
+        # Arrange
+        calculator = LevelCalculator(max_level=3)
+
+        # Act & Assert
+        assert calculator.resolve(1000) == (3, 700)
+
+    def test_resolve_many(self, calculator: LevelCalculator) -> None:
+        """Test that resolve_many matches resolve for every total"""
+        # Arrange
+        totals = list(range(0, 50_000, 7))
+
+        # Act
+        resolved = calculator.resolve_many(totals)
+
+        # Assert
+        assert resolved == [calculator.resolve(total) for total in totals]
+
+    def test_resolve_negative_experience(self, calculator: LevelCalculator) -> None:
+        """Test that resolving negative experience raises AdventurerExperienceError"""
+        # Act & Assert
+        with pytest.raises(AdventurerExperienceError):
+            calculator.resolve_many([10, -1])
+
+    def test_apply_gain(self, calculator: LevelCalculator) -> None:
+        """Test that a gain keeps its overflow when it covers several levels"""
+        # Arrange is handled by fixture
+
+        # Assert
+        assert calculator.apply_gain(1, 50, 30) == (1, 80)
+        assert calculator.apply_gain(2, 150, 500) == (4, 150)
+
+    def test_apply_gain_past_max_level(self, calculator: LevelCalculator) -> None:
+        """Test that an adventurer already past the highest level keeps its level and accumulates experience"""
+        # Act & Assert
+        assert calculator.apply_gain(150, 10, 500) == (150, 510)
+        assert calculator.total_experience(150, 10) == calculator.total_experience(calculator.max_level, 10)
+
+    def test_exponential_curve(self) -> None:
+        """Test that the exponential curve multiplies the requirement at each level"""
+        # Arrange
+        calculator = LevelCalculator(ExponentialLevelCurve(base_exp=100, growth=2))
+
+        # Assert
+        assert [calculator.calculate_req_exp(level) for level in (1, 2, 3)] == [100, 200, 400]
+        assert calculator.resolve(750) == (4, 50)
+
+    def test_table_curve(self) -> None:
+        """Test that the table curve reads its requirements and repeats the last one"""
+        # Arrange
+        calculator = LevelCalculator(TableLevelCurve((50, 75, 125)))
+
+        # Assert
+        assert [calculator.calculate_req_exp(level) for level in (1, 3, 10)] == [50, 125, 125]
+        assert calculator.resolve(300) == (4, 50)
+
+    def test_table_curve_invalid(self) -> None:
+        """Test that a curve requiring no experience for a level raises AdventurerLevelError"""
+        # Act & Assert
+        with pytest.raises(AdventurerLevelError):
+            LevelCalculator(TableLevelCurve((50, 0)))
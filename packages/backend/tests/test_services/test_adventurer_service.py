@@ -0,0 +1,171 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.side_quest_py.models.adventurer import AdventurerNotFoundError, AdventurerValidationError
+from src.side_quest_py.services import adventurer_service as adventurer_service_module
+from src.side_quest_py.services.adventurer_service import AdventurerService
+
+
+class FakeLevelUpEmail:
+    """Records level-up emails instead of queueing them"""
+
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    def delay(self, **kwargs: Any) -> None:
+        self.calls.append(kwargs)
+
+
+@pytest.fixture
+def level_up_emails(monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    """Returns the level-up emails queued during the test"""
+    fake = FakeLevelUpEmail()
+    monkeypatch.setattr(adventurer_service_module, "send_level_up_email", fake)
+    return fake.calls
+
+
+@pytest.fixture
+def adventurer_service(db_session: AsyncSession) -> AdventurerService:
+    """Returns an adventurer service bound to the test database"""
+    return AdventurerService(db=db_session)
+
+
+class TestAdventurerService:
+    async def test_create_and_get_adventurer(self, adventurer_service: AdventurerService) -> None:
+        """Test that a created adventurer can be read back through the async session"""
+        # Act
+        created = await adventurer_service.create_adventurer(name="Aragorn", user_id="test_user_id")
+        fetched = await adventurer_service.get_adventurer_by_id(str(created.id))
+
+        # Assert
+        assert fetched is not None
+        assert fetched.name == "Aragorn"
+        assert fetched.level == 1
+
+    async def test_get_all_adventurers_filters_by_user(self, adventurer_service: AdventurerService) -> None:
+        """Test that only the user's own adventurers are returned"""
+        # Arrange
+        await adventurer_service.create_adventurer(name="Frodo", user_id="user_a")
+        await adventurer_service.create_adventurer(name="Gandalf", user_id="user_b")
+
+        # Act
+        adventurers = await adventurer_service.get_all_adventurers("user_a")
+
+        # Assert
+        assert [adventurer.name for adventurer in adventurers] == ["Frodo"]
+
+    async def test_adventurer_rows_match_adventurer_to_dict(
+        self, adventurer_service: AdventurerService, db_session: AsyncSession
+    ) -> None:
+        """Test that the ORM-free read path returns what adventurer_to_dict does, without loading objects"""
+        # Arrange
+        created = await adventurer_service.create_adventurer(name="Frodo", user_id="user_a")
+        expected = adventurer_service.adventurer_to_dict(created)
+        db_session.expunge_all()
+
+        # Act
+        rows = await adventurer_service.get_all_adventurer_rows("user_a")
+
+        # Assert
+        assert [dict(row) for row in rows] == [expected]
+        assert len(db_session.identity_map) == 0
+
+    async def test_delete_adventurer(self, adventurer_service: AdventurerService) -> None:
+        """Test that a deleted adventurer can no longer be found"""
+        # Arrange
+        created = await adventurer_service.create_adventurer(name="Bob", user_id="test_user_id")
+
+        # Act
+        deleted = await adventurer_service.delete_adventurer(str(created.id))
+
+        # Assert
+        assert deleted is True
+        assert await adventurer_service.get_adventurer_by_id(str(created.id)) is None
+
+    async def test_gain_experience_negative(self, adventurer_service: AdventurerService) -> None:
+        """Test that a negative experience gain raises AdventurerValidationError"""
+        # Arrange
+        created = await adventurer_service.create_adventurer(name="Scarlett", user_id="test_user_id")
+
+        # Act & Assert
+        with pytest.raises(AdventurerValidationError):
+            await adventurer_service.gain_experience(str(created.id), -10)
+
+    async def test_gain_experience_unknown_adventurer(self, adventurer_service: AdventurerService) -> None:
+        """Test that gaining experience for a missing adventurer raises AdventurerNotFoundError"""
+        # Act & Assert
+        with pytest.raises(AdventurerNotFoundError):
+            await adventurer_service.gain_experience("missing_id", 10)
+
+    async def test_gain_experience_levels_up(
+        self, adventurer_service: AdventurerService, level_up_emails: List[Dict[str, Any]]
+    ) -> None:
+        """Test that reaching the required experience levels up and resets the experience"""
+        # Arrange
+        created = await adventurer_service.create_adventurer(name="Legolas", user_id="test_user_id", experience=60)
+
+        # Act
+        adventurer = await adventurer_service.gain_experience(str(created.id), 40)
+
+        # Assert
+        assert adventurer is not None
+        assert (adventurer.level, adventurer.experience, adventurer.leveled_up) == (2, 0, True)
+        assert level_up_emails == [{"adventurer_id": str(created.id), "old_level": 1, "new_level": 2}]
+
+    async def test_gain_experience_carries_overflow_across_levels(
+        self, adventurer_service: AdventurerService, level_up_emails: List[Dict[str, Any]]
+    ) -> None:
+        """Test that a large gain covers several levels and keeps the leftover experience"""
+        # Arrange
+        created = await adventurer_service.create_adventurer(name="Faramir", user_id="test_user_id")
+
+        # Act - 100 XP reaches level 2, 200 more reaches level 3, 150 is left over
+        adventurer = await adventurer_service.gain_experience(str(created.id), 450)
+
+        # Assert
+        assert adventurer is not None
+        assert (adventurer.level, adventurer.experience) == (3, 150)
+        assert level_up_emails == [{"adventurer_id": str(created.id), "old_level": 1, "new_level": 3}]
+
+    async def test_gain_experience_without_returning(
+        self, adventurer_service: AdventurerService, db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that dialects without UPDATE ... RETURNING read the updated row back"""
+        # Arrange
+        monkeypatch.setattr(db_engine.sync_engine.dialect, "update_returning", False)
+        created = await adventurer_service.create_adventurer(name="Gimli", user_id="test_user_id")
+
+        # Act
+        adventurer = await adventurer_service.gain_experience(str(created.id), 30)
+
+        # Assert
+        assert adventurer is not None
+        assert (adventurer.level, adventurer.experience) == (1, 30)
+        with pytest.raises(AdventurerNotFoundError):
+            await adventurer_service.gain_experience("missing_id", 10)
+
+    async def test_concurrent_gains_are_not_lost(
+        self,
+        adventurer_service: AdventurerService,
+        session_factory: async_sessionmaker,
+        level_up_emails: List[Dict[str, Any]],
+    ) -> None:
+        """Test that parallel gains for one adventurer from separate sessions all count"""
+        # Arrange - 35 grants of 10 XP: 10 reach level 2, 20 more reach level 3, 5 are left over
+        created = await adventurer_service.create_adventurer(name="Boromir", user_id="test_user_id")
+
+        async def grant() -> None:
+            async with session_factory() as db:
+                await AdventurerService(db=db).gain_experience(str(created.id), 10)
+
+        # Act
+        await asyncio.gather(*(grant() for _ in range(35)))
+
+        # Assert
+        adventurer = await adventurer_service.get_adventurer_by_id(str(created.id))
+        await adventurer_service.db.refresh(adventurer)
+        assert (adventurer.level, adventurer.experience) == (3, 50)
+        assert [(email["old_level"], email["new_level"]) for email in level_up_emails] == [(1, 2), (2, 3)]
@@ -0,0 +1,702 @@
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.side_quest_py.api.config import settings
+from src.side_quest_py.login_throttle import (
+    LoginThrottle,
+    LoginThrottledError,
+    MemoryCounters,
+    SharedCounters,
+    login_throttle,
+)
+from src.side_quest_py.models.db_models import User
+from src.side_quest_py.password_hasher import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    build_password_context,
+    password_hasher,
+)
+from src.side_quest_py.principal_cache import Principal, PrincipalCache, principal_cache
+from src.side_quest_py.services.auth_service import AuthService, decode_access_token
+from src.side_quest_py.token_versions import TokenVersionTable, token_versions
+
+# The package re-exports the hasher instance under the module's name
+password_hasher_module = importlib.import_module("src.side_quest_py.password_hasher")
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> List[str]:
+    """Records every statement sent to the test database"""
+    recorded: List[str] = []
+
+    def on_execute(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        recorded.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", on_execute)
+    yield recorded
+    event.remove(db_engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture
+async def token(db_session: AsyncSession) -> str:
+    """Register a user and return a token for it"""
+    auth_service = AuthService(db=db_session)
+    await auth_service.register_user(username="frodo", email="frodo@example.com", password="password123")
+    return await auth_service.authenticate_user(username="frodo", password="password123")
+
+
+class TestVerifyTokenCache:
+    async def test_cache_hit_skips_database(self, db_session: AsyncSession, token: str, statements: List[str]) -> None:
+        """Test that verifying the same token twice queries the database only once"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        statements.clear()
+
+        # Act
+        first = await auth_service.verify_token(token)
+        queries_after_miss = len(statements)
+        second = await auth_service.verify_token(token)
+
+        # Assert
+        assert first == second
+        assert first is not None and first.username == "frodo"
+        assert queries_after_miss == 1
+        assert len(statements) == 1
+        assert (principal_cache.hits, principal_cache.misses) == (1, 1)
+        assert db_session.info["user_id"] == first.id
+
+    async def test_logout_invalidates_cached_principal(self, db_session: AsyncSession, token: str) -> None:
+        """Test that logging out drops the user's cached tokens"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+
+        # Act
+        await auth_service.logout_user(principal.id)
+
+        # Assert
+        assert principal_cache.get(token) is None
+        assert principal_cache.invalidations == 1
+
+    async def test_invalid_token_is_not_cached(self, db_session: AsyncSession) -> None:
+        """Test that an invalid token resolves to None and is never cached"""
+        # Act
+        result = await AuthService(db=db_session).verify_token("not-a-token")
+
+        # Assert
+        assert result is None
+        assert principal_cache.to_dict()["size"] == 0
+
+
+class TestPrincipalCache:
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted once the cache is full"""
+        # Arrange
+        cache = PrincipalCache(max_size=2, ttl_seconds=60)
+        for name in ("a", "b"):
+            cache.put(name, Principal(id=name, username=name, email=f"{name}@example.com"), valid_for=60)
+        cache.get("a")
+
+        # Act
+        cache.put("c", Principal(id="c", username="c", email="c@example.com"), valid_for=60)
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.evictions == 1
+
+    def test_ttl_never_outlives_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that an entry expires with its token even when the cache TTL is longer"""
+        # Arrange
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        now = time.monotonic()
+        cache.put("token", Principal(id="u", username="u", email="u@example.com"), valid_for=5)
+
+        # Act
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+
+        # Assert
+        assert cache.get("token") is None
+
+    def test_expired_token_is_not_cached(self) -> None:
+        """Test that a token with no validity left is not cached"""
+        # Arrange
+        cache = PrincipalCache(max_size=10, ttl_seconds=60)
+
+        # Act
+        cache.put("token", Principal(id="u", username="u", email="u@example.com"), valid_for=-1)
+
+        # Assert
+        assert cache.to_dict()["size"] == 0
+
+
+class TestTokenVersions:
+    async def test_logout_revokes_token_cached_in_another_worker(
+        self, db_session: AsyncSession, token: str, statements: List[str]
+    ) -> None:
+        """Test that a token cached before logout is rejected without a query once another worker logs out"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+        # Another worker's logout reaches this one only through the shared table
+        other_worker = TokenVersionTable(token_versions.path, token_versions.slots)
+        other_worker.record(principal.id, principal.token_version + 1)
+        other_worker.close()
+        statements.clear()
+
+        # Act
+        result = await auth_service.verify_token(token)
+
+        # Assert
+        assert result is None
+        assert statements == []
+
+    async def test_logout_bumps_version_and_new_login_works(self, db_session: AsyncSession, token: str) -> None:
+        """Test that logout revokes the old token while a token issued afterwards is accepted"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+
+        # Act
+        await auth_service.logout_user(principal.id)
+        new_token = await auth_service.authenticate_user(username="frodo", password="password123")
+
+        # Assert
+        assert await auth_service.verify_token(token) is None
+        new_principal = await auth_service.verify_token(new_token)
+        assert new_principal is not None and new_principal.token_version == 1
+        assert token_versions.current(principal.id) == 1
+
+    async def test_database_version_rejects_token_missing_from_table(
+        self, db_session: AsyncSession, token: str
+    ) -> None:
+        """Test that the database version still revokes tokens on a host whose table never saw the bump"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+        await auth_service.logout_user(principal.id)
+        token_versions.close()
+        token_versions.path = token_versions.path + ".other-host"
+        principal_cache.clear()
+
+        # Act
+        result = await auth_service.verify_token(token)
+
+        # Assert
+        assert result is None
+
+    async def test_legacy_token_without_version_is_revoked_by_logout(
+        self, db_session: AsyncSession, token: str
+    ) -> None:
+        """Test that a token issued without a ver claim stops working after the user logs out"""
+        # Arrange
+        auth_service = AuthService(db=db_session)
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+        legacy_token = auth_service.create_access_token(data={"sub": principal.id})
+        assert await auth_service.verify_token(legacy_token) is not None
+
+        # Act
+        await auth_service.logout_user(principal.id)
+
+        # Assert
+        assert await auth_service.verify_token(legacy_token) is None
+
+
+class TestTokenVersionTable:
+    def test_versions_are_shared_and_never_decrease(self, tmp_path) -> None:
+        """Test that a version recorded through one mapping is read through another and never goes back"""
+        # Arrange
+        path = str(tmp_path / "versions")
+        writer = TokenVersionTable(path, slots=64)
+        reader = TokenVersionTable(path, slots=64)
+
+        # Act
+        writer.record("user-1", 3)
+        writer.record("user-1", 2)
+
+        # Assert
+        assert reader.current("user-1") == 3
+        assert reader.current("user-2") == 0
+        writer.close()
+        reader.close()
+
+    def test_full_table_reports_unknown(self, tmp_path) -> None:
+        """Test that once a user cannot be recorded, unrecorded users are reported as unknown"""
+        # Arrange
+        table = TokenVersionTable(str(tmp_path / "versions"), slots=4)
+
+        # Act
+        for i in range(5):
+            table.record(f"user-{i}", 1)
+
+        # Assert
+        recorded = [table.current(f"user-{i}") for i in range(5)]
+        assert recorded.count(1) == 4
+        assert recorded.count(None) == 1
+        assert table.to_dict()["overflowing"] is True
+        table.close()
+
+    def test_expired_versions_free_their_slots(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that versions older than a token lifetime are reused and a past overflow stops mattering"""
+        # Arrange
+        table = TokenVersionTable(str(tmp_path / "versions"), slots=4, retention_seconds=60)
+        for i in range(5):
+            table.record(f"user-{i}", 1)
+        later = time.time() + 3600
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        # Act
+        for i in range(5, 9):
+            table.record(f"user-{i}", 2)
+
+        # Assert
+        assert [table.current(f"user-{i}") for i in range(5, 9)] == [2, 2, 2, 2]
+        assert table.current("user-never-recorded") == 0
+        assert table.to_dict()["overflowing"] is False
+        table.close()
+
+
+class TestPasswordHasher:
+    async def test_hashing_does_not_block_event_loop(self) -> None:
+        """Test that the event loop keeps running while a slow hash is in progress"""
+        # Arrange
+        hasher = PasswordHasher(max_workers=1, max_queue=4)
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        # Act
+        await asyncio.gather(hasher._run(time.sleep, 0.3), tick())
+
+        # Assert
+        assert ticks == 10
+        assert hasher.to_dict()["completed"] == 1
+
+    async def test_queue_bound_rejects_and_metrics_track_waits(self) -> None:
+        """Test that calls beyond the queue bound are rejected and queue depth is recorded"""
+        # Arrange
+        hasher = PasswordHasher(max_workers=1, max_queue=1)
+        release = threading.Event()
+        first = asyncio.ensure_future(hasher._run(release.wait))
+        while hasher.running == 0:
+            await asyncio.sleep(0.001)
+        second = asyncio.ensure_future(hasher._run(lambda: True))
+        await asyncio.sleep(0)
+
+        # Act
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher._run(lambda: True)
+        release.set()
+        await asyncio.gather(first, second)
+
+        # Assert
+        stats = hasher.to_dict()
+        assert stats["rejected"] == 1
+        assert stats["max_queue_depth"] == 1
+        assert stats["completed"] == 2
+        assert stats["queued"] == 0 and stats["running"] == 0
+        assert stats["max_wait_ms"] > 0
+
+    async def test_full_queue_turns_login_away(
+        self, db_session: AsyncSession, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a login is answered with 503 and Retry-After while the hasher queue is full"""
+        # Arrange
+        monkeypatch.setattr(password_hasher, "max_queue", 0)
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await AuthService(db=db_session).authenticate_user(username="frodo", password="password123")
+
+        # Assert
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+
+
+class TestPasswordRehash:
+    async def test_login_rehashes_password_at_configured_cost(
+        self, db_session: AsyncSession, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a hash with another work factor is replaced on a successful login"""
+        # Arrange
+        user = await AuthService(db=db_session).get_user_by_username("frodo")
+        assert user is not None
+        old_hash = str(user.password_hash)
+        monkeypatch.setattr(password_hasher_module, "pwd_context", build_password_context("bcrypt", 5, 1024, 1, 1))
+
+        # Act
+        await AuthService(db=db_session).authenticate_user(username="frodo", password="password123")
+
+        # Assert
+        stored = await db_session.get(User, user.id, populate_existing=True)
+        assert stored is not None and stored.password_hash != old_hash
+        assert str(stored.password_hash).startswith("$2b$05$")
+        assert password_hasher.rehashed >= 1
+
+    async def test_login_migrates_bcrypt_hash_to_argon2(
+        self, db_session: AsyncSession, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that switching the scheme to argon2id rehashes on login and the new hash verifies"""
+        # Arrange
+        pytest.importorskip("argon2")
+        monkeypatch.setattr(password_hasher_module, "pwd_context", build_password_context("argon2", 12, 1024, 1, 1))
+        auth_service = AuthService(db=db_session)
+
+        # Act
+        await auth_service.authenticate_user(username="frodo", password="password123")
+        new_token = await auth_service.authenticate_user(username="frodo", password="password123")
+
+        # Assert
+        user = await auth_service.get_user_by_username("frodo")
+        assert user is not None and str(user.password_hash).startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+        assert await auth_service.verify_token(new_token) is not None
+
+    def test_unknown_scheme_is_rejected(self) -> None:
+        """Test that an unknown hashing scheme fails at startup"""
+        # Act / Assert
+        with pytest.raises(ValueError):
+            build_password_context("md5", 12, 1024, 1, 1)
+
+
+class TestLoginThrottle:
+    async def test_rejects_after_failures_without_hashing(
+        self, db_session: AsyncSession, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that once a username reaches its failure limit, attempts are rejected before any hashing"""
+        # Arrange
+        monkeypatch.setattr(login_throttle, "max_per_username", 3)
+        auth_service = AuthService(db=db_session)
+        for _ in range(3):
+            with pytest.raises(HTTPException):
+                await auth_service.authenticate_user(username="frodo", password="wrong-password", client_ip="10.0.0.1")
+        hashes_before = password_hasher.completed
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.authenticate_user(username="frodo", password="password123", client_ip="10.0.0.2")
+
+        # Assert
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        assert password_hasher.completed == hashes_before
+        assert login_throttle.to_dict()["rejected_by_username"] == 1
+
+    async def test_success_clears_username_failures(
+        self, db_session: AsyncSession, token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a successful login resets the username's failure count"""
+        # Arrange
+        monkeypatch.setattr(login_throttle, "max_per_username", 2)
+        auth_service = AuthService(db=db_session)
+        with pytest.raises(HTTPException):
+            await auth_service.authenticate_user(username="frodo", password="wrong-password")
+        await auth_service.authenticate_user(username="frodo", password="password123")
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.authenticate_user(username="frodo", password="wrong-password")
+
+        # Assert
+        assert exc_info.value.status_code == 401
+
+    async def test_unknown_user_spends_a_verification(self, db_session: AsyncSession) -> None:
+        """Test that a login for an unknown username still runs one password verification"""
+        # Arrange
+        hashes_before = password_hasher.completed
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await AuthService(db=db_session).authenticate_user(username="nobody", password="password123")
+
+        # Assert
+        assert exc_info.value.status_code == 401
+        assert password_hasher.completed == hashes_before + 1
+        assert login_throttle.failures == 1
+
+    async def test_client_ip_limit_spans_usernames(self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that one client IP is throttled across usernames and the API answers 429"""
+        # Arrange
+        monkeypatch.setattr(login_throttle, "max_per_ip", 2)
+        for username in ("sam", "pippin"):
+            response = await client.post("/api/v1/auth/login", data={"username": username, "password": "password123"})
+            assert response.status_code == 401
+
+        # Act
+        response = await client.post("/api/v1/auth/login", data={"username": "merry", "password": "password123"})
+
+        # Assert
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        assert login_throttle.to_dict()["rejected_by_ip"] == 1
+
+    def test_sliding_window_forgets_old_failures(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that failures are weighted down as they slide out of the window"""
+        # Arrange
+        throttle = LoginThrottle(max_per_username=2, max_per_ip=100, window_seconds=60, counters=MemoryCounters(10))
+        monkeypatch.setattr(time, "time", lambda: 6000.0)
+        throttle.record_failure("frodo", None)
+        throttle.record_failure("frodo", None)
+        with pytest.raises(LoginThrottledError):
+            throttle.check("frodo", None)
+
+        # Act
+        monkeypatch.setattr(time, "time", lambda: 6090.0)
+
+        # Assert
+        throttle.check("frodo", None)
+
+    def test_shared_counters_are_seen_by_other_workers(self, tmp_path) -> None:
+        """Test that failures recorded by one worker's throttle block the same username in another"""
+        # Arrange
+        path = str(tmp_path / "login_throttle")
+        worker_a = LoginThrottle(2, 100, 60, SharedCounters(path, slots=64))
+        worker_b = LoginThrottle(2, 100, 60, SharedCounters(path, slots=64))
+
+        # Act
+        worker_a.record_failure("frodo", "10.0.0.1")
+        worker_a.record_failure("frodo", "10.0.0.1")
+
+        # Assert
+        with pytest.raises(LoginThrottledError):
+            worker_b.check("frodo", None)
+        worker_b.record_success("frodo")
+        worker_a.check("frodo", None)
+        worker_a.counters.close()
+        worker_b.counters.close()
+
+
+@pytest.fixture
+def checkouts(db_engine: AsyncEngine) -> List[Any]:
+    """Records every connection checked out of the test engine's pool"""
+    recorded: List[Any] = []
+
+    def on_checkout(dbapi_connection: Any, *_args: Any) -> None:
+        recorded.append(dbapi_connection)
+
+    event.listen(db_engine.sync_engine, "checkout", on_checkout)
+    yield recorded
+    event.remove(db_engine.sync_engine, "checkout", on_checkout)
+
+
+class TestBearerAuthMiddleware:
+    @pytest.mark.parametrize(
+        "headers",
+        [{}, {"Authorization": "Token abc"}, {"Authorization": "Bearer not-a-token"}],
+        ids=["missing", "malformed", "invalid"],
+    )
+    async def test_bad_token_rejected_without_database(
+        self, client: AsyncClient, checkouts: List[Any], headers: Dict[str, str]
+    ) -> None:
+        """Test that a request without a valid token gets 401 before any connection is checked out"""
+        # Act
+        response = await client.get("/api/v1/adventurers", headers=headers)
+
+        # Assert
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == "Bearer"
+        assert checkouts == []
+
+    async def test_cached_token_needs_no_database(
+        self, client: AsyncClient, auth_headers: Dict[str, str], checkouts: List[Any]
+    ) -> None:
+        """Test that a cached token reaches a route without a database dependency with no checkout"""
+        # Arrange
+        assert (await client.get("/api/v1/auth/me", headers=auth_headers)).status_code == 200
+        checkouts.clear()
+
+        # Act
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["username"] == "test_user"
+        assert checkouts == []
+
+    async def test_uncached_token_is_looked_up(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that a valid token missing from the cache is verified against the database"""
+        # Arrange
+        principal_cache.clear()
+
+        # Act
+        response = await client.get("/api/v1/adventurers", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert principal_cache.misses == 1
+
+    async def test_public_paths_and_preflight_pass_through(self, client: AsyncClient) -> None:
+        """Test that registration, non-API paths and CORS preflights need no token"""
+        # Act
+        register = await client.post(
+            "/api/v1/auth/register",
+            json={"username": "samwise", "email": "samwise@example.com", "password": "password123"},
+        )
+        hello = await client.get("/hello")
+        preflight = await client.options(
+            "/api/v1/adventurers",
+            headers={"Origin": "http://example.com", "Access-Control-Request-Method": "GET"},
+        )
+
+        # Assert
+        assert register.status_code == 201
+        assert hello.status_code == 200
+        assert preflight.status_code == 200
+
+    async def test_rejection_carries_cors_headers(self, client: AsyncClient) -> None:
+        """Test that a 401 from the middleware still passes through CORS"""
+        # Act
+        response = await client.get("/api/v1/adventurers", headers={"Origin": "http://example.com"})
+
+        # Assert
+        assert response.status_code == 401
+        assert "access-control-allow-origin" in response.headers
+
+
+class TestSlimTokens:
+    async def test_token_carries_only_id_and_version(self, db_session: AsyncSession, token: str) -> None:
+        """Test that the token identifies the user by ID and carries no profile claims"""
+        # Act
+        payload = decode_access_token(token)
+
+        # Assert
+        assert payload is not None
+        user = await AuthService(db=db_session).get_user_by_username("frodo")
+        assert user is not None
+        assert set(payload) == {"sub", "ver", "exp"}
+        assert payload["sub"] == str(user.id)
+
+    async def test_cache_miss_loads_only_principal_columns(
+        self, db_session: AsyncSession, token: str, statements: List[str]
+    ) -> None:
+        """Test that an uncached token is resolved by primary key without the password hash or stored token"""
+        # Arrange
+        principal_cache.clear()
+        statements.clear()
+
+        # Act
+        principal = await AuthService(db=db_session).verify_token(token)
+
+        # Assert
+        assert principal is not None
+        assert principal.username == "frodo"
+        assert len(statements) == 1
+        assert "users.id = ?" in statements[0]
+        assert "password_hash" not in statements[0]
+        assert "auth_token" not in statements[0]
+
+    async def test_stateless_mode_skips_lookup(
+        self,
+        client: AsyncClient,
+        auth_headers: Dict[str, str],
+        statements: List[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that a stateless principal reaches a route that needs only the user ID without a user lookup"""
+        # Arrange
+        monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+        principal_cache.clear()
+        statements.clear()
+
+        # Act
+        logout = await client.post("/api/v1/auth/logout", headers=auth_headers)
+        lookups = [statement for statement in statements if "FROM users" in statement]
+
+        # Assert
+        assert logout.status_code == 200
+        assert lookups == []
+
+    async def test_stateless_me_loads_profile(
+        self, client: AsyncClient, auth_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that /me loads the username and email of a principal accepted from its claims"""
+        # Arrange
+        monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+        principal_cache.clear()
+
+        # Act
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["username"] == "test_user"
+
+    async def test_stateless_mode_honours_revocation(
+        self, client: AsyncClient, auth_headers: Dict[str, str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a stateless token is rejected once its version is bumped in the host's table"""
+        # Arrange
+        monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+        payload = decode_access_token(auth_headers["Authorization"][len("Bearer ") :])
+        assert payload is not None
+        token_versions.record(payload["sub"], int(payload["ver"]) + 1)
+        principal_cache.clear()
+
+        # Act
+        response = await client.get("/api/v1/adventurers", headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 401
+
+
+class TestTokenPersistence:
+    async def test_login_writes_nothing_when_tokens_are_not_persisted(
+        self, db_session: AsyncSession, statements: List[str], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a login without token persistence only reads, and never loads the stored token columns"""
+        # Arrange
+        monkeypatch.setattr(settings, "AUTH_PERSIST_TOKENS", False)
+        auth_service = AuthService(db=db_session)
+        await auth_service.register_user(username="frodo", email="frodo@example.com", password="password123")
+        statements.clear()
+
+        # Act
+        token = await auth_service.authenticate_user(username="frodo", password="password123")
+
+        # Assert
+        assert await auth_service.verify_token(token) is not None
+        assert all(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+        assert not any("auth_token" in statement or "token_expiry" in statement for statement in statements)
+
+    async def test_logout_revokes_unpersisted_token(
+        self, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that logout still revokes a token that was never stored"""
+        # Arrange
+        monkeypatch.setattr(settings, "AUTH_PERSIST_TOKENS", False)
+        auth_service = AuthService(db=db_session)
+        await auth_service.register_user(username="frodo", email="frodo@example.com", password="password123")
+        token = await auth_service.authenticate_user(username="frodo", password="password123")
+        principal = await auth_service.verify_token(token)
+        assert principal is not None
+
+        # Act
+        await auth_service.logout_user(principal.id)
+
+        # Assert
+        assert await auth_service.verify_token(token) is None
+
+    async def test_persisted_token_is_stored(self, db_session: AsyncSession, token: str) -> None:
+        """Test that the issued token is still written to the users table by default"""
+        # Act
+        stored = await db_session.scalar(select(User.auth_token).where(User.username == "frodo"))
+
+        # Assert
+        assert stored == token
@@ -0,0 +1,354 @@
+from typing import Any, Dict, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.side_quest_py.models.db_models import Adventurer, Quest, QuestCompletion
+from src.side_quest_py.services import adventurer_service as adventurer_service_module
+from src.side_quest_py.services.adventurer_service import AdventurerService
+from src.side_quest_py.services.quest_service import QuestService
+from tests.test_services.test_adventurer_service import FakeLevelUpEmail
+
+
+@pytest.fixture
+def commits(db_engine: AsyncEngine) -> List[Any]:
+    """Records every COMMIT sent to the test database"""
+    recorded: List[Any] = []
+
+    def on_commit(conn: Any) -> None:
+        recorded.append(conn)
+
+    event.listen(db_engine.sync_engine, "commit", on_commit)
+    yield recorded
+    event.remove(db_engine.sync_engine, "commit", on_commit)
+
+
+@pytest.fixture
+def statements(db_engine: AsyncEngine) -> List[str]:
+    """Records every statement sent to the test database"""
+    recorded: List[str] = []
+
+    def on_execute(_conn: Any, _cursor: Any, statement: str, *_args: Any) -> None:
+        recorded.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", on_execute)
+    yield recorded
+    event.remove(db_engine.sync_engine, "before_cursor_execute", on_execute)
+
+
+@pytest.fixture
+def level_up_emails(monkeypatch: pytest.MonkeyPatch) -> List[Dict[str, Any]]:
+    """Returns the level-up emails queued during the test"""
+    fake = FakeLevelUpEmail()
+    monkeypatch.setattr(adventurer_service_module, "send_level_up_email", fake)
+    return fake.calls
+
+
+async def _create_quest(db_session: AsyncSession, experience_reward: int = 50) -> str:
+    """Create an adventurer with one quest and return the quest ID"""
+    adventurer = await AdventurerService(db=db_session).create_adventurer(name="Aragorn", user_id="test_user_id")
+    quest = await QuestService(db=db_session).create_quest(
+        title="Slay the dragon", adventurer_id=str(adventurer.id), experience_reward=experience_reward
+    )
+    return str(quest.id)
+
+
+class TestQuestCompletionUnitOfWork:
+    async def test_services_only_flush_in_unit_of_work(self, db_session: AsyncSession, commits: List[Any]) -> None:
+        """Test that completing a quest in unit-of-work mode commits nothing until the caller does"""
+        # Arrange
+        quest_id = await _create_quest(db_session)
+        commits.clear()
+        db_session.info["unit_of_work"] = True
+
+        # Act
+        quest = await QuestService(db=db_session).update_quest(quest_id=quest_id, completed=True)
+
+        # Assert - nothing committed yet, but the changes are visible in the transaction
+        assert commits == []
+        assert quest.completed is True
+        completion = await db_session.execute(select(QuestCompletion).filter_by(quest_id=quest_id))
+        assert completion.scalars().first() is not None
+
+        await db_session.commit()
+        assert len(commits) == 1
+
+    async def test_rollback_discards_partial_completion(self, db_session: AsyncSession) -> None:
+        """Test that rolling back the unit of work leaves no partial completion behind"""
+        # Arrange
+        quest_id = await _create_quest(db_session)
+        db_session.info["unit_of_work"] = True
+
+        # Act
+        await QuestService(db=db_session).update_quest(quest_id=quest_id, completed=True)
+        await db_session.rollback()
+
+        # Assert
+        completion = await db_session.execute(select(QuestCompletion).filter_by(quest_id=quest_id))
+        assert completion.scalars().first() is None
+        adventurer = (await db_session.execute(select(Adventurer))).scalars().first()
+        await db_session.refresh(adventurer)
+        assert adventurer.experience == 0
+
+    async def test_complete_quest_route_commits_once(
+        self, client: AsyncClient, auth_headers: Dict[str, str], db_session: AsyncSession, commits: List[Any]
+    ) -> None:
+        """Test that completing a quest through the API commits exactly once"""
+        # Arrange
+        quest_id = await _create_quest(db_session)
+        commits.clear()
+
+        # Act
+        response = await client.put(f"/api/v1/quest/{quest_id}", json={"completed": True}, headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json()["completed"] is True
+        assert len(commits) == 1
+
+
+class TestQuestRows:
+    async def test_quest_rows_match_quest_to_dict(self, db_session: AsyncSession) -> None:
+        """Test that the ORM-free read path returns what quest_to_dict does, without loading objects"""
+        # Arrange
+        quest_id = await _create_quest(db_session)
+        quest_service = QuestService(db=db_session)
+        quest = await quest_service.get_quest(quest_id)
+        expected = quest_service.quest_to_dict(quest)
+        db_session.expunge_all()
+
+        # Act
+        rows = await quest_service.get_all_quest_rows(str(quest.adventurer_id))
+        streamed = [row async for row in quest_service.stream_all_quest_rows(str(quest.adventurer_id))]
+
+        # Assert
+        assert [dict(row) for row in rows] == [expected]
+        assert [dict(row) for row in streamed] == [expected]
+        assert len(db_session.identity_map) == 0
+
+
+class TestQuestBatch:
+    async def test_batch_is_one_query_one_insert_one_commit(
+        self,
+        client: AsyncClient,
+        auth_headers: Dict[str, str],
+        db_session: AsyncSession,
+        statements: List[str],
+        commits: List[Any],
+    ) -> None:
+        """Test that a batch checks ownership once, inserts every quest in one statement and commits once"""
+        # Arrange
+        adventurer_ids = []
+        for name in ("Frodo", "Sam"):
+            created = await client.post(
+                "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+            )
+            adventurer_ids.append(created.json()["id"])
+        quests = [{"title": f"Quest {i}", "adventurer_id": adventurer_ids[i % 2]} for i in range(50)]
+        statements.clear()
+        commits.clear()
+
+        # Act
+        response = await client.post("/api/v1/quests/batch", json={"quests": quests}, headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 201
+        body = response.json()
+        assert [quest["title"] for quest in body["created"]] == [quest["title"] for quest in quests]
+        assert body["errors"] == []
+        assert body["created"][0]["experience_reward"] == 100
+        assert [statement.split()[0] for statement in statements] == ["SELECT", "INSERT"]
+        assert len(commits) == 1
+        stored = await db_session.scalar(select(func.count()).select_from(Quest))
+        assert stored == 50
+
+    async def test_invalid_item_rejects_whole_batch(
+        self, client: AsyncClient, auth_headers: Dict[str, str], db_session: AsyncSession
+    ) -> None:
+        """Test that without allow_partial one invalid quest, such as another user's adventurer, creates nothing"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        other = await AdventurerService(db=db_session).create_adventurer(name="Gollum", user_id="other_user_id")
+        quests = [
+            {"title": "Carry the ring", "adventurer_id": created.json()["id"]},
+            {"title": "Steal the ring", "adventurer_id": str(other.id)},
+            {"title": " ", "adventurer_id": created.json()["id"]},
+        ]
+
+        # Act
+        response = await client.post("/api/v1/quests/batch", json={"quests": quests}, headers=auth_headers)
+
+        # Assert
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+        assert await db_session.scalar(select(func.count()).select_from(Quest)) == 0
+
+    async def test_partial_batch_creates_valid_items(
+        self, client: AsyncClient, auth_headers: Dict[str, str], db_session: AsyncSession
+    ) -> None:
+        """Test that with allow_partial the valid quests are created and the invalid ones reported by index"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Frodo", "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        quests = [
+            {"title": "Carry the ring", "adventurer_id": created.json()["id"]},
+            {"title": "Lose the ring", "adventurer_id": created.json()["id"], "experience_reward": -5},
+            {"title": "Visit Rivendell", "adventurer_id": "missing_adventurer"},
+        ]
+
+        # Act
+        response = await client.post(
+            "/api/v1/quests/batch", json={"quests": quests, "allow_partial": True}, headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 201
+        body = response.json()
+        assert [quest["title"] for quest in body["created"]] == ["Carry the ring"]
+        assert [error["index"] for error in body["errors"]] == [1, 2]
+        assert await db_session.scalar(select(func.count()).select_from(Quest)) == 1
+
+    async def test_malformed_payload_is_rejected(self, client: AsyncClient, auth_headers: Dict[str, str]) -> None:
+        """Test that an empty batch or an item without a title fails payload validation"""
+        # Act
+        empty = await client.post("/api/v1/quests/batch", json={"quests": []}, headers=auth_headers)
+        untitled = await client.post(
+            "/api/v1/quests/batch", json={"quests": [{"adventurer_id": "a"}]}, headers=auth_headers
+        )
+
+        # Assert
+        assert empty.status_code == 422
+        assert untitled.status_code == 422
+
+
+async def _create_quests(client: AsyncClient, auth_headers: Dict[str, str], rewards: Dict[str, List[int]]) -> List[str]:
+    """Create an adventurer per name with a quest per reward through the API and return the quest IDs"""
+    quests = []
+    for name, experience_rewards in rewards.items():
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": name, "adventurer_type": "Hobbit"}, headers=auth_headers
+        )
+        quests += [
+            {"title": f"{name} quest {i}", "adventurer_id": created.json()["id"], "experience_reward": reward}
+            for i, reward in enumerate(experience_rewards)
+        ]
+    response = await client.post("/api/v1/quests/batch", json={"quests": quests}, headers=auth_headers)
+    return [quest["id"] for quest in response.json()["created"]]
+
+
+class TestQuestBatchCompletion:
+    async def test_batch_sums_experience_per_adventurer(
+        self,
+        client: AsyncClient,
+        auth_headers: Dict[str, str],
+        statements: List[str],
+        commits: List[Any],
+        level_up_emails: List[Dict[str, Any]],
+    ) -> None:
+        """Test that a batch grants each adventurer its summed rewards at once, with one email per adventurer"""
+        # Arrange - Frodo's 450 XP covers two levels; Sam's 60 XP none
+        quest_ids = await _create_quests(client, auth_headers, {"Frodo": [150, 150, 150], "Sam": [30, 30]})
+        statements.clear()
+        commits.clear()
+
+        # Act
+        response = await client.post(
+            "/api/v1/quests/batch/complete", json={"quest_ids": quest_ids}, headers=auth_headers
+        )
+
+        # Assert
+        assert response.status_code == 200
+        body = response.json()
+        assert sorted(body["completed"]) == sorted(quest_ids)
+        levels = {
+            adventurer["name"]: (adventurer["level"], adventurer["experience"]) for adventurer in body["adventurers"]
+        }
+        assert levels == {"Frodo": (3, 150), "Sam": (1, 60)}
+        assert [(email["old_level"], email["new_level"]) for email in level_up_emails] == [(1, 3)]
+        assert len(commits) == 1
+        writes = [" ".join(statement.split()[:3]) for statement in statements if not statement.startswith("SELECT")]
+        assert writes.count("UPDATE quests SET") == 1
+        assert writes.count("INSERT INTO quest_completions") == 1
+        # One experience UPDATE per adventurer, and the level write for Frodo's level-up
+        assert writes.count("UPDATE adventurers SET") == 3
+
+    async def test_completed_and_foreign_quests_are_skipped(
+        self, client: AsyncClient, auth_headers: Dict[str, str], db_session: AsyncSession
+    ) -> None:
+        """Test that quests already completed or of another user's adventurer are neither completed nor rewarded"""
+        # Arrange
+        quest_ids = await _create_quests(client, auth_headers, {"Frodo": [10, 10]})
+        await client.post("/api/v1/quests/batch/complete", json={"quest_ids": quest_ids[:1]}, headers=auth_headers)
+        foreign_quest_id = await _create_quest(db_session)
+
+        # Act
+        response = await client.post(
+            "/api/v1/quests/batch/complete",
+            json={"quest_ids": [*quest_ids, foreign_quest_id, "missing_quest"]},
+            headers=auth_headers,
+        )
+
+        # Assert
+        body = response.json()
+        assert body["completed"] == quest_ids[1:]
+        assert [(adventurer["level"], adventurer["experience"]) for adventurer in body["adventurers"]] == [(1, 20)]
+        completions = await db_session.scalar(select(func.count()).select_from(QuestCompletion))
+        assert completions == 2
+        foreign = await db_session.get(Quest, foreign_quest_id)
+        assert foreign.completed is False
+
+    async def test_batch_without_returning(
+        self, db_session: AsyncSession, db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that dialects without UPDATE ... RETURNING lock and read the open quests first"""
+        # Arrange
+        monkeypatch.setattr(db_engine.sync_engine.dialect, "update_returning", False)
+        quest_id = await _create_quest(db_session, experience_reward=30)
+
+        # Act
+        completed, adventurers = await QuestService(db=db_session).complete_quests(
+            [quest_id, quest_id], user_id="test_user_id"
+        )
+
+        # Assert
+        assert completed == [quest_id]
+        assert [(adventurer.level, adventurer.experience) for adventurer in adventurers] == [(1, 30)]
+
+
+class TestCompletionPastMaxLevel:
+    async def test_completing_quests_keeps_a_level_past_the_highest(
+        self, client: AsyncClient, auth_headers: Dict[str, str], level_up_emails: List[Dict[str, Any]]
+    ) -> None:
+        """Test that an adventurer set past the highest level can complete quests and keeps its level"""
+        # Arrange
+        created = await client.post(
+            "/api/v1/adventurer", json={"name": "Gandalf", "adventurer_type": "Wizard"}, headers=auth_headers
+        )
+        adventurer_id = created.json()["id"]
+        await client.put(f"/api/v1/adventurer/{adventurer_id}", json={"level": 150}, headers=auth_headers)
+        quests = [{"title": f"Quest {i}", "adventurer_id": adventurer_id, "experience_reward": 500} for i in range(2)]
+        quest_ids = [
+            quest["id"]
+            for quest in (
+                await client.post("/api/v1/quests/batch", json={"quests": quests}, headers=auth_headers)
+            ).json()["created"]
+        ]
+
+        # Act
+        single = await client.put(f"/api/v1/quest/{quest_ids[0]}", json={"completed": True}, headers=auth_headers)
+        batch = await client.post(
+            "/api/v1/quests/batch/complete", json={"quest_ids": [quest_ids[1]]}, headers=auth_headers
+        )
+
+        # Assert
+        assert single.status_code == 200
+        assert batch.status_code == 200
+        adventurer = (await client.get(f"/api/v1/adventurer/{adventurer_id}", headers=auth_headers)).json()
+        assert adventurer["level"] == 150
+        assert adventurer["experience"] == 1000
+        assert level_up_emails == []